@@ -109,6 +109,20 @@ if getattr(sys, 'frozen', None):
 #:     to True by default.
 #:
 #:     .. versionadded:: 1.2
+#: font_index
+#:     If set to a filename, pyglet keeps a persistent index of font files
+#:     and system font matches in that file, so that fonts added with
+#:     :py:func:`pyglet.font.add_directory` and fonts found through
+#:     fontconfig do not need to be parsed again on later runs.  See
+#:     :py:mod:`pyglet.font.fontindex`.  Unset by default.
+#: image_cache
+#:     If set to a directory, images loaded with :py:func:`pyglet.image.load`
+#:     are cached there in decoded form, so later loads of the same file do
+#:     not need to decode it again.  See :py:mod:`pyglet.image.cache`.  Unset
+#:     by default.
+#: image_cache_size
+#:     Maximum size of the ``image_cache``, in bytes.  The least recently
+#:     used images are removed when the cache grows beyond this size.
 #:
 options = {
     'audio': ('xaudio2', 'directsound', 'openal', 'pulse', 'silent'),
@@ -140,7 +154,10 @@ options = {
     'dw_legacy_naming': False,
     'win32_disable_xinput': False,
     'com_mta': False,
-    'osx_alt_loop': False
+    'osx_alt_loop': False,
+    'font_index': None,
+    'image_cache': None,
+    'image_cache_size': 256 * 1024 * 1024,
 }
 
 _option_types = {
@@ -174,6 +191,9 @@ _option_types = {
     'win32_disable_xinput': bool,
     'com_mta': bool,
     'osx_alt_loop': bool,
+    'font_index': str,
+    'image_cache': str,
+    'image_cache_size': int,
 }
 
 
@@ -189,6 +209,8 @@ for key in options:
             options[key] = value in ('true', 'TRUE', 'True', '1')
         elif _option_types[key] is int:
             options[key] = int(value)
+        elif _option_types[key] is str:
+            options[key] = value
     except KeyError:
         pass
 
@@ -231,7 +231,9 @@ def add_file(font: Union[str, BinaryIO]):
 
     """
     if isinstance(font, str):
-        font = open(font, 'rb')
+        _system_font_class.add_font_file(font)
+        _save_font_index()
+        return
     if hasattr(font, 'read'):
         font = font.read()
     _system_font_class.add_font_data(font)
@@ -243,6 +245,10 @@ def add_directory(directory):
     This function simply calls :meth:`pyglet.font.add_file` for each file with a ``.ttf``
     extension in the given directory. Subdirectories are not searched.
 
+    If the ``font_index`` option is set, the family and style of each file are
+    read from the persistent font index where possible, and the font faces are
+    only loaded when first used.
+
     :Parameters:
         `dir` : str
             Directory that contains font files.
@@ -250,7 +256,15 @@ def add_directory(directory):
     """
     for file in os.listdir(directory):
         if file[-4:].lower() == '.ttf':
-            add_file(os.path.join(directory, file))
+            _system_font_class.add_font_file(os.path.join(directory, file))
+    _save_font_index()
+
+
+def _save_font_index():
+    from pyglet.font.fontindex import get_font_index
+    index = get_font_index()
+    if index is not None:
+        index.save()
 
 
 __all__ = ('add_file', 'add_directory', 'load', 'have_font')
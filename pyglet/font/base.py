@@ -259,6 +259,17 @@ class Font:
         """
         pass
 
+    @classmethod
+    def add_font_file(cls, filename):
+        """Add a font file to the font loader.
+
+        The default implementation reads the whole file and passes it to
+        :py:meth:`add_font_data`.  Subclasses that can defer loading the face
+        until it is first requested may override this.
+        """
+        with open(filename, 'rb') as f:
+            cls.add_font_data(f.read())
+
     @classmethod
     def have_font(cls, name):
         """Determine if a font with the given name is installed.
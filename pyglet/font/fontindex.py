@@ -0,0 +1,288 @@
+"""
+Persistent index of font files.
+
+Reading the name tables of a font file is not free: :py:class:`~pyglet.font.ttf.TruetypeInfo`
+memory-maps the file and parses several tables, and FreeType loads the whole face.  When an
+application registers a large number of bundled fonts, or looks up the same system fonts on
+every start, this cost is paid again on each run.
+
+:py:class:`FontIndex` keeps a small on-disk database of the family, style and character coverage
+of each font file it has seen, keyed by the absolute path of the file together with its
+modification time and size.  Entries are rebuilt automatically when a file changes.  The index
+also remembers which file a system font lookup resolved to, so that later runs can skip the
+fontconfig match entirely.
+
+The index is enabled by setting the ``font_index`` option to the filename of the index before
+any fonts are loaded::
+
+    import pyglet
+    pyglet.options['font_index'] = 'fonts.idx'
+
+Typical applications will not need to use this module directly.
+"""
+
+import os
+import json
+import bisect
+
+import pyglet
+from pyglet.font.ttf import TruetypeInfo
+
+_debug_font = pyglet.options['debug_font']
+
+_INDEX_VERSION = 1
+
+
+class FontIndexEntry:
+    """Cached information about a single font file."""
+
+    __slots__ = ('path', 'mtime', 'size', 'family', 'bold', 'italic', 'coverage')
+
+    def __init__(self, path, mtime, size, family, bold, italic, coverage):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.family = family
+        self.bold = bold
+        self.italic = italic
+        # Sorted, non-overlapping list of inclusive (first, last) code point ranges.
+        self.coverage = coverage
+
+    def has_character(self, character):
+        """Check if the font maps the given character to a glyph.
+
+        :Parameters:
+            `character` : str
+                A single character.
+
+        :rtype: bool
+        """
+        code = ord(character)
+        i = bisect.bisect_right(self.coverage, [code, 0x10ffff]) - 1
+        return i >= 0 and self.coverage[i][0] <= code <= self.coverage[i][1]
+
+    def to_dict(self):
+        return {'mtime': self.mtime, 'size': self.size, 'family': self.family,
+                'bold': self.bold, 'italic': self.italic, 'coverage': self.coverage}
+
+    @classmethod
+    def from_dict(cls, path, data):
+        return cls(path, data['mtime'], data['size'], data['family'],
+                   data['bold'], data['italic'], [list(r) for r in data['coverage']])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.family!r}, bold={self.bold}, italic={self.italic})"
+
+
+def _get_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _coverage_ranges(codes):
+    ranges = []
+    for code in sorted(codes):
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ranges
+
+
+def read_font_info(path):
+    """Read the family, style and coverage of a TrueType or OpenType file.
+
+    Returns a :py:class:`FontIndexEntry`, or ``None`` if the file could not be
+    parsed.  The file is closed before returning.
+    """
+    stat = _get_stat(path)
+    if stat is None:
+        return None
+
+    try:
+        info = TruetypeInfo(path)
+    except Exception:
+        return None
+
+    try:
+        family = info.get_name('family')
+        if not family:
+            return None
+        coverage = _coverage_ranges(ord(ch) for ch in info.get_character_map())
+        return FontIndexEntry(path, stat[0], stat[1], family, info.is_bold(), info.is_italic(), coverage)
+    except Exception:
+        return None
+    finally:
+        info.close()
+
+
+class FontIndex:
+    """A persistent index of font files and system font matches.
+
+    The index is loaded from `filename` when created, if the file exists.
+    Changes are only written back when :py:meth:`save` is called.
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self._entries = {}
+        self._matches = {}
+        self._dirty = False
+
+        if filename is not None:
+            self.load()
+
+    def load(self):
+        """Load the index from its file, discarding anything in memory.
+
+        A missing, unreadable or outdated index file is treated as empty.
+        """
+        self._entries = {}
+        self._matches = {}
+        self._dirty = False
+
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('version') != _INDEX_VERSION:
+            return
+
+        try:
+            for path, entry in data['files'].items():
+                self._entries[path] = FontIndexEntry.from_dict(path, entry)
+            self._matches = dict(data['matches'])
+        except (KeyError, TypeError):
+            self._entries = {}
+            self._matches = {}
+
+    def save(self):
+        """Write the index to its file, if anything has changed.
+
+        The file is replaced atomically, so a concurrent reader never sees a
+        partially written index.
+        """
+        if not self._dirty or self.filename is None:
+            return
+
+        data = {
+            'version': _INDEX_VERSION,
+            'files': {path: entry.to_dict() for path, entry in self._entries.items()},
+            'matches': self._matches,
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        os.makedirs(directory, exist_ok=True)
+        tmp_filename = f'{self.filename}.{os.getpid()}.tmp'
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_filename, self.filename)
+        self._dirty = False
+
+    def clear(self):
+        """Remove all entries and matches from the index."""
+        self._entries.clear()
+        self._matches.clear()
+        self._dirty = True
+
+    def get_entry(self, path):
+        """Get the index entry for a font file, reading the file if needed.
+
+        The file is only opened when it is not in the index yet, or when its
+        modification time or size changed since it was indexed.  Returns
+        ``None`` if the file cannot be parsed.
+
+        :rtype: :py:class:`FontIndexEntry`
+        """
+        path = os.path.abspath(path)
+        stat = _get_stat(path)
+        if stat is None:
+            return None
+
+        entry = self._entries.get(path)
+        if entry is not None and (entry.mtime, entry.size) == stat:
+            return entry
+
+        if _debug_font:
+            print(f"FontIndex: indexing {path}")
+
+        entry = read_font_info(path)
+        if entry is None:
+            self._entries.pop(path, None)
+        else:
+            self._entries[path] = entry
+        self._dirty = True
+        return entry
+
+    def find(self, name, bold=False, italic=False):
+        """Find an indexed font file by family name and style.
+
+        :rtype: :py:class:`FontIndexEntry`
+        """
+        lname = name and name.lower() or ''
+        for entry in self._entries.values():
+            if entry.family.lower() == lname and entry.bold == bold and entry.italic == italic:
+                return entry
+        return None
+
+    @staticmethod
+    def _match_key(name, size, bold, italic):
+        return f'{name}|{size}|{int(bold)}|{int(italic)}'
+
+    def get_match(self, name, size, bold, italic):
+        """Get a previously stored system font match.
+
+        Returns a tuple of ``(family, path)``, or ``None`` if there is no match
+        stored or the matched file has changed since.
+        """
+        key = self._match_key(name, size, bold, italic)
+        match = self._matches.get(key)
+        if match is None:
+            return None
+
+        family, path, mtime, size = match
+        if _get_stat(path) != (mtime, size):
+            del self._matches[key]
+            self._dirty = True
+            return None
+
+        return family, path
+
+    def add_match(self, name, size, bold, italic, family, path):
+        """Store the result of a system font lookup."""
+        stat = _get_stat(path)
+        if stat is None:
+            return
+
+        self._matches[self._match_key(name, size, bold, italic)] = [family, path, stat[0], stat[1]]
+        self._dirty = True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return os.path.abspath(path) in self._entries
+
+
+_font_index = None
+
+
+def get_font_index():
+    """Get the font index configured by the ``font_index`` option.
+
+    Returns ``None`` if the option is not set.
+
+    :rtype: :py:class:`FontIndex`
+    """
+    global _font_index
+    filename = pyglet.options['font_index']
+    if not filename:
+        return None
+    if _font_index is None or _font_index.filename != filename:
+        _font_index = FontIndex(filename)
+    return _font_index
@@ -8,6 +8,7 @@ WebGL = sys.platform in ('emscripten','wasi')
 
 from pyglet.util import asbytes, asstr
 from pyglet.font import base
+from pyglet.font.fontindex import get_font_index
 from pyglet import image
 if not WebGL:
     from pyglet.font.fontconfig import get_fontconfig
@@ -122,17 +123,30 @@ FreeTypeFontMetrics = namedtuple('FreeTypeFontMetrics', ['ascent', 'descent'])
 class MemoryFaceStore:
     def __init__(self):
         self._dict = {}
+        # Faces known from the font index, loaded from disk on first use.
+        self._lazy = {}
 
     def add(self, face):
         self._dict[face.name.lower(), face.bold, face.italic] = face
 
+    def add_lazy(self, entry):
+        self._lazy[entry.family.lower(), entry.bold, entry.italic] = entry
+
     def contains(self, name):
         lname = name and name.lower() or ''
-        return len([name for name, _, _ in self._dict.keys() if name == lname]) > 0
+        return (len([name for name, _, _ in self._dict.keys() if name == lname]) > 0 or
+                len([name for name, _, _ in self._lazy.keys() if name == lname]) > 0)
 
     def get(self, name, bold, italic):
         lname = name and name.lower() or ''
-        return self._dict.get((lname, bold, italic), None)
+        face = self._dict.get((lname, bold, italic), None)
+        if face is None:
+            entry = self._lazy.pop((lname, bold, italic), None)
+            if entry is not None:
+                with open(entry.path, 'rb') as f:
+                    face = FreeTypeMemoryFace(f.read())
+                self._dict[lname, bold, italic] = face
+        return face
 
 
 class FreeTypeFont(base.Font):
@@ -186,24 +200,57 @@ class FreeTypeFont(base.Font):
             self.filename = "/data/data/org.python/assets/site-packages/pygame/FreeSerif.ttf"
             self.face = FreeTypeFace.from_file(self.filename)
         else:
+            index = get_font_index()
+            if index is not None:
+                match = index.get_match(self._name, self.size, self.bold, self.italic)
+                if match is not None:
+                    self.filename = match[1]
+                    self.face = FreeTypeFace.from_file(self.filename)
+                    return
+
             match = get_fontconfig().find_font(self._name, self.size, self.bold, self.italic)
             if not match:
                 raise base.FontException(f"Could not match font '{self._name}'")
             self.filename = match.file
             self.face = FreeTypeFace.from_fontconfig(match)
 
+            if index is not None and match.file:
+                index.add_match(self._name, self.size, self.bold, self.italic, match.name, match.file)
+                index.save()
+
     @classmethod
     def have_font(cls, name):
         if cls._memory_faces.contains(name):
             return True
-        else:
-            return get_fontconfig().have_font(name)
+
+        index = get_font_index()
+        if index is not None:
+            match = index.get_match(name, 12, False, False)
+            if match is not None:
+                family = match[0]
+                return not (name and family and family.lower() != name.lower())
+
+            match = get_fontconfig().find_font(name)
+            if match and match.file:
+                index.add_match(name, 12, False, False, match.name, match.file)
+                index.save()
+
+        return get_fontconfig().have_font(name)
 
     @classmethod
     def add_font_data(cls, data):
         face = FreeTypeMemoryFace(data)
         cls._memory_faces.add(face)
 
+    @classmethod
+    def add_font_file(cls, filename):
+        index = get_font_index()
+        entry = index.get_entry(filename) if index is not None else None
+        if entry is None:
+            super().add_font_file(filename)
+        else:
+            cls._memory_faces.add_lazy(entry)
+
 
 class FreeTypeFace:
     """FreeType typographic face object.
@@ -56,6 +56,7 @@ class GLInfo:
     minor_version = 0
     opengl_api = 'gl'
     extensions = set()
+    compressed_formats = set()
 
     _have_info = False
 
@@ -86,6 +87,16 @@ class GLInfo:
             except GLException:
                 pass    # GL3 is likely not available
 
+            try:
+                from pyglet.gl.gl import glGetIntegerv, GL_NUM_COMPRESSED_TEXTURE_FORMATS, GL_COMPRESSED_TEXTURE_FORMATS
+                num_formats = _get_number(GL_NUM_COMPRESSED_TEXTURE_FORMATS)
+                if num_formats:
+                    formats = (GLint * num_formats)()
+                    glGetIntegerv(GL_COMPRESSED_TEXTURE_FORMATS, formats)
+                    self.compressed_formats = set(formats)
+            except GLException:
+                pass
+
             self._have_info = True
 
     def remove_active_context(self):
@@ -110,6 +121,25 @@ class GLInfo:
             warnings.warn('No GL context created yet.')
         return extension in self.extensions
 
+    def have_compressed_format(self, gl_format):
+        """Determine if the driver reports support for a compressed texture
+        format.
+
+        Drivers are not required to list every format they accept, so a
+        format may still be usable through an extension when this returns
+        ``False``.
+
+        :Parameters:
+            `gl_format` : int
+                The compressed internal format, for example
+                ``GL_COMPRESSED_RGBA_S3TC_DXT5_EXT``.
+
+        :rtype: bool
+        """
+        if not self._have_context:
+            warnings.warn('No GL context created yet.')
+        return gl_format in self.compressed_formats
+
     def get_extensions(self):
         """Get a list of available OpenGL extensions.
 
@@ -208,6 +238,7 @@ get_renderer = _gl_info.get_renderer
 get_vendor = _gl_info.get_vendor
 get_opengl_api = _gl_info.get_opengl_api
 have_extension = _gl_info.have_extension
+have_compressed_format = _gl_info.have_compressed_format
 have_context = _gl_info.have_context
 remove_active_context = _gl_info.remove_active_context
 set_active_context = _gl_info.set_active_context
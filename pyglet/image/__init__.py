@@ -93,7 +93,7 @@ Retrieving data with the format and pitch given in `ImageData.format` and
 use of the data in this arbitrary format).
 
 """
-import re
+import os
 import weakref
 
 from ctypes import *
@@ -109,8 +109,12 @@ from .codecs import ImageEncodeException, ImageDecodeException
 from .codecs import registry as _codec_registry
 from .codecs import add_default_codecs as _add_default_codecs
 
-from .animation import Animation, AnimationFrame
+from .animation import Animation, AnimationFrame, StreamingAnimation, StreamingFrame
 from .buffer import *
+from .cache import get_image_cache as _get_image_cache
+from .convert import convert as _convert_data, ConversionException as _ConversionException
+from .compressed import get_format as _get_compressed_format
+from .readback import AsyncReadback
 from . import atlas
 
 
@@ -148,14 +152,135 @@ def load(filename, file=None, decoder=None):
         be ImageData or CompressedImageData, but decoders are free to return
         any subclass of AbstractImage.
 
+    .. note:: If the ``image_cache`` option is set, decoded images are
+        cached on disk.  See :py:mod:`pyglet.image.cache`.
+
     """
+    image_cache = _get_image_cache()
+    if image_cache is not None:
+        return image_cache.load(filename, file, decoder)
+
     if decoder:
         return decoder.decode(filename, file)
     else:
         return _codec_registry.decode(filename, file)
 
 
-def load_animation(filename, file=None, decoder=None):
+# Shared memory blocks created by this process as a load_many worker.  They
+# stay open until the worker exits, as on Windows a block is destroyed as soon
+# as no process has it open.
+_worker_shared_memory = []
+
+
+def _decode_shared(filename, decoder):
+    # Runs in a worker process.  The pixel data is returned through shared
+    # memory rather than being pickled with the result.
+    from multiprocessing import shared_memory
+
+    image = load(filename, decoder=decoder)
+    if not isinstance(image, ImageData) or isinstance(image, ImageDataRegion):
+        return image
+
+    fmt = image.format
+    pitch = image.pitch
+    data = image.get_data(fmt, pitch)
+    size = abs(pitch) * image.height
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    shm.buf[:size] = memoryview(asbytes(data) if isinstance(data, str) else data).cast('B')[:size]
+    _worker_shared_memory.append(shm)
+    return shm.name, image.width, image.height, fmt, pitch, size
+
+
+def _receive_shared(result):
+    from multiprocessing import shared_memory
+
+    if isinstance(result, AbstractImage):
+        return result
+
+    name, width, height, fmt, pitch, size = result
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+        shm.unlink()
+    return ImageData(width, height, fmt, data, pitch)
+
+
+def load_many(filenames, workers=None, processes=False, decoder=None, texture_bin=None, border=0):
+    """Load several images in parallel.
+
+    The images are decoded on a pool of worker threads, or worker processes
+    if `processes` is ``True``.  Decoders implemented in Python, such as the
+    PNG fallback decoder, hold the GIL while they work, so a process pool is
+    usually faster for them; decoders backed by native libraries release it,
+    and a thread pool avoids the cost of starting processes.  Worker
+    processes return the pixel data through shared memory, so it is not
+    pickled.
+
+    This function blocks until all images are loaded.  If any image fails to
+    decode, its exception is raised.
+
+    :Parameters:
+        `filenames` : list of str
+            Filenames of the images to load.
+        `workers` : int or None
+            Maximum number of threads or processes to use.  Defaults to the
+            number of CPUs.
+        `processes` : bool
+            If ``True``, decode in a process pool instead of a thread pool.
+        `decoder` : ImageDecoder or None
+            Decoder to use.  If unspecified, all decoders that are registered
+            for each filename extension are tried.  When using processes, the
+            decoder must be picklable.
+        `texture_bin` : `~pyglet.image.atlas.TextureBin` or None
+            If given, the images are packed into this texture bin on the
+            calling thread, and the resulting texture regions are returned
+            instead of the images.  This requires an OpenGL context.
+        `border` : int
+            Pixels of blank space to leave around each image packed into
+            `texture_bin`.
+
+    :rtype: list of AbstractImage
+    :return: The loaded images (or texture regions), in the same order as
+        `filenames`.
+    """
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+    filenames = list(filenames)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(filenames)) or 1
+
+    if processes:
+        if os.name == 'posix':
+            # Share this process's resource tracker with the workers, so that
+            # blocks are not cleaned up when a worker exits.
+            from multiprocessing import resource_tracker
+            resource_tracker.ensure_running()
+
+        images = []
+        error = None
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(_decode_shared, filename, decoder) for filename in filenames]
+            # Receive every image, even after one has failed, so that all
+            # shared memory is released.
+            for future in futures:
+                try:
+                    images.append(_receive_shared(future.result()))
+                except Exception as e:
+                    error = error or e
+        if error is not None:
+            raise error
+    else:
+        with ThreadPoolExecutor(workers) as executor:
+            images = list(executor.map(lambda filename: load(filename, decoder=decoder), filenames))
+
+    if texture_bin is not None:
+        return texture_bin.add_many(images, border)
+    return images
+
+
+def load_animation(filename, file=None, decoder=None, streaming=False):
     """Load an animation from a file.
 
     Currently, the only supported format is GIF.
@@ -170,9 +295,15 @@ def load_animation(filename, file=None, decoder=None):
             If unspecified, all decoders that are registered for the filename
             extension are tried.  If none succeed, the exception from the
             first decoder is raised.
+        `streaming` : bool
+            If ``True``, return a :py:class:`~pyglet.image.StreamingAnimation`
+            that decodes frames as they are shown, instead of decoding all
+            frames up front.
 
     :rtype: Animation
     """
+    if streaming:
+        return StreamingAnimation.load(filename, file, decoder)
     if decoder:
         return decoder.decode_animation(filename, file)
     else:
@@ -543,11 +674,6 @@ class ImageData(AbstractImage):
             arrangement.
 
     """
-    _swap1_pattern = re.compile(asbytes('(.)'), re.DOTALL)
-    _swap2_pattern = re.compile(asbytes('(.)(.)'), re.DOTALL)
-    _swap3_pattern = re.compile(asbytes('(.)(.)(.)'), re.DOTALL)
-    _swap4_pattern = re.compile(asbytes('(.)(.)(.)(.)'), re.DOTALL)
-
     _current_texture = None
     _current_mipmap_texture = None
 
@@ -849,69 +975,11 @@ class ImageData(AbstractImage):
                 return asbytes(self._current_data)
             return self._current_data
 
-        self._ensure_bytes()
-        data = self._current_data
-        current_pitch = self._current_pitch
-        current_format = self._current_format
-        sign_pitch = current_pitch // abs(current_pitch)
-        if fmt != self._current_format:
-            # Create replacement string, e.g. r'\4\1\2\3' to convert RGBA to ARGB
-            repl = asbytes('')
-            for c in fmt:
-                try:
-                    idx = current_format.index(c) + 1
-                except ValueError:
-                    idx = 1
-                repl += asbytes(r'\%d' % idx)
-
-            if len(current_format) == 1:
-                swap_pattern = self._swap1_pattern
-            elif len(current_format) == 2:
-                swap_pattern = self._swap2_pattern
-            elif len(current_format) == 3:
-                swap_pattern = self._swap3_pattern
-            elif len(current_format) == 4:
-                swap_pattern = self._swap4_pattern
-            else:
-                raise ImageException('Current image format is wider than 32 bits.')
-
-            packed_pitch = self.width * len(current_format)
-            if abs(self._current_pitch) != packed_pitch:
-                # Pitch is wider than pixel data, need to go row-by-row.
-                new_pitch = abs(self._current_pitch)
-                rows = [data[i:i+new_pitch] for i in range(0, len(data), new_pitch)]
-                rows = [swap_pattern.sub(repl, r[:packed_pitch]) for r in rows]
-                data = asbytes('').join(rows)
-            else:
-                # Rows are tightly packed, apply regex over whole image.
-                data = swap_pattern.sub(repl, data)
-
-            # After conversion, rows will always be tightly packed
-            current_pitch = sign_pitch * (len(fmt) * self.width)
-
-        if pitch != current_pitch:
-            diff = abs(current_pitch) - abs(pitch)
-            if diff > 0:
-                # New pitch is shorter than old pitch, chop bytes off each row
-                new_pitch = abs(pitch)
-                rows = [data[i:i+new_pitch-diff] for i in range(0, len(data), new_pitch)]
-                data = asbytes('').join(rows)
-
-            elif diff < 0:
-                # New pitch is longer than old pitch, add '0' bytes to each row
-                new_pitch = abs(current_pitch)
-                padding = asbytes(1) * -diff
-                rows = [data[i:i+new_pitch] + padding for i in range(0, len(data), new_pitch)]
-                data = asbytes('').join(rows)
-
-            if current_pitch * pitch < 0:
-                # Pitch differs in sign, swap row order
-                new_pitch = abs(pitch)
-                rows = [data[i:i+new_pitch] for i in range(0, len(data), new_pitch)]
-                rows.reverse()
-                data = asbytes('').join(rows)
-
-        return asbytes(data)
+        try:
+            return _convert_data(self._current_data, self.width, self.height,
+                                 self._current_format, self._current_pitch, fmt, pitch)
+        except _ConversionException as e:
+            raise ImageException(str(e))
 
     def _ensure_bytes(self):
         if type(self._current_data) is not bytes:
@@ -1046,7 +1114,9 @@ class CompressedImageData(AbstractImage):
                 String or array/list of bytes giving compressed image data.
             `extension` : str or None
                 If specified, gives the name of a GL extension to check for
-                before creating a texture.
+                before creating a texture.  Formats described by
+                :py:mod:`pyglet.image.compressed` are also used if the
+                driver otherwise reports support for them.
             `decoder` : function(data, width, height) -> AbstractImage
                 A function to decode the compressed data, to be used if the
                 required extension is not present.
@@ -1081,7 +1151,12 @@ class CompressedImageData(AbstractImage):
         self.mipmap_data[level - 1] = data
 
     def _have_extension(self):
-        return self.extension is None or gl_info.have_extension(self.extension)
+        if self.extension is not None and gl_info.have_extension(self.extension):
+            return True
+        compressed_format = _get_compressed_format(self.gl_format)
+        if compressed_format is not None:
+            return compressed_format.is_supported()
+        return self.extension is None
 
     def _verify_driver_supported(self):
         """Assert that the extension required for this image data is
@@ -1093,6 +1168,20 @@ class CompressedImageData(AbstractImage):
         if not self._have_extension():
             raise ImageException('%s is required to decode %r' % (self.extension, self))
 
+    def _decode(self, data, width, height):
+        # Software fallback, used when the driver cannot use the format directly.
+        if self.decoder is None:
+            self._verify_driver_supported()
+        return self.decoder(data, width, height)
+
+    def _get_mipmap_levels(self):
+        width, height = self.width, self.height
+        yield 0, self.data, width, height
+        for level, data in enumerate(self.mipmap_data, 1):
+            width = max(1, width >> 1)
+            height = max(1, height >> 1)
+            yield level, data, width, height
+
     def get_texture(self, rectangle=False):
         if rectangle:
             raise ImageException('Compressed texture rectangles not supported')
@@ -1100,27 +1189,22 @@ class CompressedImageData(AbstractImage):
         if self._current_texture:
             return self._current_texture
 
-        texture = Texture.create(self.width, self.height, GL_TEXTURE_2D, None)
-
-        if self.anchor_x or self.anchor_y:
-            texture.anchor_x = self.anchor_x
-            texture.anchor_y = self.anchor_y
-
-        glBindTexture(texture.target, texture.id)
-        glTexParameteri(texture.target, GL_TEXTURE_MIN_FILTER, texture.min_filter)
-        glTexParameteri(texture.target, GL_TEXTURE_MAG_FILTER, texture.mag_filter)
-
         if self._have_extension():
+            texture = Texture.create(self.width, self.height, GL_TEXTURE_2D, None)
+            glBindTexture(texture.target, texture.id)
             glCompressedTexImage2D(texture.target, texture.level,
                                    self.gl_format,
                                    self.width, self.height, 0,
                                    len(self.data), self.data)
         else:
-            image = self.decoder(self.data, self.width, self.height)
-            texture = image.get_texture()
+            texture = self._decode(self.data, self.width, self.height).get_texture()
             assert texture.width == self.width
             assert texture.height == self.height
 
+        if self.anchor_x or self.anchor_y:
+            texture.anchor_x = self.anchor_x
+            texture.anchor_y = self.anchor_y
+
         glFlush()
         self._current_texture = texture
         return texture
@@ -1129,46 +1213,41 @@ class CompressedImageData(AbstractImage):
         if self._current_mipmap_texture:
             return self._current_mipmap_texture
 
-        if not self._have_extension():
-            # TODO mip-mapped software decoded compressed textures.  For now,
-            # just return a non-mipmapped texture.
-            return self.get_texture()
+        have_extension = self._have_extension()
+        if not have_extension and not self.mipmap_data:
+            texture = self._decode(self.data, self.width, self.height).get_mipmapped_texture()
+        else:
+            texture = Texture.create(self.width, self.height, GL_TEXTURE_2D, None)
+            glBindTexture(texture.target, texture.id)
+            glTexParameteri(texture.target, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
 
-        texture = Texture.create(self.width, self.height, GL_TEXTURE_2D, None)
+            for level, data, width, height in self._get_mipmap_levels():
+                if have_extension:
+                    glCompressedTexImage2D(texture.target, level, self.gl_format, width, height, 0, len(data), data)
+                else:
+                    image = self._decode(data, width, height)
+                    image.blit_to_texture(texture.target, level, 0, 0, 0,
+                                          image._get_internalformat(image.format))
+
+            if not self.mipmap_data:
+                glGenerateMipmap(texture.target)
 
         if self.anchor_x or self.anchor_y:
             texture.anchor_x = self.anchor_x
             texture.anchor_y = self.anchor_y
 
-        glBindTexture(texture.target, texture.id)
-
-        glTexParameteri(texture.target, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
-
-        if not self.mipmap_data:
-            glGenerateMipmap(texture.target)
-
-        glCompressedTexImage2D(texture.target, texture.level,
-                               self.gl_format,
-                               self.width, self.height, 0,
-                               len(self.data), self.data)
-
-        width, height = self.width, self.height
-        level = 0
-        for data in self.mipmap_data:
-            width >>= 1
-            height >>= 1
-            level += 1
-            glCompressedTexImage2D(texture.target, level, self.gl_format, width, height, 0, len(data), data)
-
         glFlush()
 
         self._current_mipmap_texture = texture
         return texture
 
     def blit_to_texture(self, target, level, x, y, z):
-        self._verify_driver_supported()
+        if not self._have_extension():
+            image = self._decode(self.data, self.width, self.height)
+            image.blit_to_texture(target, level, x - self.anchor_x, y - self.anchor_y, z)
+            return
 
-        if target == GL_TEXTURE_3D:
+        if target in (GL_TEXTURE_3D, GL_TEXTURE_2D_ARRAY):
             glCompressedTexSubImage3D(target, level,
                                       x - self.anchor_x, y - self.anchor_y, z,
                                       self.width, self.height, 1,
@@ -1347,6 +1426,18 @@ class Texture(AbstractImage):
             data = data.get_region(0, z * self.height, self.width, self.height)
         return data
 
+    def get_image_data_async(self):
+        """Start reading the image data of this texture without waiting for it.
+
+        Only 2D textures are supported.  The pixels are read into a pixel pack
+        buffer of the current context's
+        :py:class:`~pyglet.image.readback.AsyncReadback`.
+
+        :rtype: :py:class:`concurrent.futures.Future`
+        :return: A future resolving to an RGBA :py:class:`~pyglet.image.ImageData`.
+        """
+        return get_buffer_manager().get_readback().read_texture(self)
+
     def get_texture(self, rectangle=False):
         return self
 
@@ -1599,6 +1690,9 @@ class TextureArray(Texture, UniformTextureSequence):
                 Height of the texture.
             `internalformat` : int
                 GL constant giving the internal format of the texture array; for example, ``GL_RGBA``.
+                A block-compressed format such as ``GL_COMPRESSED_RGBA_S3TC_DXT5_EXT`` creates a
+                compressed array, to which :py:class:`~pyglet.image.CompressedImageData` of the same
+                format can be added.
             `min_filter` : int
                 The minifaction filter used for this texture array, commonly ``GL_LINEAR`` or ``GL_NEAREST``
             `mag_filter` : int
@@ -1622,12 +1716,22 @@ class TextureArray(Texture, UniformTextureSequence):
         glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MIN_FILTER, min_filter)
         glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MAG_FILTER, mag_filter)
 
-        glTexImage3D(GL_TEXTURE_2D_ARRAY, 0,
-                     internalformat,
-                     width, height, max_depth,
-                     0,
-                     internalformat, GL_UNSIGNED_BYTE,
-                     0)
+        compressed_format = _get_compressed_format(internalformat)
+        if compressed_format is not None:
+            # Layers are filled with glCompressedTexSubImage3D by CompressedImageData.
+            glCompressedTexImage3D(GL_TEXTURE_2D_ARRAY, 0,
+                                   internalformat,
+                                   width, height, max_depth,
+                                   0,
+                                   compressed_format.get_size(width, height, max_depth),
+                                   None)
+        else:
+            glTexImage3D(GL_TEXTURE_2D_ARRAY, 0,
+                         internalformat,
+                         width, height, max_depth,
+                         0,
+                         internalformat, GL_UNSIGNED_BYTE,
+                         0)
         glFlush()
 
         texture = cls(width, height, GL_TEXTURE_2D_ARRAY, tex_id.value, max_depth)
@@ -1986,6 +2090,7 @@ class BufferManager:
         self.depth_buffer = None
         self.free_stencil_bits = None
         self.refs = []
+        self.readback = None
 
     @staticmethod
     def get_viewport():
@@ -2061,6 +2166,15 @@ class BufferManager:
 
         return bufimg
 
+    def get_readback(self):
+        """Get the asynchronous pixel readback ring of this context.
+
+        :rtype: :py:class:`~pyglet.image.readback.AsyncReadback`
+        """
+        if self.readback is None:
+            self.readback = AsyncReadback()
+        return self.readback
+
 
 def get_buffer_manager():
     """Get the buffer manager for the current OpenGL context.
@@ -2110,6 +2224,17 @@ class BufferImage(AbstractImage):
         glReadPixels(x, y, self.width, self.height, self.gl_format, GL_UNSIGNED_BYTE, buf)
         return ImageData(self.width, self.height, self.format, buf)
 
+    def get_image_data_async(self):
+        """Start reading the image data of this buffer without waiting for it.
+
+        The pixels are read into a pixel pack buffer of the current context's
+        :py:class:`~pyglet.image.readback.AsyncReadback`.
+
+        :rtype: :py:class:`concurrent.futures.Future`
+        :return: A future resolving to an :py:class:`~pyglet.image.ImageData`.
+        """
+        return get_buffer_manager().get_readback().read_buffer(self)
+
     def get_region(self, x, y, width, height):
         if self.owner:
             return self.owner.get_region(x + self.x, y + self.y, width, height)
@@ -38,8 +38,22 @@ If you wish to adjust this, you can manually create the Animation from a list of
 
     ani = pyglet.image.Animation(frames=[frame_a, frame_b, frame_c])
 
+Long animations can instead be decoded as they play, with a
+:py:class:`~StreamingAnimation`, so that only a few frames are in memory
+at once::
+
+    ani = pyglet.image.load_animation('long.gif', streaming=True)
+
 """
 
+import io
+import weakref
+import threading
+
+from collections import deque
+
+import pyglet
+
 
 class Animation:
     """Sequence of images with timing information.
@@ -177,3 +191,344 @@ class AnimationFrame:
 
     def __repr__(self):
         return "AnimationFrame({0}, duration={1})".format(self.image, self.duration)
+
+
+class _FrameStream:
+    """Decodes frames in order on a worker thread, a few frames ahead.
+
+    Deliberately holds no reference to the animation, so that the animation
+    can be garbage collected (and stop the thread) while the thread runs.
+    """
+
+    def __init__(self, open_frames, count, look_ahead):
+        self._open_frames = open_frames
+        self._count = count
+        self._look_ahead = max(1, look_ahead)
+        self._condition = threading.Condition()
+        self._ready = deque()
+        self._next_index = 0
+        self._seek = None
+        self._closed = False
+        self._error = None
+        self.stalls = 0
+        self._thread = None
+
+    def get(self, index):
+        """Wait for the decoded image data of frame `index`."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+        with self._condition:
+            stalled = False
+            while True:
+                if self._error is not None:
+                    raise self._error
+                ready = self._ready
+                next_index = ready[0][0] if ready else self._next_index
+                if ready and next_index == index:
+                    image = ready.popleft()[1]
+                    self._condition.notify_all()
+                    return image
+
+                if (index - next_index) % self._count > index:
+                    # Further to decode forward than from the first frame, so restart.
+                    ready.clear()
+                    self._seek = self._next_index = index
+                    self._condition.notify_all()
+                elif ready:
+                    # Frame has been skipped.
+                    ready.popleft()
+                    self._condition.notify_all()
+                else:
+                    if not stalled:
+                        self.stalls += 1
+                        stalled = True
+                    self._condition.wait()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._ready.clear()
+            self._condition.notify_all()
+
+    def _run(self):
+        frames = None
+        position = 0
+        try:
+            while True:
+                with self._condition:
+                    while not self._closed and self._seek is None and len(self._ready) >= self._look_ahead:
+                        self._condition.wait()
+                    if self._closed:
+                        return
+                    seek, self._seek = self._seek, None
+
+                if seek is not None and (frames is None or seek < position):
+                    frames = None
+                if frames is None:
+                    frames = self._open_frames()
+                    position = 0
+                if seek is not None:
+                    for _ in range(seek - position):
+                        next(frames)
+                    position = seek
+
+                try:
+                    frame = next(frames)
+                except StopIteration:
+                    frames = None
+                    continue
+
+                # Convert on this thread, so that uploading is a plain copy.
+                image = frame.image.get_image_data()
+                image = pyglet.image.ImageData(image.width, image.height, 'RGBA',
+                                               image.get_data('RGBA', image.width * 4))
+
+                with self._condition:
+                    if self._seek is None and not self._closed:
+                        self._ready.append((position, image))
+                        self._next_index = (position + 1) % self._count
+                        self._condition.notify_all()
+                position += 1
+
+        except Exception as e:
+            with self._condition:
+                self._error = e
+                self._condition.notify_all()
+
+
+class StreamingFrame:
+    """A frame of a :py:class:`StreamingAnimation`.
+
+    The image of the frame is decoded and uploaded when :py:attr:`image` is
+    accessed.
+    """
+
+    __slots__ = '_animation', 'index', 'duration'
+
+    def __init__(self, animation, index, duration):
+        self._animation = animation
+        self.index = index
+        self.duration = duration
+
+    @property
+    def image(self):
+        """The texture region holding this frame.
+
+        :type: :py:class:`~pyglet.image.TextureRegion`
+        """
+        return self._animation._get_frame_texture(self.index)
+
+    def __repr__(self):
+        return "StreamingFrame({0}, duration={1})".format(self.index, self.duration)
+
+
+class _StreamingFrames:
+    # A read-only sequence of StreamingFrame, created on access.
+    def __init__(self, animation, durations):
+        # A proxy, to avoid a reference cycle delaying the animation's cleanup.
+        self._animation = weakref.proxy(animation)
+        self._durations = durations
+
+    def __len__(self):
+        return len(self._durations)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._durations)
+        return StreamingFrame(self._animation, index, self._durations[index])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self._durations)))
+
+
+class StreamingAnimation(Animation):
+    """An animation that decodes its frames on demand.
+
+    Rather than decoding and uploading every frame in advance, frames are
+    decoded in order on a worker thread, at most `look_ahead` frames ahead of
+    the frame being shown.  Each frame is uploaded into one slot of a fixed
+    ring of `ring_size` regions of a single texture when it is shown, so
+    memory use does not depend on the number of frames.  Because the regions
+    share a texture, a :py:class:`~pyglet.sprite.Sprite` changing frames only
+    updates its texture coordinates.
+
+    A streaming animation can be used anywhere an
+    :py:class:`~pyglet.image.Animation` can::
+
+        ani = pyglet.image.load_animation('long.gif', streaming=True)
+        sprite = pyglet.sprite.Sprite(img=ani)
+
+    Frames are decoded sequentially, so it is best suited to one sprite (or
+    several sprites showing the same frame).  Sprites showing different
+    frames of the same streaming animation cause frames to be decoded again.
+    """
+
+    def __init__(self, open_frames, durations, width, height, ring_size=4, look_ahead=3):
+        """Create a streaming animation.
+
+        :Parameters:
+            `open_frames` : callable
+                A function returning a new iterator over the
+                :py:class:`~pyglet.image.AnimationFrame` objects of the
+                animation, starting at the first frame.  It is called again
+                to loop or to go back to an earlier frame.
+            `durations` : list of float
+                The duration of each frame, as for
+                :py:class:`~pyglet.image.AnimationFrame`.
+            `width` : int
+                Width of the largest frame.
+            `height` : int
+                Height of the largest frame.
+            `ring_size` : int
+                Number of frames kept in video memory.  At least 2.
+            `look_ahead` : int
+                Number of decoded frames to prepare ahead of the current one.
+
+        """
+        assert len(durations)
+        self.frames = _StreamingFrames(self, durations)
+        self.width = width
+        self.height = height
+        self.ring_size = max(2, ring_size)
+        self.look_ahead = look_ahead
+        self._open_frames = open_frames
+        self._stream = _FrameStream(open_frames, len(durations), look_ahead)
+        self._transform = None
+        self._texture = None
+        self._slots = []
+        self._slot_frames = []
+
+    @classmethod
+    def load(cls, filename, file=None, decoder=None, ring_size=4, look_ahead=3):
+        """Load a streaming animation from a file.
+
+        The encoded file is kept in memory, and decoded again each time the
+        animation loops.
+
+        :Parameters:
+            `filename` : str
+                Used to guess the animation format, and to load the file if
+                `file` is unspecified.
+            `file` : file-like object or None
+                File object containing the animation stream.
+            `decoder` : ImageDecoder or None
+                If unspecified, all decoders that are registered for the
+                filename extension are tried.
+
+        :rtype: :py:class:`~pyglet.image.StreamingAnimation`
+        """
+        from pyglet.image import codecs
+        from pyglet.image.codecs import gif
+
+        if file is None:
+            with open(filename, 'rb') as f:
+                data = f.read()
+        else:
+            data = file.read()
+
+        decoders = [decoder] if decoder else codecs.get_animation_decoders(filename)
+        if not decoders:
+            decoders = codecs.get_animation_decoders()
+
+        first_exception = None
+        for decoder in decoders:
+            def open_frames(decoder=decoder):
+                return decoder.decode_animation_frames(filename, io.BytesIO(data))
+
+            try:
+                first = next(open_frames())
+            except (codecs.ImageDecodeException, StopIteration) as e:
+                first_exception = first_exception or e
+                continue
+
+            durations = None
+            if data[:3] == b'GIF':
+                durations = [image.delay for image in gif.read(io.BytesIO(data)).images]
+            if not durations:
+                durations = [frame.duration for frame in open_frames()]
+
+            image = first.image
+            return cls(open_frames, durations, image.width, image.height, ring_size, look_ahead)
+
+        if first_exception is None:
+            raise codecs.ImageDecodeException('No animation decoders are available for this file.')
+        raise first_exception
+
+    @property
+    def stalls(self):
+        """Number of frames that were not decoded in time, and had to be
+        waited for.
+
+        :type: int
+        """
+        return self._stream.stalls
+
+    def _create_ring(self):
+        max_size = pyglet.image.get_max_texture_size()
+        columns = max(1, min(self.ring_size, max_size // self.width))
+        rows = -(-self.ring_size // columns)
+        self._texture = pyglet.image.Texture.create(self.width * columns, self.height * rows)
+        for i in range(self.ring_size):
+            row, column = divmod(i, columns)
+            self._slots.append(self._texture.get_region(column * self.width, row * self.height,
+                                                        self.width, self.height))
+        self._slot_frames = [None] * self.ring_size
+
+    def _get_frame_texture(self, index):
+        if self._texture is None:
+            self._create_ring()
+
+        slot = index % self.ring_size
+        region = self._slots[slot]
+        if self._slot_frames[slot] != index:
+            image = self._stream.get(index)
+            if image.width > self.width or image.height > self.height:
+                raise pyglet.image.ImageException(f'Frame {index} is larger than the first frame.')
+            region.blit_into(image, 0, 0, 0)
+            self._slot_frames[slot] = index
+
+        if self._transform:
+            return region.get_transform(*self._transform)
+        return region
+
+    def add_to_texture_bin(self, texture_bin, border=0):
+        """Not supported; the frames of a streaming animation are never all
+        decoded at once."""
+        raise pyglet.image.ImageException('Streaming animations cannot be added to a texture bin.')
+
+    def get_transform(self, flip_x=False, flip_y=False, rotate=0):
+        """Create a copy of this animation applying a simple transformation.
+
+        The copy decodes its frames separately.
+
+        :rtype: :py:class:`~pyglet.image.StreamingAnimation`
+        """
+        animation = self.__class__(self._open_frames, self.frames._durations, self.width, self.height,
+                                   self.ring_size, self.look_ahead)
+        animation._transform = (flip_x, flip_y, rotate)
+        return animation
+
+    def get_max_width(self):
+        return self.width
+
+    def get_max_height(self):
+        return self.height
+
+    def delete(self):
+        """Stop decoding and release the texture ring."""
+        self._stream.close()
+        self._texture = None
+        self._slots = []
+
+    def __del__(self):
+        try:
+            self._stream.close()
+        except AttributeError:
+            pass
+
+    def __repr__(self):
+        return "StreamingAnimation(frames={0})".format(len(self.frames))
@@ -3,6 +3,9 @@
 This module is used by :py:mod:`pyglet.resource` to efficiently pack small
 images into larger textures.  :py:class:`~pyglet.image.atlas.TextureAtlas` maintains one texture;
 :py:class:`TextureBin` manages a collection of atlases of a given size.
+:py:class:`TextureArrayAtlas` and :py:class:`TextureArrayAtlasBin` pack images
+into the layers of a texture array instead, so that sprites using images from
+different layers can still be drawn together.
 
 Example usage::
 
@@ -23,12 +26,14 @@ the application's responsibility to keep track of the regions returned by the
 
 .. versionadded:: 1.1
 """
-from typing import TYPE_CHECKING, Tuple, Optional
+from typing import TYPE_CHECKING, Tuple, Optional, List
 
 import pyglet
 
+from pyglet import gl
+
 if TYPE_CHECKING:
-    from pyglet.image import AbstractImage, TextureRegion, TextureArrayRegion
+    from pyglet.image import AbstractImage, CompressedImageData, TextureRegion, TextureArrayRegion
 
 
 class AllocatorException(Exception):
@@ -142,10 +147,150 @@ class Allocator:
         return 1.0 - self.used_area / possible_area
 
 
+class MaxRectsAllocator:
+    """Rectangular area allocation using the MaxRects algorithm.
+
+    This allocator has the same interface as :py:class:`Allocator`, but keeps
+    track of every maximal free rectangle remaining in the area, and places
+    each new rectangle in the free rectangle that fits it most tightly ("best
+    short side fit").  It is slower than :py:class:`Allocator`, but packs
+    rectangles of mixed sizes much more densely, regardless of the order in
+    which they are allocated.
+
+    .. versionadded:: 2.0.10
+    """
+    __slots__ = 'width', 'height', 'free_rects', 'used_area', 'used_height'
+
+    def __init__(self, width: int, height: int) -> None:
+        """Create a `MaxRectsAllocator` of the given size.
+
+        :Parameters:
+            `width` : int
+                Width of the allocation region.
+            `height` : int
+                Height of the allocation region.
+
+        """
+        assert width > 0 and height > 0
+        self.width = width
+        self.height = height
+        # Free rectangles, as (x, y, width, height) tuples.
+        self.free_rects = [(0, 0, width, height)]
+        self.used_area = 0
+        self.used_height = 0
+
+    def alloc(self, width: int, height: int) -> Tuple[int, int]:
+        """Get a free area in the allocator of the given size.
+
+        After calling `alloc`, the requested area will no longer be used.
+        If there is not enough room to fit the given area `AllocatorException`
+        is raised.
+
+        :Parameters:
+            `width` : int
+                Width of the area to allocate.
+            `height` : int
+                Height of the area to allocate.
+
+        :rtype: int, int
+        :return: The X and Y coordinates of the bottom-left corner of the
+            allocated region.
+        """
+        assert width > 0 and height > 0
+
+        best = None
+        best_short = best_long = None
+        for fx, fy, fw, fh in self.free_rects:
+            if fw >= width and fh >= height:
+                leftover_w = fw - width
+                leftover_h = fh - height
+                short = min(leftover_w, leftover_h)
+                long = max(leftover_w, leftover_h)
+                if best is None or short < best_short or (short == best_short and long < best_long):
+                    best = fx, fy
+                    best_short, best_long = short, long
+
+        if best is None:
+            raise AllocatorException('No more space in %r for box %dx%d' % (self, width, height))
+
+        x, y = best
+        self._split_free_rects(x, y, width, height)
+        self.used_area += width * height
+        self.used_height = max(self.used_height, y + height)
+        return x, y
+
+    def _split_free_rects(self, x: int, y: int, width: int, height: int) -> None:
+        x2 = x + width
+        y2 = y + height
+
+        kept = []
+        created = []
+        for free in self.free_rects:
+            fx, fy, fw, fh = free
+            fx2 = fx + fw
+            fy2 = fy + fh
+            if x >= fx2 or x2 <= fx or y >= fy2 or y2 <= fy:
+                kept.append(free)
+                continue
+
+            # Replace the intersected free rectangle with the (up to four)
+            # maximal rectangles around the allocated area.
+            if x > fx:
+                created.append((fx, fy, x - fx, fh))
+            if x2 < fx2:
+                created.append((x2, fy, fx2 - x2, fh))
+            if y > fy:
+                created.append((fx, fy, fw, y - fy))
+            if y2 < fy2:
+                created.append((fx, y2, fw, fy2 - y2))
+
+        # Only the new rectangles can be redundant: discard those contained
+        # in another free rectangle.  Existing rectangles are already maximal
+        # with respect to each other.
+        unique = []
+        for i, rect in enumerate(created):
+            if any(_contains(other, rect) for other in kept):
+                continue
+            if any(_contains(other, rect) and (other != rect or j < i)
+                   for j, other in enumerate(created) if j != i):
+                continue
+            unique.append(rect)
+
+        self.free_rects = kept + unique
+
+    def get_usage(self) -> float:
+        """Get the fraction of area already allocated.
+
+        This method is useful for debugging and profiling only.
+
+        :rtype: float
+        """
+        return self.used_area / float(self.width * self.height)
+
+    def get_fragmentation(self) -> float:
+        """Get the fraction of area below the highest allocation that is not
+        in use.
+
+        This method is useful for debugging and profiling only.
+
+        :rtype: float
+        """
+        if not self.used_height:
+            return 0.0
+        possible_area = self.used_height * self.width
+        return 1.0 - self.used_area / possible_area
+
+
+def _contains(outer, inner) -> bool:
+    ox, oy, ow, oh = outer
+    ix, iy, iw, ih = inner
+    return ox <= ix and oy <= iy and ix + iw <= ox + ow and iy + ih <= oy + oh
+
+
 class TextureAtlas:
     """Collection of images within a texture."""
 
-    def __init__(self, width: int = 2048, height: int = 2048) -> None:
+    def __init__(self, width: int = 2048, height: int = 2048, allocator_class=Allocator) -> None:
         """Create a texture atlas of the given size.
 
         :Parameters:
@@ -153,6 +298,9 @@ class TextureAtlas:
                 Width of the underlying texture.
             `height` : int
                 Height of the underlying texture.
+            `allocator_class` : type
+                The allocator used to place images in the texture, such as
+                :py:class:`Allocator` or :py:class:`MaxRectsAllocator`.
 
         """
         max_texture_size = pyglet.image.get_max_texture_size()
@@ -160,7 +308,7 @@ class TextureAtlas:
         height = min(height, max_texture_size)
 
         self.texture = pyglet.image.Texture.create(width, height)
-        self.allocator = Allocator(width, height)
+        self.allocator = allocator_class(width, height)
 
     def add(self, img: 'AbstractImage', border: int = 0) -> 'TextureRegion':
         """Add an image to the atlas.
@@ -187,6 +335,80 @@ class TextureAtlas:
         return self.texture.get_region(x + border, y + border, img.width, img.height)
 
 
+class CompressedTextureAtlas:
+    """Collection of block-compressed images within a compressed texture.
+
+    Images are copied into the texture without being decompressed, so they
+    must all be :py:class:`~pyglet.image.CompressedImageData` in the same
+    format as the atlas.  Images are placed on block boundaries, as required
+    by ``glCompressedTexSubImage2D``.
+    """
+
+    def __init__(self, gl_format: int, width: int = 2048, height: int = 2048, allocator_class=Allocator) -> None:
+        """Create a compressed texture atlas of the given size.
+
+        :Parameters:
+            `gl_format` : int
+                The compressed format of the texture, such as
+                ``GL_COMPRESSED_RGBA_S3TC_DXT5_EXT``.
+            `width` : int
+                Width of the underlying texture.
+            `height` : int
+                Height of the underlying texture.
+            `allocator_class` : type
+                The allocator used to place images in the texture, such as
+                :py:class:`Allocator` or :py:class:`MaxRectsAllocator`.
+
+        """
+        block_format = pyglet.image.compressed.get_format(gl_format)
+        if block_format is None:
+            raise pyglet.image.ImageException(f'0x{gl_format:04X} is not a block-compressed format.')
+
+        max_texture_size = pyglet.image.get_max_texture_size()
+        width = min(width, max_texture_size)
+        height = min(height, max_texture_size)
+
+        self.gl_format = gl_format
+        self.block_format = block_format
+        self.texture = pyglet.image.Texture.create(width, height, internalformat=None)
+        blank = (gl.GLubyte * block_format.get_size(width, height))()
+        gl.glCompressedTexImage2D(self.texture.target, 0, gl_format, width, height, 0, len(blank), blank)
+
+        # Allocate in units of whole blocks.
+        self.allocator = allocator_class(width // block_format.block_width, height // block_format.block_height)
+
+    def add(self, img: 'CompressedImageData', border: int = 0) -> 'TextureRegion':
+        """Add a compressed image to the atlas.
+
+        `AllocatorException` will be raised if there is no room in the atlas
+        for the image.
+
+        :Parameters:
+            `img` : `~pyglet.image.CompressedImageData`
+                The image to add, in the same format as the atlas.
+            `border` : int
+                Leaves at least the specified pixels of blank space around
+                each image added to the Atlas.  This is rounded up to a whole
+                number of blocks.
+
+        :rtype: :py:class:`~pyglet.image.TextureRegion`
+        :return: The region of the atlas containing the newly added image.
+        """
+        if getattr(img, 'gl_format', None) != self.gl_format:
+            raise pyglet.image.ImageException(f'{img!r} is not in the format of this atlas.')
+
+        block_width = self.block_format.block_width
+        block_height = self.block_format.block_height
+        border_x = -(-border // block_width)
+        border_y = -(-border // block_height)
+        bx, by = self.allocator.alloc(-(-img.width // block_width) + border_x * 2,
+                                      -(-img.height // block_height) + border_y * 2)
+        x = (bx + border_x) * block_width
+        y = (by + border_y) * block_height
+        self.texture.blit_into(img, x, y, 0)
+        return self.texture.get_region(x, y, img.width, img.height)
+
+
 class TextureBin:
     """Collection of texture atlases.
 
@@ -194,7 +416,7 @@ class TextureBin:
     ones as necessary to accommodate images added to the bin.
     """
 
-    def __init__(self, texture_width: int = 2048, texture_height: int = 2048) -> None:
+    def __init__(self, texture_width: int = 2048, texture_height: int = 2048, allocator_class=Allocator) -> None:
         """Create a texture bin for holding atlases of the given size.
 
         :Parameters:
@@ -202,14 +424,15 @@ class TextureBin:
                 Width of texture atlases to create.
             `texture_height` : int
                 Height of texture atlases to create.
-            `border` : int
-                Leaves specified pixels of blank space around
-                each image added to the Atlases.
+            `allocator_class` : type
+                The allocator used by each atlas, such as
+                :py:class:`Allocator` or :py:class:`MaxRectsAllocator`.
 
         """
         max_texture_size = pyglet.image.get_max_texture_size()
         self.texture_width = min(texture_width, max_texture_size)
         self.texture_height = min(texture_height, max_texture_size)
+        self.allocator_class = allocator_class
         self.atlases = []
 
     def add(self, img: 'AbstractImage', border: int = 0) -> 'TextureRegion':
@@ -240,10 +463,34 @@ class TextureBin:
                 if img.width < 64 and img.height < 64:
                     self.atlases.remove(atlas)
 
-        atlas = TextureAtlas(self.texture_width, self.texture_height)
+        atlas = TextureAtlas(self.texture_width, self.texture_height, self.allocator_class)
         self.atlases.append(atlas)
         return atlas.add(img, border)
 
+    def add_many(self, images: 'List[AbstractImage]', border: int = 0) -> 'List[TextureRegion]':
+        """Add several images into this texture bin.
+
+        The images are inserted in order of decreasing height, which packs
+        them much more tightly than adding them one at a time in an arbitrary
+        order.
+
+        :Parameters:
+            `images` : list of `~pyglet.image.AbstractImage`
+                The images to add.
+            `border` : int
+                Leaves specified pixels of blank space around
+                each image added to the Atlas.
+
+        :rtype: list of :py:class:`~pyglet.image.TextureRegion`
+        :return: The regions containing the images, in the same order as
+            `images`.
+        """
+        regions = [None] * len(images)
+        order = sorted(range(len(images)), key=lambda i: (images[i].height, images[i].width), reverse=True)
+        for i in order:
+            regions[i] = self.add(images[i], border)
+        return regions
+
 
 class TextureArrayBin:
     """Collection of texture arrays.
@@ -286,3 +533,211 @@ class TextureArrayBin:
         array = pyglet.image.TextureArray.create(self.texture_width, self.texture_height, max_depth=self.max_depth)
         self.arrays.append(array)
         return array.add(img)
+
+
+class TextureArrayAtlas:
+    """Collection of images within the layers of a texture array.
+
+    Each layer of the array is packed with images like a
+    :py:class:`TextureAtlas`.  Since all the images share one texture, sprites
+    using them can be drawn together regardless of the layer they are in.
+    The texture array reserves memory for all of its layers when it is
+    created.
+    """
+
+    def __init__(self, width: int = 2048, height: int = 2048, max_depth: int = 4,
+                 allocator_class=Allocator) -> None:
+        """Create a texture array atlas of the given size.
+
+        :Parameters:
+            `width` : int
+                Width of each layer.
+            `height` : int
+                Height of each layer.
+            `max_depth` : int
+                Number of layers in the texture array.
+            `allocator_class` : type
+                The allocator used to place images in each layer, such as
+                :py:class:`Allocator` or :py:class:`MaxRectsAllocator`.
+
+        """
+        max_texture_size = pyglet.image.get_max_texture_size()
+        width = min(width, max_texture_size)
+        height = min(height, max_texture_size)
+        max_depth = min(max_depth, pyglet.image.get_max_array_texture_layers())
+
+        self.texture = pyglet.image.TextureArray.create(width, height, max_depth=max_depth)
+        self.allocator_class = allocator_class
+        self.allocators = []
+
+    def add(self, img: 'AbstractImage', border: int = 0) -> 'TextureArrayRegion':
+        """Add an image to the first layer with room for it.
+
+        `AllocatorException` is raised if the image is larger than a layer,
+        and `TextureArrayDepthExceeded` if no layer has room for it.
+
+        :Parameters:
+            `img` : `~pyglet.image.AbstractImage`
+                The image to add.
+            `border` : int
+                Leaves specified pixels of blank space around
+                each image added to the Atlas.
+
+        :rtype: :py:class:`~pyglet.image.TextureArrayRegion`
+        :return: The region of the array containing the newly added image.
+        """
+        width = img.width + border * 2
+        height = img.height + border * 2
+        for layer, allocator in enumerate(self.allocators):
+            try:
+                x, y = allocator.alloc(width, height)
+                break
+            except AllocatorException:
+                pass
+        else:
+            if len(self.allocators) >= self.texture.max_depth:
+                raise pyglet.image.TextureArrayDepthExceeded('TextureArrayAtlas is full.')
+            allocator = self.allocator_class(self.texture.width, self.texture.height)
+            x, y = allocator.alloc(width, height)
+            layer = len(self.allocators)
+            self.allocators.append(allocator)
+
+        self.texture.blit_into(img, x + border, y + border, layer)
+        return pyglet.image.TextureArrayRegion(x + border, y + border, layer, img.width, img.height, self.texture)
+
+
+class TextureArrayAtlasBin:
+    """Collection of texture array atlases.
+
+    Like :py:class:`TextureBin`, but images are packed into the layers of
+    :py:class:`TextureArrayAtlas` objects, so far fewer textures are needed.
+    A new array is only created once every layer of the last one is full.
+    """
+
+    def __init__(self, texture_width: int = 2048, texture_height: int = 2048, max_depth: int = 4,
+                 allocator_class=Allocator) -> None:
+        """Create a texture array atlas bin.
+
+        :Parameters:
+            `texture_width` : int
+                Width of the layers of each array.
+            `texture_height` : int
+                Height of the layers of each array.
+            `max_depth` : int
+                Number of layers in each array.
+            `allocator_class` : type
+                The allocator used for each layer, such as
+                :py:class:`Allocator` or :py:class:`MaxRectsAllocator`.
+
+        """
+        max_texture_size = pyglet.image.get_max_texture_size()
+        self.texture_width = min(texture_width, max_texture_size)
+        self.texture_height = min(texture_height, max_texture_size)
+        self.max_depth = max_depth
+        self.allocator_class = allocator_class
+        self.atlases = []
+
+    def add(self, img: 'AbstractImage', border: int = 0) -> 'TextureArrayRegion':
+        """Add an image into this bin.
+
+        `AllocatorException` is raised if the image exceeds the dimensions of
+        ``texture_width`` and ``texture_height``.
+
+        :Parameters:
+            `img` : `~pyglet.image.AbstractImage`
+                The image to add.
+            `border` : int
+                Leaves specified pixels of blank space around
+                each image added to the Atlas.
+
+        :rtype: :py:class:`~pyglet.image.TextureArrayRegion`
+        :return: The region of an array containing the newly added image.
+        """
+        if self.atlases:
+            try:
+                return self.atlases[-1].add(img, border)
+            except pyglet.image.TextureArrayDepthExceeded:
+                pass
+
+        atlas = TextureArrayAtlas(self.texture_width, self.texture_height, self.max_depth, self.allocator_class)
+        self.atlases.append(atlas)
+        return atlas.add(img, border)
+
+    def add_many(self, images: 'List[AbstractImage]', border: int = 0) -> 'List[TextureArrayRegion]':
+        """Add several images into this bin, in order of decreasing height.
+
+        See :py:meth:`TextureBin.add_many`.
+
+        :rtype: list of :py:class:`~pyglet.image.TextureArrayRegion`
+        """
+        regions = [None] * len(images)
+        order = sorted(range(len(images)), key=lambda i: (images[i].height, images[i].width), reverse=True)
+        for i in order:
+            regions[i] = self.add(images[i], border)
+        return regions
+
+
+def pack_images(images: 'List[AbstractImage]', width: int = 2048, height: int = 2048, border: int = 1,
+                allocator_class=MaxRectsAllocator) -> 'Tuple[List[pyglet.image.ImageData], List[Tuple[int, int, int]]]':
+    """Pack images into as few atlas images as possible, without using OpenGL.
+
+    This is intended for packing the images of an application ahead of time,
+    for example with ``tools/packatlas.py``.  The images are placed in order
+    of decreasing size, and the resulting atlas pages are composed in system
+    memory as RGBA :py:class:`~pyglet.image.ImageData`, ready to be saved.
+
+    `AllocatorException` is raised if an image (including its border) is
+    larger than `width` and `height`.
+
+    :Parameters:
+        `images` : list of `~pyglet.image.AbstractImage`
+            The images to pack.
+        `width` : int
+            Width of each atlas page.
+        `height` : int
+            Height of each atlas page.
+        `border` : int
+            Leaves specified pixels of blank space around each image.
+        `allocator_class` : type
+            The allocator used to place images on each page.
+
+    :rtype: (list of :py:class:`~pyglet.image.ImageData`, list of tuple)
+    :return: The atlas pages, and for each image in `images` a tuple of the
+        page index and the X and Y coordinates of the bottom-left corner of
+        the image within that page.
+    """
+    allocators = []
+    placements = [None] * len(images)
+    order = sorted(range(len(images)),
+                   key=lambda i: (images[i].height, images[i].width), reverse=True)
+
+    for i in order:
+        img = images[i]
+        box_width = img.width + border * 2
+        box_height = img.height + border * 2
+        for page, allocator in enumerate(allocators):
+            try:
+                x, y = allocator.alloc(box_width, box_height)
+                break
+            except AllocatorException:
+                pass
+        else:
+            allocator = allocator_class(width, height)
+            x, y = allocator.alloc(box_width, box_height)
+            page = len(allocators)
+            allocators.append(allocator)
+
+        placements[i] = page, x + border, y + border
+
+    pitch = width * 4
+    buffers = [bytearray(pitch * height) for _ in allocators]
+    for img, (page, x, y) in zip(images, placements):
+        data = img.get_image_data().get_data('RGBA', img.width * 4)
+        row_size = img.width * 4
+        buffer = buffers[page]
+        for row in range(img.height):
+            start = (y + row) * pitch + x * 4
+            buffer[start:start + row_size] = data[row * row_size:(row + 1) * row_size]
+
+    pages = [pyglet.image.ImageData(width, height, 'RGBA', bytes(buffer), pitch) for buffer in buffers]
+    return pages, placements
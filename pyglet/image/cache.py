@@ -0,0 +1,252 @@
+"""On-disk cache of decoded images.
+
+Decoding compressed image formats such as PNG is often the most expensive part
+of loading an image, particularly when the pure-Python fallback decoders are
+in use.  :py:class:`ImageCache` stores the raw pixel data of decoded images in
+a directory, keyed by a hash of the encoded file contents and the decoder used.
+When the same file is loaded again, the raw data is memory-mapped directly
+from the cache instead of being decoded.
+
+The cache is limited in size.  When it grows beyond its limit, the least
+recently used entries are removed.
+
+The cache is used automatically by :py:func:`pyglet.image.load` when the
+``image_cache`` option is set to a directory::
+
+    import pyglet
+    pyglet.options['image_cache'] = '/path/to/cache'
+
+Only images that decode to :py:class:`~pyglet.image.ImageData` are cached.
+"""
+
+import os
+import struct
+import ctypes
+import hashlib
+
+from io import BytesIO
+
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+import pyglet
+
+_debug = pyglet.options['debug_texture']
+
+_MAGIC = b'PYGI'
+_VERSION = 1
+_header = struct.Struct('<4sHHIIi')
+
+
+class ImageCache:
+    """A size-bounded, least recently used cache of decoded images."""
+
+    #: Filename extension of cache entries.
+    extension = '.pygimg'
+
+    def __init__(self, directory, max_size=256 * 1024 * 1024):
+        """Create or open an image cache.
+
+        :Parameters:
+            `directory` : str
+                Directory to store cached images in.  It is created if it
+                does not exist.
+            `max_size` : int
+                Maximum total size of the cache, in bytes.
+
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_key(data, decoder_name):
+        """Get the cache key for the given encoded image data.
+
+        :Parameters:
+            `data` : bytes
+                The encoded contents of the image file.
+            `decoder_name` : str
+                Identifies the decoder, so that images decoded differently
+                are cached separately.
+
+        :rtype: str
+        """
+        digest = hashlib.sha1(data)
+        digest.update(decoder_name.encode())
+        return digest.hexdigest()
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, key + self.extension)
+
+    def get(self, key):
+        """Get a cached image.
+
+        Returns ``None`` if the key is not in the cache.  The pixel data of the
+        returned image is memory-mapped from the cache file where possible.
+
+        :rtype: :py:class:`~pyglet.image.ImageData`
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(_header.size)
+                magic, version, fmt_length, width, height, pitch = _header.unpack(header)
+                if magic != _MAGIC or version != _VERSION:
+                    return None
+                fmt = f.read(fmt_length).decode('ascii')
+                offset = _header.size + fmt_length
+
+                if mmap is not None:
+                    # A copy-on-write mapping is writable, so ctypes can wrap it without a copy.
+                    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                    data = (ctypes.c_ubyte * (len(mapping) - offset)).from_buffer(mapping, offset)
+                else:
+                    data = f.read()
+        except (OSError, struct.error, ValueError):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return pyglet.image.ImageData(width, height, fmt, data, pitch)
+
+    def put(self, key, image):
+        """Store the raw data of an image in the cache.
+
+        :Parameters:
+            `key` : str
+                Key returned by :py:meth:`get_key`.
+            `image` : :py:class:`~pyglet.image.ImageData`
+                The decoded image.
+
+        """
+        fmt = image.format
+        pitch = image.pitch
+        data = image.get_data(fmt, pitch)
+        fmt_bytes = fmt.encode('ascii')
+
+        path = self._get_path(key)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_header.pack(_MAGIC, _VERSION, len(fmt_bytes), image.width, image.height, pitch))
+                f.write(fmt_bytes)
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        if self._size is not None:
+            self._size += _header.size + len(fmt_bytes) + len(data)
+        self._evict()
+
+    def load(self, filename, file=None, decoder=None):
+        """Load an image, using the cache if possible.
+
+        The arguments are the same as for :py:func:`pyglet.image.load`.
+
+        :rtype: AbstractImage
+        """
+        if file is None:
+            with open(filename, 'rb') as f:
+                data = f.read()
+        else:
+            data = file.read()
+
+        if decoder:
+            decoder_name = type(decoder).__name__
+        else:
+            decoder_name = ','.join(type(d).__name__ for d in pyglet.image.codecs.get_decoders(filename))
+
+        key = self.get_key(data, decoder_name)
+        image = self.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        if decoder:
+            image = decoder.decode(filename, BytesIO(data))
+        else:
+            image = pyglet.image.codecs.registry.decode(filename, BytesIO(data))
+
+        if type(image) is pyglet.image.ImageData:
+            if _debug:
+                print(f'ImageCache: caching {filename}')
+            self.put(key, image)
+
+        return image
+
+    def _get_entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(self.extension):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def get_size(self):
+        """Get the total size of the cache, in bytes.
+
+        :rtype: int
+        """
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._get_entries())
+        return self._size
+
+    def _evict(self):
+        if self.get_size() <= self.max_size:
+            return
+
+        entries = sorted(self._get_entries())
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Still mapped by an image on some platforms.
+                continue
+            self._size -= size
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        for _, _, path in self._get_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._size = None
+
+
+_image_cache = None
+
+
+def get_image_cache():
+    """Get the image cache configured by the ``image_cache`` option.
+
+    Returns ``None`` if the option is not set.
+
+    :rtype: :py:class:`ImageCache`
+    """
+    global _image_cache
+    directory = pyglet.options['image_cache']
+    if not directory:
+        return None
+    if _image_cache is None or _image_cache.directory != directory:
+        _image_cache = ImageCache(directory, pyglet.options['image_cache_size'])
+    return _image_cache
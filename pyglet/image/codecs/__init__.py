@@ -110,6 +110,16 @@ class ImageDecoder(Decoder):
         """
         raise ImageDecodeException('This decoder cannot decode animations.')
 
+    def decode_animation_frames(self, filename, file):
+        """Decode the given file object and return an iterator over its
+        :py:class:`~pyglet.image.AnimationFrame` objects.
+
+        Used by :py:class:`~pyglet.image.StreamingAnimation`.  Decoders that
+        can decode one frame at a time should override this; by default the
+        whole animation is decoded by :py:meth:`decode_animation` first.
+        """
+        return iter(self.decode_animation(filename, file).frames)
+
     def __repr__(self):
         return "{0}{1}".format(self.__class__.__name__,
                                self.get_animation_file_extensions() +
@@ -140,6 +150,14 @@ def add_default_codecs():
     except ImportError:
         pass
 
+    # Compressed texture in KTX2 format
+    try:
+        from pyglet.image.codecs import ktx2
+        registry.add_encoders(ktx2)
+        registry.add_decoders(ktx2)
+    except ImportError:
+        pass
+
     # Mac OS X default: Quartz
     if compat_platform == 'darwin':
         try:
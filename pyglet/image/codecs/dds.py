@@ -9,6 +9,7 @@ import itertools
 from pyglet.gl import *
 from pyglet.image import CompressedImageData
 from pyglet.image import codecs
+from pyglet.image import compressed
 from pyglet.image.codecs import s3tc, ImageDecodeException
 
 
@@ -103,13 +104,51 @@ class DDPIXELFORMAT(_FileStruct):
     ]
 
 
+class DDS_HEADER_DXT10(_FileStruct):
+    _fields = [
+        ('dxgiFormat', 'I'),
+        ('resourceDimension', 'I'),
+        ('miscFlag', 'I'),
+        ('arraySize', 'I'),
+        ('miscFlags2', 'I'),
+    ]
+
+
 _compression_formats = {
-    (b'DXT1', False): (GL_COMPRESSED_RGB_S3TC_DXT1_EXT,  s3tc.decode_dxt1_rgb),
-    (b'DXT1', True):  (GL_COMPRESSED_RGBA_S3TC_DXT1_EXT, s3tc.decode_dxt1_rgba),
-    (b'DXT3', False): (GL_COMPRESSED_RGBA_S3TC_DXT3_EXT, s3tc.decode_dxt3),
-    (b'DXT3', True):  (GL_COMPRESSED_RGBA_S3TC_DXT3_EXT, s3tc.decode_dxt3),
-    (b'DXT5', False): (GL_COMPRESSED_RGBA_S3TC_DXT5_EXT, s3tc.decode_dxt5),
-    (b'DXT5', True):  (GL_COMPRESSED_RGBA_S3TC_DXT5_EXT, s3tc.decode_dxt5),
+    (b'DXT1', False): GL_COMPRESSED_RGB_S3TC_DXT1_EXT,
+    (b'DXT1', True):  GL_COMPRESSED_RGBA_S3TC_DXT1_EXT,
+    (b'DXT3', False): GL_COMPRESSED_RGBA_S3TC_DXT3_EXT,
+    (b'DXT3', True):  GL_COMPRESSED_RGBA_S3TC_DXT3_EXT,
+    (b'DXT5', False): GL_COMPRESSED_RGBA_S3TC_DXT5_EXT,
+    (b'DXT5', True):  GL_COMPRESSED_RGBA_S3TC_DXT5_EXT,
+}
+
+# Formats identified by FourCC alone.
+_fourcc_formats = {
+    b'ATI1': GL_COMPRESSED_RED_RGTC1,
+    b'BC4U': GL_COMPRESSED_RED_RGTC1,
+    b'BC4S': GL_COMPRESSED_SIGNED_RED_RGTC1,
+    b'ATI2': GL_COMPRESSED_RG_RGTC2,
+    b'BC5U': GL_COMPRESSED_RG_RGTC2,
+    b'BC5S': GL_COMPRESSED_SIGNED_RG_RGTC2,
+}
+
+# DXGI_FORMAT values of the DX10 extended header.
+_dxgi_formats = {
+    71: GL_COMPRESSED_RGBA_S3TC_DXT1_EXT,                   # BC1_UNORM
+    72: compressed.GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT1_EXT,  # BC1_UNORM_SRGB
+    74: GL_COMPRESSED_RGBA_S3TC_DXT3_EXT,                   # BC2_UNORM
+    75: compressed.GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT3_EXT,  # BC2_UNORM_SRGB
+    77: GL_COMPRESSED_RGBA_S3TC_DXT5_EXT,                   # BC3_UNORM
+    78: compressed.GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT5_EXT,  # BC3_UNORM_SRGB
+    80: GL_COMPRESSED_RED_RGTC1,                            # BC4_UNORM
+    81: GL_COMPRESSED_SIGNED_RED_RGTC1,                     # BC4_SNORM
+    83: GL_COMPRESSED_RG_RGTC2,                             # BC5_UNORM
+    84: GL_COMPRESSED_SIGNED_RG_RGTC2,                      # BC5_SNORM
+    95: GL_COMPRESSED_RGB_BPTC_UNSIGNED_FLOAT,              # BC6H_UF16
+    96: GL_COMPRESSED_RGB_BPTC_SIGNED_FLOAT,                # BC6H_SF16
+    98: GL_COMPRESSED_RGBA_BPTC_UNORM,                      # BC7_UNORM
+    99: GL_COMPRESSED_SRGB_ALPHA_BPTC_UNORM,                # BC7_UNORM_SRGB
 }
 
 
@@ -145,17 +184,24 @@ class DDSImageDecoder(codecs.ImageDecoder):
         if not desc.ddpfPixelFormat.dwFlags & DDPF_FOURCC:
             raise ImageDecodeException('Uncompressed DDS textures not supported.')
 
-        has_alpha = desc.ddpfPixelFormat.dwRGBAlphaBitMask != 0
-
-        selector = (desc.ddpfPixelFormat.dwFourCC, has_alpha)
-        if selector not in _compression_formats:
-            raise ImageDecodeException('Unsupported texture compression %s' % desc.ddpfPixelFormat.dwFourCC)
-
-        dformat, decoder = _compression_formats[selector]
-        if dformat == GL_COMPRESSED_RGB_S3TC_DXT1_EXT:
-            block_size = 8
+        fourcc = desc.ddpfPixelFormat.dwFourCC
+        if fourcc == b'DX10':
+            header10 = DDS_HEADER_DXT10(file.read(DDS_HEADER_DXT10.get_size()))
+            if header10.arraySize > 1:
+                raise ImageDecodeException('Texture array DDS files unsupported')
+            if header10.dxgiFormat not in _dxgi_formats:
+                raise ImageDecodeException('Unsupported DXGI format %d' % header10.dxgiFormat)
+            dformat = _dxgi_formats[header10.dxgiFormat]
+        elif fourcc in _fourcc_formats:
+            dformat = _fourcc_formats[fourcc]
         else:
-            block_size = 16
+            has_alpha = desc.ddpfPixelFormat.dwRGBAlphaBitMask != 0
+            selector = (fourcc, has_alpha)
+            if selector not in _compression_formats:
+                raise ImageDecodeException('Unsupported texture compression %s' % fourcc)
+            dformat = _compression_formats[selector]
+
+        block_format = compressed.get_format(dformat)
 
         datas = []
         w, h = width, height
@@ -166,13 +212,13 @@ class DDSImageDecoder(codecs.ImageDecoder):
                 w = 1
             if not h:
                 h = 1
-            size = ((w + 3) // 4) * ((h + 3) // 4) * block_size
-            data = file.read(size)
+            data = file.read(block_format.get_size(w, h))
             datas.append(data)
             w >>= 1
             h >>= 1
 
-        image = CompressedImageData(width, height, dformat, datas[0], 'GL_EXT_texture_compression_s3tc', decoder)
+        image = CompressedImageData(width, height, dformat, datas[0],
+                                    block_format.extensions[0], s3tc.get_decoder(dformat))
         level = 0
         for data in datas[1:]:
             level += 1
@@ -201,7 +201,7 @@ class GdkPixBufAnimation:
     def __iter__(self):
         time = GTimeVal(0, 0)
         anim_iter = gdkpixbuf.gdk_pixbuf_animation_get_iter(self._anim, byref(time))
-        return GdkPixBufAnimationIterator(self._loader, anim_iter, time, self._gif_delays)
+        return GdkPixBufAnimationIterator(self._loader, anim_iter, time, list(self._gif_delays))
 
     def to_animation(self):
         return Animation(list(self))
@@ -281,6 +281,12 @@ class GdkPixbuf2ImageDecoder(ImageDecoder):
         loader = GdkPixBufLoader(filename, file)
         return loader.get_animation().to_animation()
 
+    def decode_animation_frames(self, filename, file):
+        if not file:
+            file = open(filename, 'rb')
+        loader = GdkPixBufLoader(filename, file)
+        return iter(loader.get_animation())
+
 
 def get_decoders():
     return [GdkPixbuf2ImageDecoder()]
@@ -0,0 +1,161 @@
+"""KTX2 texture loader.
+
+Loads block-compressed (BCn, ETC2/EAC and ASTC) and 8-bit uncompressed
+KTX2 files, including their mipmap levels.  Compressed data is returned as
+:py:class:`~pyglet.image.CompressedImageData`, which is uploaded directly if
+the driver supports the format.  Only files without supercompression or with
+zlib supercompression are supported; Basis Universal and Zstandard
+supercompressed files must be transcoded first.
+
+Reference: https://registry.khronos.org/KTX/specs/2.0/ktxspec.v2.html
+"""
+
+import zlib
+import struct
+
+from pyglet.gl import *
+from pyglet.image import CompressedImageData, ImageData
+from pyglet.image import codecs
+from pyglet.image import compressed
+from pyglet.image.codecs import s3tc, ImageDecodeException
+
+IDENTIFIER = b'\xabKTX 20\xbb\r\n\x1a\n'
+
+# supercompressionScheme
+SUPERCOMPRESSION_NONE = 0
+SUPERCOMPRESSION_BASIS_LZ = 1
+SUPERCOMPRESSION_ZSTANDARD = 2
+SUPERCOMPRESSION_ZLIB = 3
+
+_header_format = '<12s9I4I2Q'
+_header_size = struct.calcsize(_header_format)
+_level_format = '<3Q'
+_level_size = struct.calcsize(_level_format)
+
+# VkFormat values of block-compressed formats.
+_compressed_formats = {
+    131: GL_COMPRESSED_RGB_S3TC_DXT1_EXT,                       # BC1_RGB_UNORM_BLOCK
+    132: compressed.GL_COMPRESSED_SRGB_S3TC_DXT1_EXT,           # BC1_RGB_SRGB_BLOCK
+    133: GL_COMPRESSED_RGBA_S3TC_DXT1_EXT,                      # BC1_RGBA_UNORM_BLOCK
+    134: compressed.GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT1_EXT,     # BC1_RGBA_SRGB_BLOCK
+    135: GL_COMPRESSED_RGBA_S3TC_DXT3_EXT,                      # BC2_UNORM_BLOCK
+    136: compressed.GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT3_EXT,     # BC2_SRGB_BLOCK
+    137: GL_COMPRESSED_RGBA_S3TC_DXT5_EXT,                      # BC3_UNORM_BLOCK
+    138: compressed.GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT5_EXT,     # BC3_SRGB_BLOCK
+    139: GL_COMPRESSED_RED_RGTC1,                               # BC4_UNORM_BLOCK
+    140: GL_COMPRESSED_SIGNED_RED_RGTC1,                        # BC4_SNORM_BLOCK
+    141: GL_COMPRESSED_RG_RGTC2,                                # BC5_UNORM_BLOCK
+    142: GL_COMPRESSED_SIGNED_RG_RGTC2,                         # BC5_SNORM_BLOCK
+    143: GL_COMPRESSED_RGB_BPTC_UNSIGNED_FLOAT,                 # BC6H_UFLOAT_BLOCK
+    144: GL_COMPRESSED_RGB_BPTC_SIGNED_FLOAT,                   # BC6H_SFLOAT_BLOCK
+    145: GL_COMPRESSED_RGBA_BPTC_UNORM,                         # BC7_UNORM_BLOCK
+    146: GL_COMPRESSED_SRGB_ALPHA_BPTC_UNORM,                   # BC7_SRGB_BLOCK
+    147: GL_COMPRESSED_RGB8_ETC2,                               # ETC2_R8G8B8_UNORM_BLOCK
+    148: GL_COMPRESSED_SRGB8_ETC2,                              # ETC2_R8G8B8_SRGB_BLOCK
+    149: GL_COMPRESSED_RGB8_PUNCHTHROUGH_ALPHA1_ETC2,           # ETC2_R8G8B8A1_UNORM_BLOCK
+    150: GL_COMPRESSED_SRGB8_PUNCHTHROUGH_ALPHA1_ETC2,          # ETC2_R8G8B8A1_SRGB_BLOCK
+    151: GL_COMPRESSED_RGBA8_ETC2_EAC,                          # ETC2_R8G8B8A8_UNORM_BLOCK
+    152: GL_COMPRESSED_SRGB8_ALPHA8_ETC2_EAC,                   # ETC2_R8G8B8A8_SRGB_BLOCK
+    153: GL_COMPRESSED_R11_EAC,                                 # EAC_R11_UNORM_BLOCK
+    154: GL_COMPRESSED_SIGNED_R11_EAC,                          # EAC_R11_SNORM_BLOCK
+    155: GL_COMPRESSED_RG11_EAC,                                # EAC_R11G11_UNORM_BLOCK
+    156: GL_COMPRESSED_SIGNED_RG11_EAC,                         # EAC_R11G11_SNORM_BLOCK
+}
+
+# ASTC_4x4_UNORM_BLOCK (157) to ASTC_12x12_SRGB_BLOCK (184) alternate between
+# UNORM and SRGB, in the same order of block sizes as the GL constants.
+for _i in range(14):
+    _compressed_formats[157 + _i * 2] = compressed.GL_COMPRESSED_RGBA_ASTC_4x4_KHR + _i
+    _compressed_formats[158 + _i * 2] = compressed.GL_COMPRESSED_SRGB8_ALPHA8_ASTC_4x4_KHR + _i
+
+# VkFormat values of uncompressed 8-bit formats.
+_uncompressed_formats = {
+    9: 'R',         # R8_UNORM
+    16: 'RG',       # R8G8_UNORM
+    23: 'RGB',      # R8G8B8_UNORM
+    29: 'RGB',      # R8G8B8_SRGB
+    30: 'BGR',      # B8G8R8_UNORM
+    37: 'RGBA',     # R8G8B8A8_UNORM
+    43: 'RGBA',     # R8G8B8A8_SRGB
+    44: 'BGRA',     # B8G8R8A8_UNORM
+    50: 'BGRA',     # B8G8R8A8_SRGB
+}
+
+
+class KTX2Header:
+    """The fixed-size header and index of a KTX2 file."""
+
+    def __init__(self, data):
+        if len(data) < _header_size:
+            raise ImageDecodeException('Not a KTX2 file')
+        (self.identifier, self.vk_format, self.type_size,
+         self.width, self.height, self.depth,
+         self.layers, self.faces, self.levels, self.supercompression,
+         self.dfd_offset, self.dfd_length, self.kvd_offset, self.kvd_length,
+         self.sgd_offset, self.sgd_length) = struct.unpack(_header_format, data[:_header_size])
+
+        if self.identifier != IDENTIFIER:
+            raise ImageDecodeException('Invalid KTX2 file (incorrect identifier).')
+
+
+class KTX2ImageDecoder(codecs.ImageDecoder):
+    def get_file_extensions(self):
+        return ['.ktx2']
+
+    def decode(self, filename, file):
+        if not file:
+            file = open(filename, 'rb')
+
+        data = file.read()
+        header = KTX2Header(data)
+
+        if header.depth > 1:
+            raise ImageDecodeException('Volume KTX2 files unsupported')
+        if header.layers > 1:
+            raise ImageDecodeException('Texture array KTX2 files unsupported')
+        if header.faces != 1:
+            raise ImageDecodeException('Cubemap KTX2 files unsupported')
+        if header.supercompression not in (SUPERCOMPRESSION_NONE, SUPERCOMPRESSION_ZLIB):
+            raise ImageDecodeException('Unsupported KTX2 supercompression scheme %d' % header.supercompression)
+
+        # A level count of 0 asks the loader to generate mipmaps.
+        levels = []
+        for i in range(max(1, header.levels)):
+            offset = _header_size + i * _level_size
+            level_offset, length, uncompressed_length = struct.unpack_from(_level_format, data, offset)
+            level_data = data[level_offset:level_offset + length]
+            if len(level_data) != length:
+                raise ImageDecodeException('Invalid KTX2 file (truncated level %d).' % i)
+            if header.supercompression == SUPERCOMPRESSION_ZLIB:
+                level_data = zlib.decompress(level_data)
+            levels.append(level_data)
+
+        width, height = header.width, header.height
+
+        if header.vk_format in _compressed_formats:
+            gl_format = _compressed_formats[header.vk_format]
+            block_format = compressed.get_format(gl_format)
+            image = CompressedImageData(width, height, gl_format, levels[0],
+                                        block_format.extensions[0], s3tc.get_decoder(gl_format))
+            for level, level_data in enumerate(levels[1:], 1):
+                image.set_mipmap_data(level, level_data)
+            return image
+
+        if header.vk_format in _uncompressed_formats:
+            fmt = _uncompressed_formats[header.vk_format]
+            image = ImageData(width, height, fmt, levels[0])
+            for level, level_data in enumerate(levels[1:], 1):
+                if not (width >> level and height >> level):
+                    break
+                image.set_mipmap_image(level, ImageData(width >> level, height >> level, fmt, level_data))
+            return image
+
+        raise ImageDecodeException('Unsupported KTX2 format %d' % header.vk_format)
+
+
+def get_decoders():
+    return [KTX2ImageDecoder()]
+
+
+def get_encoders():
+    return []
@@ -1,6 +1,7 @@
 """Encoder and decoder for PNG files, using PyPNG (png.py).
 """
 
+import zlib
 import array
 import itertools
 
@@ -10,6 +11,126 @@ from pyglet.image.codecs import ImageDecoder, ImageEncoder
 import pyglet.extlibs.png as pypng
 
 
+# Formats of the 8-bit colour types handled by `_decode_direct`, by PNG colour type.
+_direct_formats = {
+    0: 'L',
+    2: 'RGB',
+    4: 'LA',
+    6: 'RGBA',
+}
+
+
+def _undo_filters(raw, width, height, bpp):
+    """Reverse the scanline filters of non-interlaced 8-bit image data.
+
+    Returns a single bytearray of `height` rows of ``width * bpp`` bytes, with
+    the filter type bytes removed.  Rows are decoded in place in the output
+    buffer, so the previous row is always available without a copy.
+    """
+    stride = width * bpp
+    out = bytearray(stride * height)
+    view = memoryview(out)
+    raw = memoryview(raw)
+    mask = int.from_bytes(b'\x7f' * stride, 'little')
+    high = int.from_bytes(b'\x80' * stride, 'little')
+    and_255 = (255).__and__
+    accumulate = itertools.accumulate
+
+    for y in range(height):
+        src = y * (stride + 1)
+        filter_type = raw[src]
+        line = raw[src + 1:src + 1 + stride]
+        o = y * stride
+        prev = view[o - stride:o] if y else None
+
+        if filter_type == 0 or (filter_type == 2 and prev is None):
+            out[o:o + stride] = line
+
+        elif filter_type == 1 or (filter_type == 4 and prev is None):
+            # Sub (and Paeth with no previous row): a running sum per channel.
+            for c in range(bpp):
+                out[o + c:o + stride:bpp] = bytes(map(and_255, accumulate(line[c::bpp])))
+
+        elif filter_type == 2:
+            # Up: add the previous row byte-wise, without carries between bytes.
+            a = int.from_bytes(line, 'little')
+            b = int.from_bytes(prev, 'little')
+            total = ((a & mask) + (b & mask)) ^ ((a ^ b) & high)
+            out[o:o + stride] = total.to_bytes(stride, 'little')
+
+        elif filter_type == 3:
+            # Average.  Each channel is decoded separately, keeping the
+            # previous pixel's value in a local instead of re-reading it.
+            if prev is None:
+                prev = bytes(stride)
+            for ch in range(bpp):
+                a = 0
+                result = []
+                append = result.append
+                for x, b in zip(line[ch::bpp], prev[ch::bpp]):
+                    a = (x + ((a + b) >> 1)) & 255
+                    append(a)
+                out[o + ch:o + stride:bpp] = bytes(result)
+
+        elif filter_type == 4:
+            # Paeth
+            for ch in range(bpp):
+                a = c = 0
+                result = []
+                append = result.append
+                for x, b in zip(line[ch::bpp], prev[ch::bpp]):
+                    pa = b - c
+                    pb = a - c
+                    pc = pa + pb
+                    if pa < 0:
+                        pa = -pa
+                    if pb < 0:
+                        pb = -pb
+                    if pc < 0:
+                        pc = -pc
+                    if pa <= pb and pa <= pc:
+                        a = (x + a) & 255
+                    elif pb <= pc:
+                        a = (x + b) & 255
+                    else:
+                        a = (x + c) & 255
+                    append(a)
+                    c = b
+                out[o + ch:o + stride:bpp] = bytes(result)
+
+        else:
+            raise pypng.FormatError(f'Invalid PNG filter type {filter_type}.')
+
+    return out
+
+
+def _decode_direct(reader):
+    """Decode the common case of an 8-bit, non-interlaced, non-palette image
+    without a tRNS chunk.
+
+    `reader` must have read the preamble.  Returns a tuple of
+    ``(format, data)``, or ``None`` if the image is not supported, in which
+    case the reader has not consumed any image data.
+    """
+    fmt = _direct_formats.get(reader.color_type)
+    if fmt is None or reader.bitdepth != 8 or reader.interlace or reader.trns:
+        return None
+
+    idat = []
+    while True:
+        chunk_type, data = reader.chunk()
+        if chunk_type == b'IEND':
+            break
+        if chunk_type == b'IDAT':
+            idat.append(data)
+
+    bpp = len(fmt)
+    raw = zlib.decompress(b''.join(idat))
+    if len(raw) < (reader.width * bpp + 1) * reader.height:
+        raise pypng.FormatError('Image data is too short.')
+    return fmt, _undo_filters(raw, reader.width, reader.height, bpp)
+
+
 class PNGImageDecoder(ImageDecoder):
     def get_file_extensions(self):
         return ['.png']
@@ -20,6 +141,11 @@ class PNGImageDecoder(ImageDecoder):
 
         try:
             reader = pypng.Reader(file=file)
+            reader.preamble()
+            direct = _decode_direct(reader)
+            if direct is not None:
+                fmt, data = direct
+                return ImageData(reader.width, reader.height, fmt, data, -reader.width * len(fmt))
             width, height, pixels, metadata = reader.asDirect()
         except Exception as e:
             raise ImageDecodeException('PyPNG cannot read %r: %s' % (filename or file, e))
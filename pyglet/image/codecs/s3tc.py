@@ -1,17 +1,29 @@
-"""Software decoder for S3TC compressed texture (i.e., DDS).
+"""Software decoder for S3TC and RGTC compressed texture (i.e., DDS).
+
+These decoders are only used when the driver cannot use the compressed data
+directly.  Each takes the compressed data of one image, with the blocks in the
+same row order as the texture, and returns an :py:class:`~pyglet.image.ImageData`
+with the same row order.  If NumPy is available, all blocks are decoded at once;
+otherwise, palettes are cached so that each distinct block endpoint pair is only
+expanded once.
 
 http://oss.sgi.com/projects/ogl-sample/registry/EXT/texture_compression_s3tc.txt
+https://registry.khronos.org/OpenGL/extensions/ARB/ARB_texture_compression_rgtc.txt
 """
 
-import re
 import ctypes
+import struct
 
 from pyglet.gl import *
 from pyglet.gl import gl_info
-from pyglet.image import AbstractImage, Texture
+from pyglet.image import AbstractImage, ImageData, Texture
+from pyglet.image import compressed
+from pyglet.image.codecs import ImageDecodeException
 
-split_8byte = re.compile('.' * 8, flags=re.DOTALL)
-split_16byte = re.compile('.' * 16, flags=re.DOTALL)
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class PackedImageData(AbstractImage):
@@ -63,292 +75,272 @@ class PackedImageData(AbstractImage):
         return self._get_texture()
 
 
+# The four 2-bit colour indices of each byte of a colour block.
+_color_codes = [(b & 3, (b >> 2) & 3, (b >> 4) & 3, b >> 6) for b in range(256)]
+
+# Two 4-bit explicit alpha values of each byte of a DXT3 alpha block, expanded to 8 bits.
+_explicit_alpha = [bytes(((b & 15) * 17, (b >> 4) * 17)) for b in range(256)]
+
+
+def _expand_565(color):
+    r = (color >> 11) & 0x1f
+    g = (color >> 5) & 0x3f
+    b = color & 0x1f
+    return (r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)
+
+
+def _color_palette(color0, color1, four_color, components):
+    r0, g0, b0 = _expand_565(color0)
+    r1, g1, b1 = _expand_565(color1)
+    if four_color or color0 > color1:
+        palette = [(r0, g0, b0, 255), (r1, g1, b1, 255),
+                   ((2 * r0 + r1) // 3, (2 * g0 + g1) // 3, (2 * b0 + b1) // 3, 255),
+                   ((r0 + 2 * r1) // 3, (g0 + 2 * g1) // 3, (b0 + 2 * b1) // 3, 255)]
+    else:
+        palette = [(r0, g0, b0, 255), (r1, g1, b1, 255),
+                   ((r0 + r1) // 2, (g0 + g1) // 2, (b0 + b1) // 2, 255),
+                   (0, 0, 0, 0)]
+    return [bytes(color[:components]) for color in palette]
+
+
+def _alpha_palette(alpha0, alpha1):
+    if alpha0 > alpha1:
+        return [alpha0, alpha1] + [((7 - i) * alpha0 + i * alpha1) // 7 for i in range(1, 7)]
+    return [alpha0, alpha1] + [((5 - i) * alpha0 + i * alpha1) // 5 for i in range(1, 5)] + [0, 255]
+
+
+def _get_blocks(data, width, height, block_size):
+    blocks_x = (width + 3) // 4
+    blocks_y = (height + 3) // 4
+    size = blocks_x * blocks_y * block_size
+    data = memoryview(data).cast('B')
+    if len(data) < size:
+        raise ImageDecodeException(f'Expected {size} bytes of compressed data, got {len(data)}.')
+    return data[:size], blocks_x, blocks_y
+
+
+def _crop(out, blocks_x, blocks_y, width, height, components):
+    """Crop the decoded blocks to the image size."""
+    pitch = blocks_x * 4 * components
+    row_size = width * components
+    if row_size == pitch and height == blocks_y * 4:
+        return bytes(out)
+    return b''.join([out[y * pitch:y * pitch + row_size] for y in range(height)])
+
+
+# Pure Python decoding.  Each function writes 4x4 blocks into a buffer
+# of blocks_x * 4 by blocks_y * 4 pixels.
+
+def _decode_color(data, blocks_x, block_size, four_color, components):
+    # The colour block is the last 8 bytes of each block.
+    fmt = '<HHI' if block_size == 8 else '<8xHHI'
+    pitch = blocks_x * 4 * components
+    block_pitch = pitch * 4
+    size = 4 * components
+    codes = _color_codes
+    palettes = {}
+
+    out = bytearray(len(data) // block_size * 16 * components)
+    for i, (color0, color1, bits) in enumerate(struct.iter_unpack(fmt, data)):
+        palette = palettes.get((color0, color1))
+        if palette is None:
+            palette = palettes[color0, color1] = _color_palette(color0, color1, four_color, components)
+
+        by, bx = divmod(i, blocks_x)
+        offset = by * block_pitch + bx * size
+        for _ in range(4):
+            a, b, c, d = codes[bits & 0xff]
+            out[offset:offset + size] = palette[a] + palette[b] + palette[c] + palette[d]
+            bits >>= 8
+            offset += pitch
+    return out
+
+
+def _decode_explicit_alpha(data, blocks_x):
+    pitch = blocks_x * 4
+    block_pitch = pitch * 4
+    alphas = _explicit_alpha
+
+    out = bytearray(len(data) // 16 * 16)
+    for i, (block,) in enumerate(struct.iter_unpack('<8s8x', data)):
+        by, bx = divmod(i, blocks_x)
+        offset = by * block_pitch + bx * 4
+        for y in range(0, 8, 2):
+            out[offset:offset + 4] = alphas[block[y]] + alphas[block[y + 1]]
+            offset += pitch
+    return out
+
+
+def _decode_interpolated_alpha(data, blocks_x, fmt):
+    pitch = blocks_x * 4
+    block_pitch = pitch * 4
+    palettes = {}
+
+    out = bytearray(len(data) // struct.calcsize(fmt) * 16)
+    for i, (block,) in enumerate(struct.iter_unpack(fmt, data)):
+        alpha0 = block & 0xff
+        alpha1 = (block >> 8) & 0xff
+        palette = palettes.get((alpha0, alpha1))
+        if palette is None:
+            palette = palettes[alpha0, alpha1] = _alpha_palette(alpha0, alpha1)
+
+        by, bx = divmod(i, blocks_x)
+        offset = by * block_pitch + bx * 4
+        bits = block >> 16
+        for _ in range(4):
+            out[offset:offset + 4] = bytes((palette[bits & 7], palette[(bits >> 3) & 7],
+                                            palette[(bits >> 6) & 7], palette[(bits >> 9) & 7]))
+            bits >>= 12
+            offset += pitch
+    return out
+
+
+# NumPy decoding.  Each function returns an array of shape (blocks, 16, components).
+
+def _numpy_blocks(data, block_size):
+    return numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, block_size)
+
+
+def _numpy_color(data, block_size, four_color, components):
+    blocks = _numpy_blocks(data, block_size)
+    color = numpy.ascontiguousarray(blocks[:, block_size - 8:])
+    endpoints = color[:, :4].view('<u2').astype(numpy.int32)
+    bits = color[:, 4:].view('<u4')
+
+    r = (endpoints >> 11) & 0x1f
+    g = (endpoints >> 5) & 0x3f
+    b = endpoints & 0x1f
+    rgb = numpy.stack(((r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)), axis=-1)
+    c0, c1 = rgb[:, 0], rgb[:, 1]
+
+    four = (endpoints[:, 0] > endpoints[:, 1])[:, None]
+    if four_color:
+        four[:] = True
+
+    palette = numpy.full((len(blocks), 4, 4), 255, dtype=numpy.uint8)
+    palette[:, 0, :3] = c0
+    palette[:, 1, :3] = c1
+    palette[:, 2, :3] = numpy.where(four, (2 * c0 + c1) // 3, (c0 + c1) // 2)
+    palette[:, 3, :3] = numpy.where(four, (c0 + 2 * c1) // 3, 0)
+    palette[:, 3, 3] = numpy.where(four[:, 0], 255, 0)
+
+    codes = (bits >> numpy.arange(0, 32, 2, dtype=numpy.uint32)) & 3
+    return palette[numpy.arange(len(blocks))[:, None], codes, :components]
+
+
+def _numpy_explicit_alpha(data):
+    alpha = _numpy_blocks(data, 16)[:, :8]
+    return (numpy.stack((alpha & 15, alpha >> 4), axis=-1).reshape(-1, 16, 1) * 17).astype(numpy.uint8)
+
+
+def _numpy_interpolated_alpha(data, block_size, offset):
+    blocks = _numpy_blocks(data, block_size)
+    block = numpy.ascontiguousarray(blocks[:, offset:offset + 8]).view('<u8')
+    a0 = (block & 0xff).astype(numpy.int32)
+    a1 = ((block >> 8) & 0xff).astype(numpy.int32)
+
+    eight = a0 > a1
+    palette = numpy.empty((len(blocks), 8), dtype=numpy.int32)
+    palette[:, 0:1] = a0
+    palette[:, 1:2] = a1
+    for i in range(1, 7):
+        palette[:, i + 1:i + 2] = numpy.where(eight, ((7 - i) * a0 + i * a1) // 7,
+                                              ((5 - i) * a0 + i * a1) // 5 if i < 5 else (0, 255)[i - 5])
+
+    codes = (block >> (numpy.arange(16, dtype=numpy.uint64) * 3 + 16)) & 7
+    return numpy.take_along_axis(palette, codes.astype(numpy.intp), 1).astype(numpy.uint8)[:, :, None]
+
+
+def _numpy_image(pixels, blocks_x, blocks_y, width, height):
+    components = pixels.shape[-1]
+    pixels = pixels.reshape(blocks_y, blocks_x, 4, 4, components).swapaxes(1, 2)
+    pixels = pixels.reshape(blocks_y * 4, blocks_x * 4, components)
+    return pixels[:height, :width].tobytes()
+
+
+def _decode(data, width, height, block_size, fmt, four_color=True, alpha=None):
+    data, blocks_x, blocks_y = _get_blocks(data, width, height, block_size)
+    components = len(fmt)
+
+    if numpy is not None:
+        if alpha == 'R' or alpha == 'RG':
+            pixels = numpy.concatenate([_numpy_interpolated_alpha(data, block_size, offset)
+                                        for offset in range(0, block_size, 8)], axis=-1)
+        else:
+            pixels = _numpy_color(data, block_size, four_color, components)
+            if alpha == 'explicit':
+                pixels[:, :, 3:] = _numpy_explicit_alpha(data)
+            elif alpha == 'interpolated':
+                pixels[:, :, 3:] = _numpy_interpolated_alpha(data, 16, 0)
+        out = _numpy_image(pixels, blocks_x, blocks_y, width, height)
+
+    else:
+        if alpha == 'R':
+            pixels = _decode_interpolated_alpha(data, blocks_x, '<Q')
+        elif alpha == 'RG':
+            pixels = bytearray(len(data) // 16 * 32)
+            pixels[0::2] = _decode_interpolated_alpha(data, blocks_x, '<Q8x')
+            pixels[1::2] = _decode_interpolated_alpha(data, blocks_x, '<8xQ')
+        else:
+            pixels = _decode_color(data, blocks_x, block_size, four_color, components)
+            if alpha == 'explicit':
+                pixels[3::4] = _decode_explicit_alpha(data, blocks_x)
+            elif alpha == 'interpolated':
+                pixels[3::4] = _decode_interpolated_alpha(data, blocks_x, '<Q8x')
+        out = _crop(pixels, blocks_x, blocks_y, width, height, components)
+
+    return ImageData(width, height, fmt, out)
+
+
 def decode_dxt1_rgb(data, width, height):
-    # Decode to 16-bit RGB UNSIGNED_SHORT_5_6_5
-    out = (ctypes.c_uint16 * (width * height))()
-
-    # Read 8 bytes at a time
-    image_offset = 0
-    for c0_lo, c0_hi, c1_lo, c1_hi, b0, b1, b2, b3 in split_8byte.findall(data):
-        color0 = ord(c0_lo) | ord(c0_hi) << 8
-        color1 = ord(c1_lo) | ord(c1_hi) << 8
-        bits = ord(b0) | ord(b1) << 8 | ord(b2) << 16 | ord(b3) << 24
-
-        r0 = color0 & 0x1f
-        g0 = (color0 & 0x7e0) >> 5
-        b0 = (color0 & 0xf800) >> 11
-        r1 = color1 & 0x1f
-        g1 = (color1 & 0x7e0) >> 5
-        b1 = (color1 & 0xf800) >> 11
-
-        # i is the dest ptr for this block
-        i = image_offset
-        for y in range(4):
-            for x in range(4):
-                code = bits & 0x3
-
-                if code == 0:
-                    out[i] = color0
-                elif code == 1:
-                    out[i] = color1
-                elif code == 3 and color0 <= color1:
-                    out[i] = 0
-                else:
-                    if code == 2 and color0 > color1:
-                        r = (2 * r0 + r1) // 3
-                        g = (2 * g0 + g1) // 3
-                        b = (2 * b0 + b1) // 3
-                    elif code == 3 and color0 > color1:
-                        r = (r0 + 2 * r1) // 3
-                        g = (g0 + 2 * g1) // 3
-                        b = (b0 + 2 * b1) // 3
-                    else:
-                        assert code == 2 and color0 <= color1
-                        r = (r0 + r1) // 2
-                        g = (g0 + g1) // 2
-                        b = (b0 + b1) // 2
-                    out[i] = r | g << 5 | b << 11
-
-                bits >>= 2
-                i += 1
-            i += width - 4
-
-        # Move dest ptr to next 4x4 block
-        advance_row = (image_offset + 4) % width == 0
-        image_offset += width * 3 * advance_row + 4
-
-    return PackedImageData(width, height, GL_RGB, GL_UNSIGNED_SHORT_5_6_5, out)
+    """Decode DXT1 (BC1) data without alpha to an RGB image."""
+    return _decode(data, width, height, 8, 'RGB', four_color=False)
 
 
 def decode_dxt1_rgba(data, width, height):
-    # Decode to GL_RGBA
-    out = (ctypes.c_ubyte * (width * height * 4))()
-    pitch = width << 2
-
-    # Read 8 bytes at a time
-    image_offset = 0
-    for c0_lo, c0_hi, c1_lo, c1_hi, b0, b1, b2, b3 in split_8byte.findall(data):
-        color0 = ord(c0_lo) | ord(c0_hi) << 8
-        color1 = ord(c1_lo) | ord(c1_hi) << 8
-        bits = ord(b0) | ord(b1) << 8 | ord(b2) << 16 | ord(b3) << 24
-
-        r0 = color0 & 0x1f
-        g0 = (color0 & 0x7e0) >> 5
-        b0 = (color0 & 0xf800) >> 11
-        r1 = color1 & 0x1f
-        g1 = (color1 & 0x7e0) >> 5
-        b1 = (color1 & 0xf800) >> 11
-
-        # i is the dest ptr for this block
-        i = image_offset
-        for y in range(4):
-            for x in range(4):
-                code = bits & 0x3
-                a = 255
-
-                if code == 0:
-                    r, g, b = r0, g0, b0
-                elif code == 1:
-                    r, g, b = r1, g1, b1
-                elif code == 3 and color0 <= color1:
-                    r = g = b = a = 0
-                else:
-                    if code == 2 and color0 > color1:
-                        r = (2 * r0 + r1) // 3
-                        g = (2 * g0 + g1) // 3
-                        b = (2 * b0 + b1) // 3
-                    elif code == 3 and color0 > color1:
-                        r = (r0 + 2 * r1) // 3
-                        g = (g0 + 2 * g1) // 3
-                        b = (b0 + 2 * b1) // 3
-                    else:
-                        assert code == 2 and color0 <= color1
-                        r = (r0 + r1) // 2
-                        g = (g0 + g1) // 2
-                        b = (b0 + b1) // 2
-
-                out[i] = b << 3
-                out[i + 1] = g << 2
-                out[i + 2] = r << 3
-                out[i + 3] = a << 4
-
-                bits >>= 2
-                i += 4
-            i += pitch - 16
-
-        # Move dest ptr to next 4x4 block
-        advance_row = (image_offset + 16) % pitch == 0
-        image_offset += pitch * 3 * advance_row + 16
-
-    return PackedImageData(width, height, GL_RGBA, GL_UNSIGNED_BYTE, out)
+    """Decode DXT1 (BC1) data with 1-bit alpha to an RGBA image."""
+    return _decode(data, width, height, 8, 'RGBA', four_color=False)
 
 
 def decode_dxt3(data, width, height):
-    # Decode to GL_RGBA
-    out = (ctypes.c_ubyte * (width * height * 4))()
-    pitch = width << 2
-
-    # Read 16 bytes at a time
-    image_offset = 0
-    for (a0, a1, a2, a3, a4, a5, a6, a7,
-         c0_lo, c0_hi, c1_lo, c1_hi,
-         b0, b1, b2, b3) in split_16byte.findall(data):
-        color0 = ord(c0_lo) | ord(c0_hi) << 8
-        color1 = ord(c1_lo) | ord(c1_hi) << 8
-        bits = ord(b0) | ord(b1) << 8 | ord(b2) << 16 | ord(b3) << 24
-        alpha = ord(a0) | ord(a1) << 8 | ord(a2) << 16 | ord(a3) << 24 | \
-                ord(a4) << 32 | ord(a5) << 40 | ord(a6) << 48 | ord(a7) << 56
-
-        r0 = color0 & 0x1f
-        g0 = (color0 & 0x7e0) >> 5
-        b0 = (color0 & 0xf800) >> 11
-        r1 = color1 & 0x1f
-        g1 = (color1 & 0x7e0) >> 5
-        b1 = (color1 & 0xf800) >> 11
-
-        # i is the dest ptr for this block
-        i = image_offset
-        for y in range(4):
-            for x in range(4):
-                code = bits & 0x3
-                a = alpha & 0xf
-
-                if code == 0:
-                    r, g, b = r0, g0, b0
-                elif code == 1:
-                    r, g, b = r1, g1, b1
-                elif code == 3 and color0 <= color1:
-                    r = g = b = 0
-                else:
-                    if code == 2 and color0 > color1:
-                        r = (2 * r0 + r1) // 3
-                        g = (2 * g0 + g1) // 3
-                        b = (2 * b0 + b1) // 3
-                    elif code == 3 and color0 > color1:
-                        r = (r0 + 2 * r1) // 3
-                        g = (g0 + 2 * g1) // 3
-                        b = (b0 + 2 * b1) // 3
-                    else:
-                        assert code == 2 and color0 <= color1
-                        r = (r0 + r1) // 2
-                        g = (g0 + g1) // 2
-                        b = (b0 + b1) // 2
-
-                out[i] = b << 3
-                out[i + 1] = g << 2
-                out[i + 2] = r << 3
-                out[i + 3] = a << 4
-
-                bits >>= 2
-                alpha >>= 4
-                i += 4
-            i += pitch - 16
-
-        # Move dest ptr to next 4x4 block
-        advance_row = (image_offset + 16) % pitch == 0
-        image_offset += pitch * 3 * advance_row + 16
-
-    return PackedImageData(width, height, GL_RGBA, GL_UNSIGNED_BYTE, out)
+    """Decode DXT3 (BC2) data to an RGBA image."""
+    return _decode(data, width, height, 16, 'RGBA', alpha='explicit')
 
 
 def decode_dxt5(data, width, height):
-    # Decode to GL_RGBA
-    out = (ctypes.c_ubyte * (width * height * 4))()
-    pitch = width << 2
-
-    # Read 16 bytes at a time
-    image_offset = 0
-    for (alpha0, alpha1, ab0, ab1, ab2, ab3, ab4, ab5, 
-         c0_lo, c0_hi, c1_lo, c1_hi, 
-         b0, b1, b2, b3) in split_16byte.findall(data):
-        color0 = ord(c0_lo) | ord(c0_hi) << 8
-        color1 = ord(c1_lo) | ord(c1_hi) << 8
-        alpha0 = ord(alpha0)
-        alpha1 = ord(alpha1)
-        bits = ord(b0) | ord(b1) << 8 | ord(b2) << 16 | ord(b3) << 24
-        abits = ord(ab0) | ord(ab1) << 8 | ord(ab2) << 16 | ord(ab3) << 24 | \
-            ord(ab4) << 32 | ord(ab5) << 40
-
-        r0 = color0 & 0x1f
-        g0 = (color0 & 0x7e0) >> 5
-        b0 = (color0 & 0xf800) >> 11
-        r1 = color1 & 0x1f
-        g1 = (color1 & 0x7e0) >> 5
-        b1 = (color1 & 0xf800) >> 11
-
-        # i is the dest ptr for this block
-        i = image_offset
-        for y in range(4):
-            for x in range(4):
-                code = bits & 0x3
-                acode = abits & 0x7
-
-                if code == 0:
-                    r, g, b = r0, g0, b0
-                elif code == 1:
-                    r, g, b = r1, g1, b1
-                elif code == 3 and color0 <= color1:
-                    r = g = b = 0
-                else:
-                    if code == 2 and color0 > color1:
-                        r = (2 * r0 + r1) // 3
-                        g = (2 * g0 + g1) // 3
-                        b = (2 * b0 + b1) // 3
-                    elif code == 3 and color0 > color1:
-                        r = (r0 + 2 * r1) // 3
-                        g = (g0 + 2 * g1) // 3
-                        b = (b0 + 2 * b1) // 3
-                    else:
-                        assert code == 2 and color0 <= color1
-                        r = (r0 + r1) / 2
-                        g = (g0 + g1) / 2
-                        b = (b0 + b1) / 2
-
-                if acode == 0:
-                    a = alpha0
-                elif acode == 1:
-                    a = alpha1
-                elif alpha0 > alpha1:
-                    if acode == 2:
-                        a = (6 * alpha0 + 1 * alpha1) // 7
-                    elif acode == 3:
-                        a = (5 * alpha0 + 2 * alpha1) // 7
-                    elif acode == 4:
-                        a = (4 * alpha0 + 3 * alpha1) // 7
-                    elif acode == 5:
-                        a = (3 * alpha0 + 4 * alpha1) // 7
-                    elif acode == 6:
-                        a = (2 * alpha0 + 5 * alpha1) // 7
-                    else:
-                        assert acode == 7
-                        a = (1 * alpha0 + 6 * alpha1) // 7
-                else:
-                    if acode == 2:
-                        a = (4 * alpha0 + 1 * alpha1) // 5
-                    elif acode == 3:
-                        a = (3 * alpha0 + 2 * alpha1) // 5
-                    elif acode == 4:
-                        a = (2 * alpha0 + 3 * alpha1) // 5
-                    elif acode == 5:
-                        a = (1 * alpha0 + 4 * alpha1) // 5
-                    elif acode == 6:
-                        a = 0
-                    else:
-                        assert acode == 7
-                        a = 255
-
-                out[i] = b << 3
-                out[i + 1] = g << 2
-                out[i + 2] = r << 3
-                out[i + 3] = a
-
-                bits >>= 2
-                abits >>= 3
-                i += 4
-            i += pitch - 16
-
-        # Move dest ptr to next 4x4 block
-        advance_row = (image_offset + 16) % pitch == 0
-        image_offset += pitch * 3 * advance_row + 16
-
-    return PackedImageData(width, height, GL_RGBA, GL_UNSIGNED_BYTE, out)
+    """Decode DXT5 (BC3) data to an RGBA image."""
+    return _decode(data, width, height, 16, 'RGBA', alpha='interpolated')
+
+
+def decode_bc4(data, width, height):
+    """Decode unsigned RGTC1 (BC4) data to a single channel image."""
+    return _decode(data, width, height, 8, 'R', alpha='R')
+
+
+def decode_bc5(data, width, height):
+    """Decode unsigned RGTC2 (BC5) data to a two channel image."""
+    return _decode(data, width, height, 16, 'RG', alpha='RG')
+
+
+_decoders = {
+    GL_COMPRESSED_RGB_S3TC_DXT1_EXT: decode_dxt1_rgb,
+    GL_COMPRESSED_RGBA_S3TC_DXT1_EXT: decode_dxt1_rgba,
+    GL_COMPRESSED_RGBA_S3TC_DXT3_EXT: decode_dxt3,
+    GL_COMPRESSED_RGBA_S3TC_DXT5_EXT: decode_dxt5,
+    compressed.GL_COMPRESSED_SRGB_S3TC_DXT1_EXT: decode_dxt1_rgb,
+    compressed.GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT1_EXT: decode_dxt1_rgba,
+    compressed.GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT3_EXT: decode_dxt3,
+    compressed.GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT5_EXT: decode_dxt5,
+    GL_COMPRESSED_RED_RGTC1: decode_bc4,
+    GL_COMPRESSED_RG_RGTC2: decode_bc5,
+}
+
+
+def get_decoder(gl_format):
+    """Get the software decoder for a compressed format.
+
+    Returns ``None`` if there is no software decoder for `gl_format`.
+
+    :rtype: function(data, width, height) -> :py:class:`~pyglet.image.ImageData`
+    """
+    return _decoders.get(gl_format)
@@ -0,0 +1,154 @@
+"""Information about block-compressed texture formats.
+
+Block-compressed formats (S3TC/BCn, ETC2/EAC and ASTC) store fixed-size
+blocks of pixels in a fixed number of bytes, and are decompressed by the GPU
+when sampled.  Uploading them directly with ``glCompressedTexImage2D`` avoids
+decoding on the CPU and uses a quarter to an eighth of the video memory of
+the equivalent RGBA texture.
+
+This module describes the block size and driver requirements of each
+format; it is used by :py:class:`~pyglet.image.CompressedImageData`, the
+DDS and KTX2 decoders, and compressed texture arrays and atlases.
+"""
+
+from pyglet.gl import *
+from pyglet.gl import gl_info
+
+# Constants not included in pyglet.gl.
+GL_COMPRESSED_SRGB_S3TC_DXT1_EXT = 0x8C4C
+GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT1_EXT = 0x8C4D
+GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT3_EXT = 0x8C4E
+GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT5_EXT = 0x8C4F
+
+GL_COMPRESSED_RGBA_ASTC_4x4_KHR = 0x93B0
+GL_COMPRESSED_RGBA_ASTC_5x4_KHR = 0x93B1
+GL_COMPRESSED_RGBA_ASTC_5x5_KHR = 0x93B2
+GL_COMPRESSED_RGBA_ASTC_6x5_KHR = 0x93B3
+GL_COMPRESSED_RGBA_ASTC_6x6_KHR = 0x93B4
+GL_COMPRESSED_RGBA_ASTC_8x5_KHR = 0x93B5
+GL_COMPRESSED_RGBA_ASTC_8x6_KHR = 0x93B6
+GL_COMPRESSED_RGBA_ASTC_8x8_KHR = 0x93B7
+GL_COMPRESSED_RGBA_ASTC_10x5_KHR = 0x93B8
+GL_COMPRESSED_RGBA_ASTC_10x6_KHR = 0x93B9
+GL_COMPRESSED_RGBA_ASTC_10x8_KHR = 0x93BA
+GL_COMPRESSED_RGBA_ASTC_10x10_KHR = 0x93BB
+GL_COMPRESSED_RGBA_ASTC_12x10_KHR = 0x93BC
+GL_COMPRESSED_RGBA_ASTC_12x12_KHR = 0x93BD
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_4x4_KHR = 0x93D0
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_5x4_KHR = 0x93D1
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_5x5_KHR = 0x93D2
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_6x5_KHR = 0x93D3
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_6x6_KHR = 0x93D4
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_8x5_KHR = 0x93D5
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_8x6_KHR = 0x93D6
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_8x8_KHR = 0x93D7
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_10x5_KHR = 0x93D8
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_10x6_KHR = 0x93D9
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_10x8_KHR = 0x93DA
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_10x10_KHR = 0x93DB
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_12x10_KHR = 0x93DC
+GL_COMPRESSED_SRGB8_ALPHA8_ASTC_12x12_KHR = 0x93DD
+
+
+class CompressedFormat:
+    """The block layout and driver requirements of a compressed format."""
+
+    __slots__ = ('gl_format', 'block_width', 'block_height', 'block_size', 'extensions', 'core_gl', 'core_gles')
+
+    def __init__(self, gl_format, block_width, block_height, block_size, extensions, core_gl=None, core_gles=None):
+        self.gl_format = gl_format
+        self.block_width = block_width
+        self.block_height = block_height
+        self.block_size = block_size
+        self.extensions = extensions
+        self.core_gl = core_gl
+        self.core_gles = core_gles
+
+    def get_size(self, width, height, depth=1):
+        """Get the number of bytes of compressed data for an image.
+
+        :rtype: int
+        """
+        blocks_x = (width + self.block_width - 1) // self.block_width
+        blocks_y = (height + self.block_height - 1) // self.block_height
+        return blocks_x * blocks_y * self.block_size * depth
+
+    def is_supported(self):
+        """Determine if the current context can use this format directly.
+
+        A format is supported if the driver lists it among its compressed
+        texture formats, the OpenGL version includes it, or one of its
+        extensions is present.
+
+        :rtype: bool
+        """
+        if gl_info.have_compressed_format(self.gl_format):
+            return True
+        core = self.core_gles if gl_info.get_opengl_api() == 'gles' else self.core_gl
+        if core and gl_info.have_version(*core):
+            return True
+        return any(gl_info.have_extension(extension) for extension in self.extensions)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(0x{self.gl_format:04X}, {self.block_width}x{self.block_height})"
+
+
+_formats = {}
+
+
+def _add_format(gl_format, block_width, block_height, block_size, extensions, core_gl=None, core_gles=None):
+    _formats[gl_format] = CompressedFormat(gl_format, block_width, block_height, block_size,
+                                           extensions, core_gl, core_gles)
+
+
+_s3tc = ('GL_EXT_texture_compression_s3tc',)
+_s3tc_srgb = ('GL_EXT_texture_sRGB', 'GL_EXT_texture_compression_s3tc_srgb')
+_rgtc = ('GL_ARB_texture_compression_rgtc', 'GL_EXT_texture_compression_rgtc')
+_bptc = ('GL_ARB_texture_compression_bptc', 'GL_EXT_texture_compression_bptc')
+_etc2 = ('GL_ARB_ES3_compatibility',)
+_astc = ('GL_KHR_texture_compression_astc_ldr',)
+
+_add_format(GL_COMPRESSED_RGB_S3TC_DXT1_EXT, 4, 4, 8, _s3tc)
+_add_format(GL_COMPRESSED_RGBA_S3TC_DXT1_EXT, 4, 4, 8, _s3tc)
+_add_format(GL_COMPRESSED_RGBA_S3TC_DXT3_EXT, 4, 4, 16, _s3tc)
+_add_format(GL_COMPRESSED_RGBA_S3TC_DXT5_EXT, 4, 4, 16, _s3tc)
+_add_format(GL_COMPRESSED_SRGB_S3TC_DXT1_EXT, 4, 4, 8, _s3tc_srgb)
+_add_format(GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT1_EXT, 4, 4, 8, _s3tc_srgb)
+_add_format(GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT3_EXT, 4, 4, 16, _s3tc_srgb)
+_add_format(GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT5_EXT, 4, 4, 16, _s3tc_srgb)
+
+_add_format(GL_COMPRESSED_RED_RGTC1, 4, 4, 8, _rgtc, (3, 0))
+_add_format(GL_COMPRESSED_SIGNED_RED_RGTC1, 4, 4, 8, _rgtc, (3, 0))
+_add_format(GL_COMPRESSED_RG_RGTC2, 4, 4, 16, _rgtc, (3, 0))
+_add_format(GL_COMPRESSED_SIGNED_RG_RGTC2, 4, 4, 16, _rgtc, (3, 0))
+
+_add_format(GL_COMPRESSED_RGBA_BPTC_UNORM, 4, 4, 16, _bptc, (4, 2))
+_add_format(GL_COMPRESSED_SRGB_ALPHA_BPTC_UNORM, 4, 4, 16, _bptc, (4, 2))
+_add_format(GL_COMPRESSED_RGB_BPTC_SIGNED_FLOAT, 4, 4, 16, _bptc, (4, 2))
+_add_format(GL_COMPRESSED_RGB_BPTC_UNSIGNED_FLOAT, 4, 4, 16, _bptc, (4, 2))
+
+_add_format(GL_COMPRESSED_RGB8_ETC2, 4, 4, 8, _etc2, (4, 3), (3, 0))
+_add_format(GL_COMPRESSED_SRGB8_ETC2, 4, 4, 8, _etc2, (4, 3), (3, 0))
+_add_format(GL_COMPRESSED_RGB8_PUNCHTHROUGH_ALPHA1_ETC2, 4, 4, 8, _etc2, (4, 3), (3, 0))
+_add_format(GL_COMPRESSED_SRGB8_PUNCHTHROUGH_ALPHA1_ETC2, 4, 4, 8, _etc2, (4, 3), (3, 0))
+_add_format(GL_COMPRESSED_RGBA8_ETC2_EAC, 4, 4, 16, _etc2, (4, 3), (3, 0))
+_add_format(GL_COMPRESSED_SRGB8_ALPHA8_ETC2_EAC, 4, 4, 16, _etc2, (4, 3), (3, 0))
+_add_format(GL_COMPRESSED_R11_EAC, 4, 4, 8, _etc2, (4, 3), (3, 0))
+_add_format(GL_COMPRESSED_SIGNED_R11_EAC, 4, 4, 8, _etc2, (4, 3), (3, 0))
+_add_format(GL_COMPRESSED_RG11_EAC, 4, 4, 16, _etc2, (4, 3), (3, 0))
+_add_format(GL_COMPRESSED_SIGNED_RG11_EAC, 4, 4, 16, _etc2, (4, 3), (3, 0))
+
+for _i, (_w, _h) in enumerate([(4, 4), (5, 4), (5, 5), (6, 5), (6, 6), (8, 5), (8, 6), (8, 8),
+                               (10, 5), (10, 6), (10, 8), (10, 10), (12, 10), (12, 12)]):
+    _add_format(GL_COMPRESSED_RGBA_ASTC_4x4_KHR + _i, _w, _h, 16, _astc)
+    _add_format(GL_COMPRESSED_SRGB8_ALPHA8_ASTC_4x4_KHR + _i, _w, _h, 16, _astc)
+
+
+def get_format(gl_format):
+    """Get the description of a compressed format.
+
+    Returns ``None`` if `gl_format` is not a known block-compressed format.
+
+    :rtype: :py:class:`CompressedFormat`
+    """
+    return _formats.get(gl_format)
@@ -0,0 +1,174 @@
+"""Conversion of raw image data between formats and pitches.
+
+This module is used by :py:class:`~pyglet.image.ImageData` to convert pixel
+data, for example from BGRA to RGBA, or from a top-to-bottom to a
+bottom-to-top row order.  Conversions are performed with strided slice copies
+on byte buffers, which run at native speed, or with NumPy if it is installed.
+
+The work needed for each combination of formats and pitches is computed once
+and cached as a :py:class:`ConversionPlan`.
+
+Typical applications will not need to use this module directly.
+"""
+
+from functools import lru_cache
+
+from pyglet.util import asbytes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ConversionException(Exception):
+    """The image data cannot be converted to the requested format."""
+    pass
+
+
+class ConversionPlan:
+    """The steps needed to convert rows of pixel data of a given width from
+    one format and pitch to another.
+    """
+
+    __slots__ = ('width', 'src_components', 'dst_components', 'channels',
+                 'src_row_size', 'row_size', 'dst_row_size', 'flip')
+
+    def __init__(self, width, src_fmt, src_pitch, dst_fmt, dst_pitch):
+        self.width = width
+        self.src_components = len(src_fmt)
+        self.dst_components = len(dst_fmt)
+        self.src_row_size = abs(src_pitch)
+        self.dst_row_size = abs(dst_pitch)
+        self.flip = src_pitch * dst_pitch < 0
+
+        if src_fmt != dst_fmt:
+            if self.src_components > 4:
+                raise ConversionException('Current image format is wider than 32 bits.')
+
+            # Channels missing from the source format are filled from its first channel.
+            self.channels = tuple(src_fmt.index(c) if c in src_fmt else 0 for c in dst_fmt)
+            # After swizzling, rows are always tightly packed.
+            self.row_size = width * self.dst_components
+        else:
+            self.channels = None
+            self.row_size = self.src_row_size
+
+    def convert(self, data, height):
+        """Convert the rows of `data`, returning bytes.
+
+        `data` is assumed to contain at least `height` rows; any additional
+        rows (such as those of the parent of an image region) are converted
+        as well.
+        """
+        src = _as_buffer(data)
+        if not self.src_row_size:
+            return b''
+        height = max(height, -(-len(src) // self.src_row_size))
+        needed = height * self.src_row_size
+        if len(src) < needed:
+            # Some decoders leave the padding off the last row.
+            src = bytes(src) + bytes(needed - len(src))
+
+        if numpy is not None:
+            return self._convert_numpy(src, height)
+        return self._convert_buffer(src, height)
+
+    def _convert_buffer(self, src, height):
+        if self.channels is not None:
+            packed_size = self.width * self.src_components
+            if self.src_row_size == packed_size:
+                packed = bytes(src[:height * packed_size])
+            else:
+                packed = bytearray(height * packed_size)
+                for row in range(height):
+                    start = row * self.src_row_size
+                    packed[row * packed_size:(row + 1) * packed_size] = src[start:start + packed_size]
+                packed = bytes(packed)
+
+            nsrc = self.src_components
+            ndst = self.dst_components
+            swizzled = bytearray(height * self.row_size)
+            for i, channel in enumerate(self.channels):
+                swizzled[i::ndst] = packed[channel::nsrc]
+            src = memoryview(swizzled)
+
+        row_size = self.row_size
+        dst_row_size = self.dst_row_size
+        if row_size == dst_row_size and not self.flip:
+            return bytes(src[:height * row_size])
+
+        copy_size = min(row_size, dst_row_size)
+        dst = bytearray(height * dst_row_size)
+        for row in range(height):
+            src_row = height - 1 - row if self.flip else row
+            start = src_row * row_size
+            dst[row * dst_row_size:row * dst_row_size + copy_size] = src[start:start + copy_size]
+        return bytes(dst)
+
+    def _convert_numpy(self, src, height):
+        array = numpy.frombuffer(src, dtype=numpy.uint8, count=height * self.src_row_size)
+        array = array.reshape(height, self.src_row_size)
+
+        if self.channels is not None:
+            packed_size = self.width * self.src_components
+            array = array[:, :packed_size].reshape(height, self.width, self.src_components)
+            array = array[:, :, self.channels].reshape(height, self.row_size)
+
+        if self.flip:
+            array = array[::-1]
+
+        if self.dst_row_size < self.row_size:
+            array = array[:, :self.dst_row_size]
+        elif self.dst_row_size > self.row_size:
+            padded = numpy.zeros((height, self.dst_row_size), dtype=numpy.uint8)
+            padded[:, :self.row_size] = array
+            array = padded
+
+        return array.tobytes()
+
+
+def _as_buffer(data):
+    if isinstance(data, str):
+        return memoryview(asbytes(data))
+    try:
+        return memoryview(data).cast('B')
+    except TypeError:
+        return memoryview(asbytes(data))
+
+
+@lru_cache(maxsize=64)
+def get_plan(width, src_fmt, src_pitch, dst_fmt, dst_pitch):
+    """Get the (cached) :py:class:`ConversionPlan` for rows of the given
+    width, formats and pitches.
+
+    :rtype: :py:class:`ConversionPlan`
+    """
+    return ConversionPlan(width, src_fmt, src_pitch, dst_fmt, dst_pitch)
+
+
+def convert(data, width, height, src_fmt, src_pitch, dst_fmt, dst_pitch):
+    """Convert raw image data to a different format and pitch.
+
+    :Parameters:
+        `data` : bytes-like
+            The source pixel data.
+        `width` : int
+            Width of the image, in pixels.
+        `height` : int
+            Height of the image, in pixels.
+        `src_fmt` : str
+            Format of `data`, such as ``'RGBA'`` or ``'BGR'``.
+        `src_pitch` : int
+            Number of bytes per row of `data`.  Negative values indicate a
+            top-to-bottom arrangement.
+        `dst_fmt` : str
+            Format to convert to.  Components that are not present in the
+            source format are filled with its first component.
+        `dst_pitch` : int
+            Number of bytes per row to convert to.  Rows are truncated or
+            padded with zeros as needed.
+
+    :rtype: bytes
+    """
+    return get_plan(width, src_fmt, src_pitch, dst_fmt, dst_pitch).convert(data, height)
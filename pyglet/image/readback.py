@@ -0,0 +1,312 @@
+"""Asynchronous readback of pixel data from the GPU.
+
+Reading pixels back with :py:meth:`~pyglet.image.BufferImage.get_image_data`
+or :py:meth:`~pyglet.image.Texture.get_image_data` makes the CPU wait until
+the GPU has finished all outstanding rendering, and then for the pixels to be
+copied.  When capturing every frame, this stall can easily cost more than the
+frame itself.
+
+:py:class:`AsyncReadback` instead reads pixels into a ring of pixel pack
+buffers (``GL_PIXEL_PACK_BUFFER``).  ``glReadPixels`` then returns
+immediately, and a fence is inserted after it.  A
+:py:class:`concurrent.futures.Future` is returned, which is resolved with the
+:py:class:`~pyglet.image.ImageData` once the fence has been signalled,
+typically one or two frames later::
+
+    readback = pyglet.image.get_buffer_manager().get_readback()
+
+    @window.event
+    def on_draw():
+        window.clear()
+        batch.draw()
+        future = readback.read_buffer(pyglet.image.get_buffer_manager().get_color_buffer())
+        future.add_done_callback(lambda f: frames.append(f.result()))
+
+Completed reads are collected by :py:meth:`AsyncReadback.poll`, which is
+scheduled on the :py:mod:`pyglet.clock` automatically while reads are
+pending, and is also called at the start of each new read.
+
+If all buffers in the ring are in use, the oldest read is waited for, so
+memory use stays bounded.  :py:attr:`AsyncReadback.stalls` counts how often
+that happened; increase the ring size if it grows during capture.
+"""
+
+import ctypes
+
+from collections import deque
+from concurrent.futures import Future
+
+import pyglet
+
+from pyglet.gl import *
+
+_debug = pyglet.options['debug_texture']
+
+# Timeout for waiting on a fence when the ring is full or when flushing, in nanoseconds.
+_WAIT_TIMEOUT = 1000000000
+
+
+class _ReadbackSlot:
+    __slots__ = ('id', 'capacity', 'fence', 'future', 'width', 'height', 'format', 'size')
+
+    def __init__(self):
+        buffer_id = GLuint()
+        glGenBuffers(1, buffer_id)
+        self.id = buffer_id.value
+        self.capacity = 0
+        self.fence = None
+        self.future = None
+        self.width = 0
+        self.height = 0
+        self.format = ''
+        self.size = 0
+
+    def reserve(self, size):
+        if size > self.capacity:
+            glBufferData(GL_PIXEL_PACK_BUFFER, size, None, GL_STREAM_READ)
+            self.capacity = size
+
+
+class AsyncReadback:
+    """A ring of pixel pack buffers for reading pixels without stalling.
+
+    An instance belongs to the OpenGL context that was current when it was
+    created.  Use :py:meth:`~pyglet.image.BufferManager.get_readback` to get
+    the shared instance for the current context.
+    """
+
+    def __init__(self, ring_size=3):
+        """Create a readback ring.
+
+        :Parameters:
+            `ring_size` : int
+                Maximum number of reads that can be in flight at once.
+
+        """
+        self.ring_size = ring_size
+        self._context = pyglet.gl.current_context
+        self._slots = []
+        self._free = deque()
+        self._pending = deque()
+        self._scheduled = False
+        self._fbo = None
+
+        #: Number of reads that had to wait for an earlier read to finish
+        #: because the ring was full.
+        self.stalls = 0
+
+    @property
+    def pending(self):
+        """Number of reads that have not completed yet.
+
+        :type: int
+        """
+        return len(self._pending)
+
+    def _acquire(self):
+        if self._free:
+            return self._free.popleft()
+        if len(self._slots) < self.ring_size:
+            slot = _ReadbackSlot()
+            self._slots.append(slot)
+            return slot
+
+        # Ring is full: wait for the oldest read.
+        self.stalls += 1
+        if _debug:
+            print('AsyncReadback: ring full, waiting for oldest read.')
+        self._complete(self._pending.popleft(), wait=True)
+        return self._free.popleft()
+
+    def _start(self, width, height, fmt, read):
+        self.poll()
+
+        slot = self._acquire()
+        slot.width = width
+        slot.height = height
+        slot.format = fmt
+        slot.size = width * height * len(fmt)
+        slot.future = Future()
+
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, slot.id)
+        slot.reserve(slot.size)
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        # With a pack buffer bound, the pixel pointer is an offset into the buffer.
+        read()
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        slot.fence = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+        self._pending.append(slot)
+        if not self._scheduled:
+            pyglet.clock.schedule(self.poll)
+            self._scheduled = True
+        return slot.future
+
+    def read_pixels(self, x, y, width, height, fmt='RGBA', gl_buffer=GL_BACK):
+        """Start reading a rectangle of the current read framebuffer.
+
+        :Parameters:
+            `x` : int
+                Left edge of the rectangle, in pixels.
+            `y` : int
+                Bottom edge of the rectangle, in pixels.
+            `width` : int
+                Width of the rectangle, in pixels.
+            `height` : int
+                Height of the rectangle, in pixels.
+            `fmt` : str
+                Format of the returned image data; one of ``'RGBA'``,
+                ``'RGB'``, ``'BGRA'`` or ``'R'``.
+            `gl_buffer` : int
+                Color buffer to read from, such as ``GL_BACK``, or ``None`` to
+                use the current read buffer.
+
+        :rtype: :py:class:`concurrent.futures.Future`
+        :return: A future resolving to an :py:class:`~pyglet.image.ImageData`.
+        """
+        gl_format, _ = pyglet.image.ImageData._get_gl_format_and_type(fmt)
+        if gl_format is None:
+            raise pyglet.image.ImageException(f'Cannot read pixels in format {fmt!r}.')
+        return self._read_pixels(x, y, width, height, fmt, gl_format, gl_buffer)
+
+    def _read_pixels(self, x, y, width, height, fmt, gl_format, gl_buffer):
+        def read():
+            if gl_buffer is not None:
+                glReadBuffer(gl_buffer)
+            glReadPixels(x, y, width, height, gl_format, GL_UNSIGNED_BYTE, None)
+
+        return self._start(width, height, fmt, read)
+
+    def read_buffer(self, buffer_image):
+        """Start reading a framebuffer image.
+
+        :Parameters:
+            `buffer_image` : :py:class:`~pyglet.image.BufferImage`
+                The buffer, or region of a buffer, to read.
+
+        :rtype: :py:class:`concurrent.futures.Future`
+        :return: A future resolving to an :py:class:`~pyglet.image.ImageData`.
+        """
+        x = buffer_image.x
+        y = buffer_image.y
+        if buffer_image.owner:
+            x += buffer_image.owner.x
+            y += buffer_image.owner.y
+        return self._read_pixels(x, y, buffer_image.width, buffer_image.height,
+                                 buffer_image.format, buffer_image.gl_format, buffer_image.gl_buffer)
+
+    def read_texture(self, texture):
+        """Start reading the RGBA contents of a 2D texture.
+
+        :Parameters:
+            `texture` : :py:class:`~pyglet.image.Texture`
+                The texture, or region of a texture, to read.
+
+        :rtype: :py:class:`concurrent.futures.Future`
+        :return: A future resolving to an :py:class:`~pyglet.image.ImageData`.
+        """
+        if self._fbo is None:
+            fbo = GLuint()
+            glGenFramebuffers(1, fbo)
+            self._fbo = fbo.value
+
+        x = y = 0
+        owner = texture
+        if isinstance(texture, pyglet.image.TextureRegion):
+            x, y, owner = texture.x, texture.y, texture.owner
+
+        previous = GLint()
+        glGetIntegerv(GL_READ_FRAMEBUFFER_BINDING, previous)
+
+        def read():
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, self._fbo)
+            glFramebufferTexture2D(GL_READ_FRAMEBUFFER, GL_COLOR_ATTACHMENT0,
+                                   owner.target, owner.id, owner.level)
+            glReadBuffer(GL_COLOR_ATTACHMENT0)
+            glReadPixels(x, y, texture.width, texture.height, GL_RGBA, GL_UNSIGNED_BYTE, None)
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, previous.value)
+
+        return self._start(texture.width, texture.height, 'RGBA', read)
+
+    def _complete(self, slot, wait=False):
+        if wait:
+            glClientWaitSync(slot.fence, GL_SYNC_FLUSH_COMMANDS_BIT, _WAIT_TIMEOUT)
+        glDeleteSync(slot.fence)
+        slot.fence = None
+
+        data = (GLubyte * slot.size)()
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, slot.id)
+        if pyglet.WebGL:
+            glGetBufferSubData(GL_PIXEL_PACK_BUFFER, 0, slot.size, data)
+        else:
+            ptr = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, slot.size, GL_MAP_READ_BIT)
+            ctypes.memmove(data, ptr, slot.size)
+            glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+        future = slot.future
+        slot.future = None
+        self._free.append(slot)
+        future.set_result(pyglet.image.ImageData(slot.width, slot.height, slot.format, data))
+
+    def _is_signalled(self, fence):
+        status = GLint()
+        glGetSynciv(fence, GL_SYNC_STATUS, 1, None, status)
+        return status.value == GL_SIGNALED
+
+    def poll(self, dt=None):
+        """Resolve the futures of all reads that have completed.
+
+        Reads complete in the order they were started.  This is scheduled on
+        the clock automatically while reads are pending.
+        """
+        if not self._pending:
+            return
+
+        previous_context = pyglet.gl.current_context
+        if previous_context is not self._context:
+            self._context.set_current()
+
+        while self._pending and self._is_signalled(self._pending[0].fence):
+            self._complete(self._pending.popleft())
+
+        if not self._pending and self._scheduled:
+            pyglet.clock.unschedule(self.poll)
+            self._scheduled = False
+
+        if previous_context is not None and previous_context is not self._context:
+            previous_context.set_current()
+
+    def flush(self):
+        """Wait for all pending reads to complete and resolve their futures."""
+        while self._pending:
+            self._complete(self._pending.popleft(), wait=True)
+        if self._scheduled:
+            pyglet.clock.unschedule(self.poll)
+            self._scheduled = False
+
+    def delete(self):
+        """Cancel all pending reads and release the pack buffers."""
+        for slot in self._pending:
+            glDeleteSync(slot.fence)
+            slot.future.cancel()
+        self._pending.clear()
+        self._free.clear()
+        for slot in self._slots:
+            glDeleteBuffers(1, GLuint(slot.id))
+        self._slots = []
+        if self._fbo is not None:
+            glDeleteFramebuffers(1, GLuint(self._fbo))
+            self._fbo = None
+        if self._scheduled:
+            pyglet.clock.unschedule(self.poll)
+            self._scheduled = False
+
+    def __del__(self):
+        try:
+            for slot in self._slots:
+                self._context.delete_buffer(slot.id)
+            if self._fbo is not None:
+                self._context.delete_framebuffer(self._fbo)
+        except (AttributeError, ImportError):
+            pass  # Interpreter is shutting down
@@ -0,0 +1,417 @@
+"""Progressive loading of large textures by mipmap level.
+
+Large images, such as maps and terrain, are expensive to decode and upload,
+and rarely need their full resolution while they are drawn small.
+:py:class:`TextureStreamer` loads them progressively instead:
+
+* Images are decoded, and their mipmap levels generated, on worker threads.
+* The coarsest levels are uploaded first, so a low resolution version can
+  be drawn almost immediately.
+* Finer levels are uploaded only when the application requests them with
+  :py:meth:`StreamingTexture.request`, giving the size the texture is drawn
+  on screen.  At most `upload_limit` bytes are uploaded per frame, so large
+  levels are spread across several frames.
+* The textures together use at most `budget` bytes of video memory.  When a
+  finer level does not fit, the finest levels of the least recently
+  requested textures are released.
+
+Example::
+
+    streamer = pyglet.image.streaming.TextureStreamer(budget=256 * 1024 * 1024)
+    streamer.start()
+    terrain = streamer.load('terrain.png')
+
+    @window.event
+    def on_draw():
+        if terrain.texture:
+            terrain.request(window.width, window.height)
+            terrain.texture.blit(0, 0, width=window.width, height=window.height)
+
+:py:attr:`StreamingTexture.texture` is a normal
+:py:class:`~pyglet.image.Texture` once the image has been decoded.  Its
+``GL_TEXTURE_BASE_LEVEL`` is set to the finest level uploaded so far, so it
+can always be sampled.
+"""
+
+import io
+import math
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pyglet
+
+from pyglet.gl import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_debug = pyglet.options['debug_texture']
+
+
+def _halve(data, width, height, components):
+    """Box filter tightly packed pixel data to half size in each dimension."""
+    half_width = max(1, width // 2)
+    half_height = max(1, height // 2)
+    pitch = width * components
+    row_size = half_width * 2 * components if width > 1 else pitch
+
+    if numpy is not None:
+        pixels = numpy.frombuffer(data, dtype=numpy.uint8).reshape(height, width, components)
+        pixels = pixels[:max(1, height - height % 2), :max(1, width - width % 2)].astype(numpy.uint16)
+        if height > 1:
+            pixels = pixels[0::2] + pixels[1::2]
+        else:
+            pixels = pixels * 2
+        if width > 1:
+            pixels = pixels[:, 0::2] + pixels[:, 1::2]
+        else:
+            pixels = pixels * 2
+        return ((pixels + 2) >> 2).astype(numpy.uint8).tobytes()
+
+    # Pure Python: split into rows, then into even and odd columns, and sum
+    # the four quadrants as large integers with a 16-bit lane per channel.
+    even_rows = b''.join([data[y * 2 * pitch:y * 2 * pitch + row_size] for y in range(half_height)])
+    if height > 1:
+        odd_rows = b''.join([data[(y * 2 + 1) * pitch:(y * 2 + 1) * pitch + row_size]
+                             for y in range(half_height)])
+    else:
+        odd_rows = even_rows
+
+    size = half_width * half_height * components
+    total = 2 * int.from_bytes(b'\x01\x00' * size, 'little')
+    for rows in (even_rows, odd_rows):
+        for start in (0, components):
+            if width == 1:
+                start = 0
+            quadrant = bytearray(size)
+            for c in range(components):
+                quadrant[c::components] = rows[start + c::2 * components] if width > 1 else rows[c::components]
+            lanes = bytearray(size * 2)
+            lanes[0::2] = quadrant
+            total += int.from_bytes(lanes, 'little')
+
+    # Each lane holds at most 4 * 255 + 2, so lanes never carry into each other.
+    return (total >> 2).to_bytes(size * 2, 'little')[0::2]
+
+
+def generate_mipmaps(image):
+    """Generate the mipmap levels of an image with a box filter.
+
+    :Parameters:
+        `image` : `~pyglet.image.AbstractImage`
+            The full resolution image.
+
+    :rtype: list of :py:class:`~pyglet.image.ImageData`
+    :return: RGBA images, from the full resolution image down to 1x1.
+    """
+    image = image.get_image_data()
+    width, height = image.width, image.height
+    data = image.get_data('RGBA', width * 4)
+    if 'A' not in image.format:
+        data = bytearray(data)
+        data[3::4] = b'\xff' * (width * height)
+        data = bytes(data)
+    levels = [pyglet.image.ImageData(width, height, 'RGBA', data)]
+    while width > 1 or height > 1:
+        data = _halve(data, width, height, 4)
+        width, height = max(1, width // 2), max(1, height // 2)
+        levels.append(pyglet.image.ImageData(width, height, 'RGBA', data))
+    return levels
+
+
+def _load_levels(filename, file, decoder):
+    return generate_mipmaps(pyglet.image.load(filename, file, decoder))
+
+
+class StreamingTexture:
+    """A texture whose mipmap levels are uploaded progressively.
+
+    Created by :py:meth:`TextureStreamer.load` or :py:meth:`TextureStreamer.add`.
+    """
+
+    def __init__(self, streamer, future):
+        self._streamer = streamer
+        self._future = future
+        self._levels = None
+        self._pending_level = None
+        self._pending_row = 0
+        self._last_requested = 0
+        self._requested_size = None
+
+        #: The texture, or ``None`` until the image has been decoded.
+        self.texture = None
+        #: Number of mipmap levels, or 0 until the image has been decoded.
+        self.level_count = 0
+        #: The finest level uploaded.  Equal to `level_count` while nothing
+        #: has been uploaded.
+        self.resident_level = 0
+        #: The finest level requested, or ``None`` if none has been.
+        self.desired_level = None
+
+    @property
+    def is_ready(self):
+        """``True`` once the texture exists and has at least one level.
+
+        :type: bool
+        """
+        return self.texture is not None and self.resident_level < self.level_count
+
+    @property
+    def resident_bytes(self):
+        """The video memory used by the uploaded levels, in bytes.
+
+        :type: int
+        """
+        size = self._level_bytes(self.resident_level, self.level_count)
+        if self._pending_level is not None:
+            size += self._levels[self._pending_level].width * self._levels[self._pending_level].height * 4
+        return size
+
+    def _level_bytes(self, start, stop):
+        if self._levels is None:
+            return 0
+        return sum(level.width * level.height * 4 for level in self._levels[start:stop])
+
+    def request(self, width, height):
+        """Request the detail needed to draw the texture at a size on screen.
+
+        Call this every frame the texture is drawn.  Textures that have not
+        been requested recently are the first to lose detail when the video
+        memory budget is exceeded.
+
+        :Parameters:
+            `width` : float
+                Width the texture is drawn at, in pixels.
+            `height` : float
+                Height the texture is drawn at, in pixels.
+
+        """
+        self._last_requested = self._streamer.frame
+        if self._levels is None:
+            self._requested_size = width, height
+            return
+        scale = min(self._levels[0].width / max(width, 1), self._levels[0].height / max(height, 1))
+        self.request_level(int(math.log2(scale)) if scale > 1 else 0)
+
+    def request_level(self, level):
+        """Request that mipmap levels down to `level` be uploaded.
+
+        :Parameters:
+            `level` : int
+                The finest level needed; 0 is full resolution.
+
+        """
+        self._last_requested = self._streamer.frame
+        if self.level_count:
+            level = max(0, min(level, self.level_count - 1))
+        self.desired_level = level
+
+    def _create(self):
+        self._levels = self._future.result()
+        self._future = None
+        self.level_count = len(self._levels)
+        self.resident_level = self.level_count
+        if self._requested_size is not None:
+            self.request(*self._requested_size)
+        else:
+            self.request_level(self.level_count - 1 if self.desired_level is None else self.desired_level)
+
+        base = self._levels[0]
+        texture = pyglet.image.Texture.create(base.width, base.height, internalformat=None,
+                                              min_filter=GL_LINEAR_MIPMAP_LINEAR)
+        glTexParameteri(texture.target, GL_TEXTURE_MAX_LEVEL, self.level_count - 1)
+        glTexParameteri(texture.target, GL_TEXTURE_BASE_LEVEL, self.level_count - 1)
+        self.texture = texture
+
+    def _upload(self, limit):
+        """Upload up to `limit` bytes of the next level.  Returns the bytes uploaded."""
+        level = self._pending_level
+        image = self._levels[level]
+        row_size = image.width * 4
+        rows = max(1, min(image.height - self._pending_row, limit // row_size))
+        start = self._pending_row * row_size
+        data = image.get_data('RGBA', row_size)[start:start + rows * row_size]
+
+        glBindTexture(self.texture.target, self.texture.id)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        if self._pending_row == 0:
+            glTexImage2D(self.texture.target, level, GL_RGBA8, image.width, image.height, 0,
+                         GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glTexSubImage2D(self.texture.target, level, 0, self._pending_row, image.width, rows,
+                        GL_RGBA, GL_UNSIGNED_BYTE, data)
+
+        self._pending_row += rows
+        if self._pending_row == image.height:
+            # Only sample the level once all of it is uploaded.
+            glTexParameteri(self.texture.target, GL_TEXTURE_BASE_LEVEL, level)
+            self.resident_level = level
+            self._pending_level = None
+            self._pending_row = 0
+        return rows * row_size
+
+    def _evict(self):
+        """Release the finest resident level."""
+        level = self.resident_level
+        glBindTexture(self.texture.target, self.texture.id)
+        glTexParameteri(self.texture.target, GL_TEXTURE_BASE_LEVEL, level + 1)
+        # Respecifying the level with no size releases its memory.
+        glTexImage2D(self.texture.target, level, GL_RGBA8, 0, 0, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        self.resident_level = level + 1
+        if _debug:
+            print(f'TextureStreamer: evicted level {level} of {self.texture}.')
+
+    def delete(self):
+        """Release the texture and stop streaming it."""
+        if self._future is not None:
+            self._future.cancel()
+        self._streamer._remove(self)
+        self.texture = None
+        self._levels = None
+
+
+class TextureStreamer:
+    """Loads textures progressively, within a video memory budget."""
+
+    def __init__(self, budget=256 * 1024 * 1024, upload_limit=4 * 1024 * 1024, initial_size=64, workers=2):
+        """Create a texture streamer.
+
+        :Parameters:
+            `budget` : int
+                Maximum video memory used by all streamed textures, in bytes.
+            `upload_limit` : int
+                Maximum bytes uploaded in one call to :py:meth:`update`.
+            `initial_size` : int
+                Levels up to this size are uploaded as soon as an image has
+                been decoded, whether requested or not.
+            `workers` : int
+                Number of threads used to decode images.
+
+        """
+        self.budget = budget
+        self.upload_limit = upload_limit
+        self.initial_size = initial_size
+        #: Number of times :py:meth:`update` has been called.
+        self.frame = 0
+        self._executor = ThreadPoolExecutor(workers)
+        self._textures = []
+        self._scheduled = False
+
+    @property
+    def resident_bytes(self):
+        """The video memory used by all streamed textures, in bytes.
+
+        :type: int
+        """
+        return sum(texture.resident_bytes for texture in self._textures)
+
+    def load(self, filename, file=None, decoder=None):
+        """Start loading an image file as a streaming texture.
+
+        The file is decoded on a worker thread.  See :py:func:`pyglet.image.load`
+        for the parameters.
+
+        :rtype: :py:class:`StreamingTexture`
+        """
+        if file is not None:
+            # Read now, as the file may be closed before the worker uses it.
+            file = io.BytesIO(file.read())
+        return self._add(self._executor.submit(_load_levels, filename, file, decoder))
+
+    def add(self, image):
+        """Start streaming an image that is already decoded.
+
+        Its mipmap levels are generated on a worker thread.
+
+        :rtype: :py:class:`StreamingTexture`
+        """
+        return self._add(self._executor.submit(generate_mipmaps, image))
+
+    def _add(self, future):
+        texture = StreamingTexture(self, future)
+        texture._last_requested = self.frame
+        self._textures.append(texture)
+        return texture
+
+    def _remove(self, texture):
+        if texture in self._textures:
+            self._textures.remove(texture)
+
+    def _get_next_level(self, texture):
+        if texture.resident_level == 0:
+            return None
+        level = texture.resident_level - 1
+        image = texture._levels[level]
+        if level >= texture.desired_level or max(image.width, image.height) <= self.initial_size:
+            return level
+        return None
+
+    def _make_room(self, size, exclude):
+        """Evict levels of the least recently requested textures until `size`
+        more bytes fit in the budget.  Returns ``False`` if they cannot fit."""
+        resident = self.resident_bytes
+        # Levels finer than requested go first, then the least recently requested.
+        candidates = sorted((t for t in self._textures if t is not exclude and t.texture is not None),
+                            key=lambda t: (t.resident_level >= t.desired_level, t._last_requested))
+        for texture in candidates:
+            while resident + size > self.budget:
+                level = texture.resident_level
+                if level >= texture.level_count - 1 or texture._pending_level is not None:
+                    break
+                if texture._last_requested >= exclude._last_requested and level >= texture.desired_level:
+                    # Never take levels that a more recently used texture still needs.
+                    break
+                resident -= texture._level_bytes(level, level + 1)
+                texture._evict()
+            if resident + size <= self.budget:
+                return True
+        return resident + size <= self.budget
+
+    def update(self, dt=None):
+        """Create decoded textures and upload the next requested levels.
+
+        Called automatically each frame after :py:meth:`start`.
+        """
+        self.frame += 1
+        remaining = self.upload_limit
+
+        for texture in list(self._textures):
+            if texture._future is not None and texture._future.done():
+                texture._create()
+
+        # Textures requested most recently are served first.
+        for texture in sorted(self._textures, key=lambda t: -t._last_requested):
+            if texture.texture is None:
+                continue
+            while remaining > 0:
+                if texture._pending_level is None:
+                    level = self._get_next_level(texture)
+                    if level is None:
+                        break
+                    image = texture._levels[level]
+                    if not self._make_room(image.width * image.height * 4, texture):
+                        break
+                    texture._pending_level = level
+                remaining -= texture._upload(remaining)
+            if remaining <= 0:
+                break
+
+    def start(self):
+        """Call :py:meth:`update` every frame on the :py:mod:`pyglet.clock`."""
+        if not self._scheduled:
+            pyglet.clock.schedule(self.update)
+            self._scheduled = True
+
+    def stop(self):
+        """Stop calling :py:meth:`update` every frame."""
+        if self._scheduled:
+            pyglet.clock.unschedule(self.update)
+            self._scheduled = False
+
+    def delete(self):
+        """Stop streaming, and release all textures."""
+        self.stop()
+        for texture in list(self._textures):
+            texture.delete()
+        self._executor.shutdown(wait=False)
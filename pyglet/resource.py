@@ -47,15 +47,31 @@ This avoids a common programmer error when porting applications between platform
 The default path is ``['.']``.  If you modify the path, you must call
 :py:func:`reindex`.
 
+Indexing large resource trees
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+By default, every location on the path is scanned the first time a resource
+is requested.  For applications with a very large number of resource files,
+this can add noticeably to start up time.  A :py:class:`Loader` created with
+``lazy=True`` only lists a directory when a resource is first requested from
+it.  Alternatively, a manifest of the resources can be generated when the
+application is packaged (see :py:meth:`Loader.save_manifest` and
+``tools/genresourcemanifest.py``), and loaded with :py:func:`load_manifest`
+so that no scanning is needed at all.
+
 .. versionadded:: 1.1
 """
 
 import os
 import sys
+import json
+import time
 import zipfile
 import weakref
 
 from io import BytesIO
+from collections import deque
+from concurrent.futures import Future
 
 import pyglet
 
@@ -298,6 +314,105 @@ class URLLocation(Location):
         return urllib.request.urlopen(url)
 
 
+class _DirectoryEntry:
+    """A filesystem directory on the resource path."""
+
+    def __init__(self, path):
+        self.location = FileLocation(path)
+        self.scanned_directories = 0
+        self._listings = {}
+
+    def names(self):
+        path = self.location.path
+        for dirpath, dirnames, filenames in os.walk(path):
+            self.scanned_directories += 1
+            dirpath = dirpath[len(path) + 1:]
+            # Force forward slashes for index
+            if dirpath:
+                parts = [part
+                         for part
+                         in dirpath.split(os.sep)
+                         if part is not None]
+                dirpath = '/'.join(parts)
+            for filename in filenames:
+                if dirpath:
+                    yield dirpath + '/' + filename
+                else:
+                    yield filename
+
+    def contains(self, name):
+        dirname, _, filename = name.rpartition('/')
+        try:
+            filenames = self._listings[dirname]
+        except KeyError:
+            filenames = self._listings[dirname] = self._list_directory(dirname)
+        return filename in filenames
+
+    def _list_directory(self, dirname):
+        parts = dirname.split('/') if dirname else []
+        if '..' in parts or '' in parts or '\\' in dirname:
+            return frozenset()
+
+        self.scanned_directories += 1
+        try:
+            with os.scandir(os.path.join(self.location.path, *parts)) as it:
+                return frozenset(entry.name for entry in it if entry.is_file())
+        except OSError:
+            return frozenset()
+
+
+class _ZIPEntry:
+    """A ZIP archive, or a directory within one, on the resource path."""
+
+    def __init__(self, stream, dir):
+        self._stream = stream
+        self._dir = dir
+        self._location = None
+        self._names = None
+        self.scanned_directories = 0
+
+    @property
+    def location(self):
+        if self._location is None:
+            zip = zipfile.ZipFile(self._stream, 'r')
+            self._location = ZIPLocation(zip, self._dir)
+        return self._location
+
+    def names(self):
+        dir = self._dir
+        self.scanned_directories += 1
+        for zip_name in self.location.zip.namelist():
+            if zip_name.startswith(dir):
+                if dir:
+                    zip_name = zip_name[len(dir) + 1:]
+                yield zip_name
+
+    def contains(self, name):
+        if self._names is None:
+            self._names = frozenset(self.names())
+        return name in self._names
+
+
+class _ManifestEntry:
+    """A resource path location whose contents are listed in a manifest."""
+
+    scanned_directories = 0
+
+    def __init__(self, entry, names):
+        self._entry = entry
+        self._names = names
+
+    @property
+    def location(self):
+        return self._entry.location
+
+    def names(self):
+        return iter(self._names)
+
+    def contains(self, name):
+        return name in self._names
+
+
 class Loader:
     """Load program resource files from disk.
 
@@ -313,7 +428,29 @@ class Loader:
             application script.
 
     """
-    def __init__(self, path=None, script_home=None):
+
+    #: Number of worker threads used by :py:meth:`load_async`.
+    async_workers = 4
+
+    #: Maximum time, in seconds, spent creating OpenGL objects for
+    #: resources loaded with :py:meth:`load_async` each time the clock ticks.
+    async_budget = 0.004
+
+    #: The allocator used to place images in the texture atlases created by
+    #: :py:meth:`image` and :py:meth:`animation`.  Set this to
+    #: :py:class:`~pyglet.image.atlas.MaxRectsAllocator` for denser packing.
+    #: If None, :py:class:`~pyglet.image.atlas.Allocator` is used.
+    atlas_allocator_class = None
+
+    #: If True, :py:meth:`image` and :py:meth:`animation` pack images into the
+    #: layers of shared texture arrays, using a
+    #: :py:class:`~pyglet.image.atlas.TextureArrayAtlasBin`, instead of into
+    #: separate atlas textures.  Sprites of these images are drawn with the
+    #: texture array shader, and those sharing blend mode and group are drawn
+    #: with one draw call, whichever layer their images are in.
+    atlas_texture_array = False
+
+    def __init__(self, path=None, script_home=None, lazy=False):
         """Create a loader for the given path.
 
         If no path is specified it defaults to ``['.']``; that is, just the
@@ -327,6 +464,11 @@ class Loader:
             `script_home` : str
                 Base location of relative files.  Defaults to the result of
                 `get_script_home`.
+            `lazy` : bool
+                If True, the locations on the path are not scanned when the
+                loader is indexed.  Instead, each directory or ZIP archive is
+                listed the first time a resource is looked up in it.  This
+                greatly reduces start up time for large resource trees.
 
         """
         if path is None:
@@ -335,11 +477,24 @@ class Loader:
             path = [path]
         self.path = list(path)
         self._script_home = script_home or get_script_home()
+        self._lazy = lazy
         self._index = None
+        self._entries = []
+        self._manifest = None
+        self._reindex_time = 0.0
+
+        # Background loading
+        self._executor = None
+        self._async_ready = deque()
+        self._async_pending = 0
+        self._async_scheduled = False
 
         # Map bin size to list of atlases
         self._texture_atlas_bins = {}
 
+        # Map image name to (page name, x, y, width, height) of prepacked atlases
+        self._prepacked_images = {}
+
         # map name to image etc.
         self._cached_textures = weakref.WeakValueDictionary()
         self._cached_images = weakref.WeakValueDictionary()
@@ -349,84 +504,102 @@ class Loader:
         if self._index is None:
             self.reindex()
 
-    def reindex(self):
+    def reindex(self, workers=None):
         """Refresh the file index.
 
         You must call this method if `path` is changed or the filesystem
         layout changes.
+
+        Locations listed in a manifest (see :py:meth:`load_manifest`) are not
+        scanned.  If the loader is lazy, no location is scanned until a
+        resource is requested from it.
+
+        :Parameters:
+            `workers` : int
+                If greater than 1, the locations on the path are scanned
+                in parallel using this many threads.  Ignored for lazy
+                loaders.
+
         """
+        start = time.perf_counter()
         self._index = {}
+        self._entries = []
         for path in self.path:
-            if path.startswith('@'):
-                # Module
-                name = path[1:]
+            entry = self._get_entry(path)
+            if entry is None:
+                continue
 
-                try:
-                    module = __import__(name)
-                except:
-                    continue
+            if self._manifest is not None and path in self._manifest:
+                entry = _ManifestEntry(entry, self._manifest[path])
 
-                for component in name.split('.')[1:]:
-                    module = getattr(module, component)
+            self._entries.append(entry)
 
-                if hasattr(module, '__file__'):
-                    path = os.path.dirname(module.__file__)
-                else:
-                    path = ''  # interactive
-            elif not os.path.isabs(path):
-                # Add script base unless absolute
-                assert r'\\' not in path, "Backslashes are not permitted in relative paths"
-                path = os.path.join(self._script_home, path)
-
-            if os.path.isdir(path):
-                # Filesystem directory
-                path = path.rstrip(os.path.sep)
-                location = FileLocation(path)
-                for dirpath, dirnames, filenames in os.walk(path):
-                    dirpath = dirpath[len(path) + 1:]
-                    # Force forward slashes for index
-                    if dirpath:
-                        parts = [part
-                                 for part
-                                 in dirpath.split(os.sep)
-                                 if part is not None]
-                        dirpath = '/'.join(parts)
-                    for filename in filenames:
-                        if dirpath:
-                            index_name = dirpath + '/' + filename
-                        else:
-                            index_name = filename
-                        self._index_file(index_name, location)
+        if not self._lazy:
+            if workers is not None and workers > 1 and len(self._entries) > 1:
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(workers) as executor:
+                    results = list(executor.map(self._scan_entry, self._entries))
+            else:
+                results = [self._scan_entry(entry) for entry in self._entries]
+
+            for location, names in results:
+                for name in names:
+                    self._index_file(name, location)
+
+        self._reindex_time = time.perf_counter() - start
+
+    @staticmethod
+    def _scan_entry(entry):
+        return entry.location, list(entry.names())
+
+    def _get_entry(self, path):
+        if path.startswith('@'):
+            # Module
+            name = path[1:]
+
+            try:
+                module = __import__(name)
+            except:
+                return None
+
+            for component in name.split('.')[1:]:
+                module = getattr(module, component)
+
+            if hasattr(module, '__file__'):
+                path = os.path.dirname(module.__file__)
             else:
-                # Find path component that looks like the ZIP file.
-                dir = ''
-                old_path = None
-                while path and not (os.path.isfile(path) or os.path.isfile(path + '.001')):
-                    old_path = path
-                    path, tail_dir = os.path.split(path)
-                    if path == old_path:
-                        break
-                    dir = '/'.join((tail_dir, dir))
-                if path == old_path:
-                    continue
-                dir = dir.rstrip('/')
-
-                # path looks like a ZIP file, dir resides within ZIP
-                if not path:
-                    continue
-
-                zip_stream = self._get_stream(path)
-                if zip_stream:
-                    zip = zipfile.ZipFile(zip_stream, 'r')
-                    location = ZIPLocation(zip, dir)
-                    for zip_name in zip.namelist():
-                        # zip_name_dir, zip_name = os.path.split(zip_name)
-                        # assert '\\' not in name_dir
-                        # assert not name_dir.endswith('/')
-                        if zip_name.startswith(dir):
-                            if dir:
-                                zip_name = zip_name[len(dir) + 1:]
-                            self._index_file(zip_name, location)
+                path = ''  # interactive
+        elif not os.path.isabs(path):
+            # Add script base unless absolute
+            assert r'\\' not in path, "Backslashes are not permitted in relative paths"
+            path = os.path.join(self._script_home, path)
+
+        if os.path.isdir(path):
+            # Filesystem directory
+            path = path.rstrip(os.path.sep)
+            return _DirectoryEntry(path)
+
+        # Find path component that looks like the ZIP file.
+        dir = ''
+        old_path = None
+        while path and not (os.path.isfile(path) or os.path.isfile(path + '.001')):
+            old_path = path
+            path, tail_dir = os.path.split(path)
+            if path == old_path:
+                break
+            dir = '/'.join((tail_dir, dir))
+        if path == old_path:
+            return None
+        dir = dir.rstrip('/')
+
+        # path looks like a ZIP file, dir resides within ZIP
+        if not path:
+            return None
+
+        zip_stream = self._get_stream(path)
+        if zip_stream:
+            return _ZIPEntry(zip_stream, dir)
+        return None
 
     def _get_stream(self, path):
         if zipfile.is_zipfile(path):
@@ -454,6 +627,94 @@ class Loader:
         if name not in self._index:
             self._index[name] = location
 
+    def _get_location(self, name):
+        self._require_index()
+        try:
+            return self._index[name]
+        except KeyError:
+            if not self._lazy:
+                raise
+
+        for entry in self._entries:
+            if entry.contains(name):
+                location = self._index[name] = entry.location
+                return location
+
+        raise KeyError(name)
+
+    def load_manifest(self, filename):
+        """Use a prebuilt manifest of the resources on the path.
+
+        A manifest lists the files found in each location of the path, so that
+        those locations do not need to be scanned when the loader is indexed.
+        Manifests are created with :py:meth:`save_manifest`, typically as part
+        of packaging an application.  Locations on the path that are not
+        listed in the manifest are scanned as usual.
+
+        The manifest is not validated against the filesystem: if the
+        resources change, the manifest must be regenerated.
+
+        :Parameters:
+            `filename` : str
+                Filename of the manifest.  Relative filenames are taken to be
+                relative to the script home.
+
+        """
+        if not os.path.isabs(filename):
+            filename = os.path.join(self._script_home, filename)
+
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        self._manifest = {path: frozenset(names) for path, names in data['paths'].items()}
+        self._index = None
+
+    def save_manifest(self, filename):
+        """Write a manifest of all resources currently on the path.
+
+        Every location on the path is scanned, regardless of any manifest
+        already loaded.  See :py:meth:`load_manifest`.
+
+        :Parameters:
+            `filename` : str
+                Filename of the manifest to write.
+
+        """
+        paths = {}
+        for path in self.path:
+            entry = self._get_entry(path)
+            if entry is not None:
+                paths[path] = sorted(entry.names())
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'paths': paths}, f, indent=0)
+
+    def get_index_stats(self):
+        """Get statistics about the file index.
+
+        This is useful for debugging and profiling only.  The returned dict
+        contains the following keys:
+
+        ``reindex_time``
+            Duration of the last call to :py:meth:`reindex`, in seconds.
+        ``file_count``
+            Number of resource names currently in the index.  For lazy
+            loaders, this is the number of resources resolved so far.
+        ``scanned_directories``
+            Number of directories and archives that have been listed.
+        ``manifest``
+            True if a manifest is in use.
+
+        :rtype: dict
+        """
+        self._require_index()
+        return {
+            'reindex_time': self._reindex_time,
+            'file_count': len(self._index),
+            'scanned_directories': sum(entry.scanned_directories for entry in self._entries),
+            'manifest': self._manifest is not None,
+        }
+
     def file(self, name, mode='rb'):
         """Load a resource.
 
@@ -466,9 +727,8 @@ class Loader:
 
         :rtype: file object
         """
-        self._require_index()
         try:
-            location = self._index[name]
+            location = self._get_location(name)
             return location.open(name, mode)
         except KeyError:
             raise ResourceNotFoundException(name)
@@ -487,9 +747,8 @@ class Loader:
 
         :rtype: `Location`
         """
-        self._require_index()
         try:
-            return self._index[name]
+            return self._get_location(name)
         except KeyError:
             raise ResourceNotFoundException(name)
 
@@ -515,12 +774,58 @@ class Loader:
         font.add_file(file)
 
     def _alloc_image(self, name, atlas, border):
+        if atlas and name in self._prepacked_images:
+            return self._get_prepacked_image(name)
+        return self._upload_image(self._decode_image(name), atlas, border)
+
+    def _get_prepacked_image(self, name, page_image=None):
+        page_name, x, y, width, height = self._prepacked_images[name]
+        try:
+            texture = self._cached_textures[page_name]
+        except KeyError:
+            if page_image is None:
+                page_image = self._decode_image(page_name)
+            texture = self._cached_textures[page_name] = page_image.get_texture()
+        return texture.get_region(x, y, width, height)
+
+    def add_atlas(self, name):
+        """Add a prepacked texture atlas to the loader.
+
+        Prepacked atlases are created ahead of time from a directory of
+        images, with ``tools/packatlas.py`` or
+        :py:func:`pyglet.image.atlas.pack_images`.  They consist of a JSON
+        manifest and one or more atlas page images.  Once added, each image
+        listed in the manifest can be loaded with :py:meth:`image` as usual,
+        and is returned as a region of its atlas page.  Each page is only
+        loaded and uploaded once, the first time one of its images is
+        requested, so loading thousands of images needs only a handful of
+        texture uploads.
+
+        Images in a prepacked atlas are only used when :py:meth:`image` is
+        called with ``atlas=True``.
+
+        :Parameters:
+            `name` : str
+                Filename of the atlas manifest.  Page image names are
+                relative to the directory of the manifest.
+
+        """
+        with self.file(name, 'r') as file:
+            data = json.load(file)
+
+        directory = name.rpartition('/')[0]
+        pages = [directory + '/' + page if directory else page for page in data['pages']]
+        for image_name, (page, x, y, width, height) in data['images'].items():
+            self._prepacked_images[image_name] = pages[page], x, y, width, height
+
+    def _decode_image(self, name):
         file = self.file(name)
         try:
-            img = pyglet.image.load(name, file=file)
+            return pyglet.image.load(name, file=file)
         finally:
             file.close()
 
+    def _upload_image(self, img, atlas, border):
         if not atlas:
             return img.get_texture()
 
@@ -548,10 +853,18 @@ class Loader:
         if height > max_size / 4:
             bin_size = 2
 
+        # Texture arrays share one bin, so that all images end up in the same texture.
+        if self.atlas_texture_array:
+            bin_size = 'array'
+
         try:
             texture_bin = self._texture_atlas_bins[bin_size]
         except KeyError:
-            texture_bin = pyglet.image.atlas.TextureBin()
+            allocator_class = self.atlas_allocator_class or pyglet.image.atlas.Allocator
+            if self.atlas_texture_array:
+                texture_bin = pyglet.image.atlas.TextureArrayAtlasBin(allocator_class=allocator_class)
+            else:
+                texture_bin = pyglet.image.atlas.TextureBin(allocator_class=allocator_class)
             self._texture_atlas_bins[bin_size] = texture_bin
 
         return texture_bin
@@ -597,12 +910,16 @@ class Loader:
 
         return identity.get_transform(flip_x, flip_y, rotate)
 
-    def animation(self, name, flip_x=False, flip_y=False, rotate=0, border=1):
+    def animation(self, name, flip_x=False, flip_y=False, rotate=0, border=1, streaming=False):
         """Load an animation with optional transformation.
 
         Animations loaded from the same source but with different
         transformations will use the same textures.
 
+        Streaming animations are not cached or added to an atlas; each call
+        returns a new :py:class:`~pyglet.image.StreamingAnimation` that
+        decodes its frames as they are shown.
+
         :Parameters:
             `name` : str
                 Filename of the animation source to load.
@@ -616,27 +933,41 @@ class Loader:
             `border` : int
                 Leaves specified pixels of blank space around each image in
                 an atlas, which may help reduce texture bleeding.
-                
+            `streaming` : bool
+                If True, decode frames on demand rather than loading every
+                frame into an atlas.
+
         :rtype: :py:class:`~pyglet.image.Animation`
         """
         self._require_index()
+        if streaming:
+            animation = pyglet.image.load_animation(name, self.file(name), streaming=True)
+            if not rotate and not flip_x and not flip_y:
+                return animation
+            return animation.get_transform(flip_x, flip_y, rotate)
+
         try:
             identity = self._cached_animations[name]
         except KeyError:
-            animation = pyglet.image.load_animation(name, self.file(name))
-            bin = self._get_texture_atlas_bin(animation.get_max_width(),
-                                              animation.get_max_height(),
-                                              border)
-            if bin:
-                animation.add_to_texture_bin(bin, border)
-
-            identity = self._cached_animations[name] = animation
+            animation = self._decode_animation(name)
+            identity = self._cached_animations[name] = self._upload_animation(animation, border)
 
         if not rotate and not flip_x and not flip_y:
             return identity
 
         return identity.get_transform(flip_x, flip_y, rotate)
 
+    def _decode_animation(self, name):
+        return pyglet.image.load_animation(name, self.file(name))
+
+    def _upload_animation(self, animation, border):
+        bin = self._get_texture_atlas_bin(animation.get_max_width(),
+                                          animation.get_max_height(),
+                                          border)
+        if bin:
+            animation.add_to_texture_bin(bin, border)
+        return animation
+
     def get_cached_image_names(self):
         """Get a list of image filenames that have been cached.
 
@@ -686,10 +1017,9 @@ class Loader:
 
         :rtype: `media.Source`
         """
-        self._require_index()
         from pyglet import media
         try:
-            location = self._index[name]
+            location = self._get_location(name)
             if isinstance(location, FileLocation):
                 # Don't open the file if it's streamed from disk
                 path = os.path.join(location.path, name)
@@ -718,8 +1048,7 @@ class Loader:
         if name in self._cached_textures:
             return self._cached_textures[name]
 
-        file = self.file(name)
-        texture = pyglet.image.load(name, file=file).get_texture()
+        texture = self._decode_image(name).get_texture()
         self._cached_textures[name] = texture
         return texture
 
@@ -813,6 +1142,137 @@ class Loader:
 
         return pyglet.graphics.shader.Shader(source_string, shader_type)
 
+    def load_async(self, names, kind='image', **kwargs):
+        """Load several resources in the background.
+
+        The resources are read and decoded on a pool of worker threads, so
+        that the application keeps running while a level or scene is loaded.
+        Any OpenGL work, such as creating textures, inserting images into
+        texture atlases or creating vertex lists, is then done on the main
+        thread by a function scheduled on the default clock.  At most
+        :py:attr:`async_budget` seconds of this work is done each time the
+        clock ticks, so loading a large number of resources does not stall
+        rendering.
+
+        A :py:class:`concurrent.futures.Future` is returned for each name.
+        Each future resolves to the same object that the equivalent blocking
+        method (for example :py:meth:`image`) would return, and its callbacks
+        are called on the main thread.  When using
+        :py:meth:`~pyglet.app.EventLoop.async_run`, wrap the futures with
+        :py:func:`asyncio.wrap_future` to await them::
+
+            futures = pyglet.resource.load_async(['grass.png', 'tree.png'])
+            grass, tree = await asyncio.gather(*map(asyncio.wrap_future, futures))
+
+        :Parameters:
+            `names` : list of str
+                Filenames of the resources to load.
+            `kind` : str
+                The type of resource to load.  One of ``'image'``,
+                ``'texture'``, ``'animation'``, ``'media'`` or ``'model'``.
+            `kwargs`
+                Additional arguments, passed as for the blocking method of
+                the same name.  For example, ``atlas`` and ``border`` for
+                images, ``streaming`` for media or ``batch`` for models.
+
+        :rtype: list of :py:class:`concurrent.futures.Future`
+
+        .. note:: Model files are read in the background, but parsed on the
+                  main thread, as the model decoders create their vertex
+                  lists while parsing.
+        """
+        if kind not in ('image', 'texture', 'animation', 'media', 'model'):
+            raise ValueError(f"Unknown resource kind: '{kind}'")
+
+        self._require_index()
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(self.async_workers, thread_name_prefix='pyglet-resource')
+
+        cache = self._get_async_cache(kind)
+        futures = []
+        for name in names:
+            future = Future()
+            futures.append(future)
+
+            if cache is not None and name in cache:
+                future.set_result(cache[name])
+                continue
+
+            self._async_pending += 1
+            decode_future = self._executor.submit(self._decode_async, kind, name, kwargs)
+            decode_future.add_done_callback(
+                lambda f, item=(kind, name, kwargs, future): self._async_ready.append(item + (f,)))
+
+        if self._async_pending and not self._async_scheduled:
+            pyglet.clock.schedule(self._upload_async)
+            self._async_scheduled = True
+
+        return futures
+
+    def _get_async_cache(self, kind):
+        if kind == 'image':
+            return self._cached_images
+        elif kind == 'texture':
+            return self._cached_textures
+        elif kind == 'animation':
+            return self._cached_animations
+        return None
+
+    def _decode_async(self, kind, name, kwargs):
+        # Called on a worker thread: no OpenGL calls allowed.
+        if kind == 'image' and kwargs.get('atlas', True) and name in self._prepacked_images:
+            page_name = self._prepacked_images[name][0]
+            if page_name in self._cached_textures:
+                return None
+            return self._decode_image(page_name)
+        elif kind in ('image', 'texture'):
+            return self._decode_image(name)
+        elif kind == 'animation':
+            return self._decode_animation(name)
+        elif kind == 'media':
+            return self.media(name, **kwargs)
+        elif kind == 'model':
+            abspathname = os.path.join(os.path.abspath(self.location(name).path), name)
+            with self.file(name) as file:
+                return abspathname, BytesIO(file.read())
+
+    def _upload_async(self, dt):
+        start = time.perf_counter()
+        while self._async_ready:
+            kind, name, kwargs, future, decode_future = self._async_ready.popleft()
+            self._async_pending -= 1
+
+            try:
+                decoded = decode_future.result()
+                if kind == 'image' and kwargs.get('atlas', True) and name in self._prepacked_images:
+                    result = self._get_prepacked_image(name, decoded)
+                elif kind == 'image':
+                    result = self._upload_image(decoded, kwargs.get('atlas', True), kwargs.get('border', 1))
+                elif kind == 'texture':
+                    result = decoded.get_texture()
+                elif kind == 'animation':
+                    result = self._upload_animation(decoded, kwargs.get('border', 1))
+                elif kind == 'model':
+                    filename, file = decoded
+                    result = pyglet.model.load(filename=filename, file=file, **kwargs)
+                else:
+                    result = decoded
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                cache = self._get_async_cache(kind)
+                if cache is not None:
+                    cache[name] = result
+                future.set_result(result)
+
+            if time.perf_counter() - start >= self.async_budget:
+                break
+
+        if not self._async_pending:
+            pyglet.clock.unschedule(self._upload_async)
+            self._async_scheduled = False
+
     def get_cached_texture_names(self):
         """Get the names of textures currently cached.
 
@@ -863,3 +1323,8 @@ get_cached_texture_names = _default_loader.get_cached_texture_names
 get_cached_image_names = _default_loader.get_cached_image_names
 get_cached_animation_names = _default_loader.get_cached_animation_names
 get_texture_bins = _default_loader.get_texture_bins
+load_manifest = _default_loader.load_manifest
+save_manifest = _default_loader.save_manifest
+get_index_stats = _default_loader.get_index_stats
+load_async = _default_loader.load_async
+add_atlas = _default_loader.add_atlas
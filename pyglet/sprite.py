@@ -293,7 +293,7 @@ class Sprite(event.EventDispatcher):
 
     @property
     def program(self):
-        if isinstance(self._img, image.TextureArrayRegion):
+        if self._texture.target == GL_TEXTURE_2D_ARRAY:
             program = get_default_array_shader()
         else:
             program = get_default_shader()
@@ -420,13 +420,14 @@ class Sprite(event.EventDispatcher):
 
     def _set_texture(self, texture):
         if texture.id is not self._texture.id:
+            self._texture = texture
+            # The program depends on the texture target.
             self._group = self._group.__class__(texture,
                                                 self._group.blend_src,
                                                 self._group.blend_dest,
-                                                self._group.program,
+                                                self.program,
                                                 self._group.parent)
             self._vertex_list.delete()
-            self._texture = texture
             self._create_vertex_list()
         else:
             self._vertex_list.tex_coords[:] = texture.tex_coords
@@ -806,17 +807,12 @@ class AdvancedSprite(Sprite):
 
         self._program = program
 
-        if not program:
-            if isinstance(img, image.TextureArrayRegion):
-                self._program = get_default_array_shader()
-            else:
-                self._program = get_default_shader()
-
         super().__init__(img, x, y, z, blend_src, blend_dest, batch, group, subpixel)
 
     @property
     def program(self):
-        return self._program
+        # Without a custom program, the default for the texture target is used.
+        return self._program or super().program
 
     @program.setter
     def program(self, program):
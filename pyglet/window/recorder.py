@@ -0,0 +1,299 @@
+"""Record the contents of a window to image files or a video.
+
+:py:class:`FrameRecorder` captures every N-th frame of a window after it has
+been drawn, using :py:class:`~pyglet.image.readback.AsyncReadback` so that
+rendering is not stalled waiting for the pixels.  Captured frames are encoded
+on a background thread, either to a numbered sequence of image files or, if
+the ``ffmpeg`` program is installed, to a video file::
+
+    window = pyglet.window.Window()
+    recorder = FrameRecorder(window, 'capture/frame%05d.png', interval=2)
+    recorder.start()
+    pyglet.app.run()
+    recorder.stop()
+    print(recorder.get_stats())
+
+At most `max_queued` frames are waiting to be encoded at any time.  If the
+encoder falls behind, further frames are dropped (and counted) rather than
+using more memory, unless `drop_frames` is ``False``, in which case the
+window waits for the encoder instead.
+
+The recorder works with any window that has an OpenGL context, including
+headless windows.  Its :py:meth:`~FrameRecorder.get_stats` method reports
+how much time capturing adds to each frame on the main thread.
+"""
+
+import os
+import queue
+import shutil
+import threading
+import subprocess
+
+from time import perf_counter
+
+from pyglet import gl
+from pyglet.image.readback import AsyncReadback
+
+#: Filename extensions that are encoded as a video by ``ffmpeg``.
+video_extensions = ('.mp4', '.mkv', '.webm', '.mov', '.avi')
+
+
+class ImageSequenceEncoder:
+    """Write each frame to a numbered image file."""
+
+    def __init__(self, filename, encoder=None):
+        """Create an image sequence encoder.
+
+        :Parameters:
+            `filename` : str
+                A filename pattern containing a ``%d`` style field for the
+                frame number, such as ``'frame%05d.png'``.  If there is no
+                field, one is inserted before the extension.
+            `encoder` : ImageEncoder or None
+                The image encoder to use.  If unspecified, the encoders
+                registered for the filename extension are tried.
+
+        """
+        if '%' not in filename:
+            root, ext = os.path.splitext(filename)
+            filename = root + '%05d' + ext
+        self.filename = filename
+        self.encoder = encoder
+
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, image, index):
+        filename = self.filename % index
+        with open(filename, 'wb') as file:
+            image.save(filename, file, self.encoder)
+
+    def close(self):
+        pass
+
+
+class FFmpegEncoder:
+    """Pipe raw frames to an ``ffmpeg`` process to encode a video."""
+
+    def __init__(self, filename, fps=60, executable=None):
+        """Create a video encoder.
+
+        :Parameters:
+            `filename` : str
+                The video file to write.  The container and codec are chosen
+                by ``ffmpeg`` from the extension.
+            `fps` : float
+                Frame rate of the video.
+            `executable` : str or None
+                Path to the ``ffmpeg`` program.  If unspecified, it is
+                searched for on the ``PATH``.
+
+        """
+        self.filename = filename
+        self.fps = fps
+        self.executable = executable or shutil.which('ffmpeg')
+        if self.executable is None:
+            raise FileNotFoundError('The ffmpeg program is required to record video.')
+        self._process = None
+        self._size = None
+
+    def _open(self, width, height):
+        args = [self.executable, '-loglevel', 'error', '-y',
+                '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(self.fps),
+                '-i', '-',
+                # Frames are read bottom-up; most codecs also need even dimensions.
+                '-vf', 'vflip,pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                '-pix_fmt', 'yuv420p', self.filename]
+        self._process = subprocess.Popen(args, stdin=subprocess.PIPE)
+        self._size = width, height
+
+    def write(self, image, index):
+        if self._process is None:
+            self._open(image.width, image.height)
+        elif (image.width, image.height) != self._size:
+            # The video size is fixed once started.
+            return
+        self._process.stdin.write(image.get_data('RGBA', image.width * 4))
+
+    def close(self):
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
+            self._process = None
+
+
+class FrameRecorder:
+    """Capture frames of a window in the background.
+
+    The recorder is added to the window's event handlers by
+    :py:meth:`start`, and captures frames in its ``on_refresh`` handler,
+    after ``on_draw`` and before the window is flipped.
+    """
+
+    def __init__(self, window, filename, interval=1, fps=60, max_queued=8, drop_frames=True,
+                 encoder=None, ring_size=3):
+        """Create a frame recorder.
+
+        :Parameters:
+            `window` : `~pyglet.window.Window`
+                The window to record.
+            `filename` : str
+                Where to write the recording.  Filenames ending in one of
+                :py:data:`video_extensions` are encoded as a video with
+                ``ffmpeg``; anything else is written as a numbered image
+                sequence (see :py:class:`ImageSequenceEncoder`).
+            `interval` : int
+                Capture every `interval`-th frame.
+            `fps` : float
+                Frame rate of a recorded video.
+            `max_queued` : int
+                Maximum number of captured frames waiting to be encoded.
+            `drop_frames` : bool
+                If ``True``, frames are dropped when `max_queued` frames are
+                already waiting.  If ``False``, the window waits instead.
+            `encoder` : object or None
+                An object with ``write(image, index)`` and ``close()``
+                methods, such as :py:class:`ImageSequenceEncoder` or
+                :py:class:`FFmpegEncoder`, to use instead of the one chosen
+                from `filename`.
+            `ring_size` : int
+                Number of pixel pack buffers used for readback.
+
+        """
+        self.window = window
+        self.interval = max(1, interval)
+        self.drop_frames = drop_frames
+
+        if encoder is None:
+            if filename.lower().endswith(video_extensions):
+                encoder = FFmpegEncoder(filename, fps)
+            else:
+                encoder = ImageSequenceEncoder(filename)
+        self.encoder = encoder
+
+        self._ring_size = ring_size
+        self._readback = None
+        self._queue = queue.Queue(max_queued)
+        self._thread = None
+        self._error = None
+
+        self._frames_seen = 0
+        self._readback_stalls = 0
+        self._frames_captured = 0
+        self._frames_encoded = 0
+        self._frames_dropped = 0
+        self._capture_time = 0.0
+        self._encode_time = 0.0
+        self._frame_time = 0.0
+
+    @property
+    def is_recording(self):
+        return self._thread is not None
+
+    def start(self):
+        """Start recording."""
+        if self._thread is not None:
+            return
+
+        self.window.switch_to()
+        self._readback = AsyncReadback(self._ring_size)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.window.push_handlers(self)
+
+    def stop(self):
+        """Stop recording, and wait for all captured frames to be encoded.
+
+        :rtype: dict
+        :return: The statistics from :py:meth:`get_stats`.
+        """
+        if self._thread is None:
+            return self.get_stats()
+
+        self.window.remove_handlers(self)
+        self.window.switch_to()
+        self._readback.flush()
+        self._readback_stalls += self._readback.stalls
+        self._readback.delete()
+        self._readback = None
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self.encoder.close()
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        return self.get_stats()
+
+    def get_stats(self):
+        """Get statistics about the recording so far.
+
+        ``capture_overhead`` is the mean time, in seconds, that capturing
+        added to each captured frame on the main thread, and
+        ``encode_time`` the mean time the background thread spent encoding
+        each frame.  ``readback_stalls`` counts the frames for which the
+        main thread had to wait for an earlier readback to complete.
+
+        :rtype: dict
+        """
+        captured = self._frames_captured
+        encoded = self._frames_encoded
+        return {
+            'frames_seen': self._frames_seen,
+            'frames_captured': captured,
+            'frames_encoded': encoded,
+            'frames_dropped': self._frames_dropped,
+            'readback_stalls': self._readback_stalls + (self._readback.stalls if self._readback else 0),
+            'mean_frame_time': self._frame_time / self._frames_seen if self._frames_seen else 0.0,
+            'capture_overhead': self._capture_time / captured if captured else 0.0,
+            'encode_time': self._encode_time / encoded if encoded else 0.0,
+        }
+
+    def on_refresh(self, dt):
+        self._frames_seen += 1
+        self._frame_time += dt
+        if self._frames_seen % self.interval:
+            return
+
+        start = perf_counter()
+        width, height = self.window.get_framebuffer_size()
+        gl_buffer = gl.GL_BACK if self.window.context.config.double_buffer else gl.GL_FRONT
+        future = self._readback.read_pixels(0, 0, width, height, 'RGBA', gl_buffer)
+        future.add_done_callback(self._on_frame)
+        self._frames_captured += 1
+        self._capture_time += perf_counter() - start
+
+    def _on_frame(self, future):
+        # Called on the main thread when a readback completes.
+        if future.cancelled():
+            return
+        image = future.result()
+        if self.drop_frames:
+            try:
+                self._queue.put_nowait(image)
+            except queue.Full:
+                self._frames_dropped += 1
+        else:
+            self._queue.put(image)
+
+    def _run(self):
+        index = 0
+        while True:
+            image = self._queue.get()
+            if image is None:
+                break
+            if self._error is not None:
+                continue
+
+            start = perf_counter()
+            try:
+                self.encoder.write(image, index)
+            except Exception as e:
+                self._error = e
+                continue
+            self._encode_time += perf_counter() - start
+            self._frames_encoded += 1
+            index += 1
@@ -0,0 +1,56 @@
+import unittest
+
+from pyglet.gl import *
+from pyglet.image import *
+from pyglet.window import *
+
+
+class TestAsyncReadback(unittest.TestCase):
+    """Test asynchronous readback through pixel pack buffers."""
+
+    def setUp(self):
+        self.w = Window(width=64, height=32, visible=False)
+        self.readback = get_buffer_manager().get_readback()
+
+    def tearDown(self) -> None:
+        self.readback.delete()
+        self.w.close()
+
+    def test_texture(self):
+        data = bytes(range(256)) * 4
+        texture = ImageData(16, 16, 'RGBA', data).get_texture()
+
+        future = texture.get_image_data_async()
+        self.readback.flush()
+        image = future.result(0)
+        self.assertEqual(image.get_data('RGBA', 64), texture.get_image_data().get_data('RGBA', 64))
+
+    def test_texture_region(self):
+        data = bytes(range(256)) * 4
+        texture = ImageData(16, 16, 'RGBA', data).get_texture()
+        region = texture.get_region(4, 2, 8, 8)
+
+        future = region.get_image_data_async()
+        self.readback.flush()
+        image = future.result(0)
+        self.assertEqual(image.get_data('RGBA', 32), region.get_image_data().get_data('RGBA', 32))
+
+    def test_color_buffer(self):
+        glClearColor(1, 0, 0, 1)
+        self.w.clear()
+
+        future = get_buffer_manager().get_color_buffer().get_image_data_async()
+        self.readback.flush()
+        image = future.result(0)
+        self.assertEqual((image.width, image.height), self.w.get_framebuffer_size())
+        self.assertEqual(image.get_data('RGBA', image.width * 4)[:4], b'\xff\x00\x00\xff')
+
+    def test_ring_is_bounded(self):
+        self.readback.ring_size = 2
+        texture = ImageData(4, 4, 'RGBA', bytes(64)).get_texture()
+
+        futures = [texture.get_image_data_async() for _ in range(5)]
+        self.assertLessEqual(self.readback.pending, 2)
+        self.readback.flush()
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(self.readback.pending, 0)
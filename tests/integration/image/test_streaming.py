@@ -0,0 +1,63 @@
+import unittest
+
+from pyglet.image import ImageData
+from pyglet.image.streaming import TextureStreamer
+from pyglet.window import Window
+
+
+def _wait(texture):
+    texture._future.result()
+
+
+class TestTextureStreamer(unittest.TestCase):
+    """Test uploading mipmap levels on demand within a budget."""
+
+    def setUp(self):
+        self.w = Window(width=64, height=64, visible=False)
+
+    def tearDown(self) -> None:
+        self.streamer.delete()
+        self.w.close()
+
+    def test_coarse_levels_first(self):
+        self.streamer = TextureStreamer(initial_size=16)
+        texture = self.streamer.add(ImageData(256, 256, 'RGBA', bytes(256 * 256 * 4)))
+        _wait(texture)
+        self.streamer.update()
+        self.assertEqual(texture.level_count, 9)
+        # Only levels up to 16x16 are uploaded until more detail is requested.
+        self.assertEqual(texture.resident_level, 4)
+
+        texture.request(256, 256)
+        self.streamer.update()
+        self.assertEqual(texture.resident_level, 0)
+
+    def test_upload_limit(self):
+        self.streamer = TextureStreamer(upload_limit=64 * 64, initial_size=1)
+        texture = self.streamer.add(ImageData(128, 128, 'RGBA', bytes(128 * 128 * 4)))
+        texture.request(128, 128)
+        _wait(texture)
+        frames = 0
+        while texture.resident_level > 0:
+            self.streamer.update()
+            frames += 1
+        # Level 0 alone is 64 KiB, so it takes at least 16 frames.
+        self.assertGreaterEqual(frames, 16)
+
+    def test_budget_evicts_least_recent(self):
+        level_bytes = 64 * 64 * 4
+        self.streamer = TextureStreamer(budget=level_bytes * 2, initial_size=1)
+        first = self.streamer.add(ImageData(64, 64, 'RGBA', bytes(level_bytes)))
+        second = self.streamer.add(ImageData(64, 64, 'RGBA', bytes(level_bytes)))
+        _wait(first)
+        _wait(second)
+
+        first.request(64, 64)
+        self.streamer.update()
+        self.assertEqual(first.resident_level, 0)
+
+        second.request(64, 64)
+        self.streamer.update()
+        self.assertEqual(second.resident_level, 0)
+        self.assertGreater(first.resident_level, 0)
+        self.assertLessEqual(self.streamer.resident_bytes, self.streamer.budget)
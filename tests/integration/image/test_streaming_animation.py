@@ -0,0 +1,38 @@
+import unittest
+
+from pyglet.image import AnimationFrame, ImageData, StreamingAnimation
+from pyglet.sprite import Sprite
+from pyglet.window import Window
+
+
+def _open_frames():
+    for i in range(6):
+        yield AnimationFrame(ImageData(4, 4, 'RGBA', bytes((i * 40, 0, 0, 255)) * 16), 0.1)
+
+
+class TestStreamingAnimation(unittest.TestCase):
+    """Test playing a streaming animation with a sprite."""
+
+    def setUp(self):
+        self.w = Window(width=64, height=64, visible=False)
+        self.animation = StreamingAnimation(_open_frames, [0.1] * 6, 4, 4, ring_size=3)
+
+    def tearDown(self) -> None:
+        self.animation.delete()
+        self.w.close()
+
+    def test_frames_use_ring(self):
+        for index in range(6):
+            region = self.animation.frames[index].image
+            self.assertEqual(region.get_image_data().get_data('RGBA', 16)[:4], bytes((index * 40, 0, 0, 255)))
+        self.assertEqual(len(self.animation._slots), 3)
+
+    def test_sprite(self):
+        sprite = Sprite(self.animation)
+        texture_id = sprite._texture.id
+        for index in range(1, 8):
+            sprite._animate(0.1)
+            self.assertEqual(sprite.frame_index, index % 6)
+            # Frames share one texture, so only texture coordinates change.
+            self.assertEqual(sprite._texture.id, texture_id)
+        sprite.delete()
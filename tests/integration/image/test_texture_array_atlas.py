@@ -0,0 +1,61 @@
+import unittest
+
+from pyglet.gl import GL_TEXTURE_2D_ARRAY
+from pyglet.graphics import Batch
+from pyglet.image import ImageData, TextureArrayDepthExceeded
+from pyglet.image.atlas import TextureArrayAtlas, TextureArrayAtlasBin
+from pyglet.sprite import Sprite
+from pyglet.window import Window
+
+
+def _image(size, value):
+    return ImageData(size, size, 'RGBA', bytes((value, 0, 0, 255)) * (size * size))
+
+
+class TestTextureArrayAtlas(unittest.TestCase):
+    """Test packing images into the layers of a texture array."""
+
+    def setUp(self):
+        self.w = Window(width=64, height=64, visible=False)
+
+    def tearDown(self) -> None:
+        self.w.close()
+
+    def test_layers(self):
+        atlas = TextureArrayAtlas(64, 64, max_depth=2)
+        regions = [atlas.add(_image(40, i * 50)) for i in range(2)]
+        # The second image does not fit beside the first, so it uses a new layer.
+        self.assertEqual([region.z for region in regions], [0, 1])
+        self.assertEqual(regions[0].id, regions[1].id)
+        self.assertEqual(regions[1].target, GL_TEXTURE_2D_ARRAY)
+        self.assertRaises(TextureArrayDepthExceeded, atlas.add, _image(40, 0))
+
+        # Small images fill the space left in existing layers.
+        region = atlas.add(_image(16, 200))
+        self.assertEqual(region.z, 0)
+        self.assertEqual(region.get_image_data().get_data('RGBA', 64)[:4], bytes((200, 0, 0, 255)))
+
+    def test_bin(self):
+        texture_bin = TextureArrayAtlasBin(64, 64, max_depth=2)
+        regions = texture_bin.add_many([_image(40, 0) for _ in range(3)])
+        self.assertEqual(len(texture_bin.atlases), 2)
+        self.assertEqual(regions[0].id, regions[1].id)
+        self.assertNotEqual(regions[1].id, regions[2].id)
+
+    def test_sprites_share_group(self):
+        atlas = TextureArrayAtlas(64, 64, max_depth=4)
+        batch = Batch()
+        sprites = [Sprite(atlas.add(_image(40, i * 50)), batch=batch) for i in range(3)]
+        self.assertEqual(len({sprite._group for sprite in sprites}), 1)
+
+        # Changing to an image in another layer keeps the group.
+        group = sprites[0]._group
+        sprites[0].image = sprites[2].image
+        self.assertEqual(sprites[0]._group, group)
+
+        # Changing to a plain texture switches to the 2D shader.
+        sprites[0].image = _image(4, 0).get_texture()
+        self.assertIsNot(sprites[0]._group.program, group.program)
+        batch.draw()
+        for sprite in sprites:
+            sprite.delete()
@@ -0,0 +1,59 @@
+"""
+Test background loading of resources with Loader.load_async.
+"""
+
+import time
+
+import pytest
+
+import pyglet
+from pyglet import resource
+
+
+@pytest.fixture
+def loader(test_data):
+    return resource.Loader(script_home=test_data.get_file('media'))
+
+
+def _wait(futures, timeout=5.0):
+    end = time.perf_counter() + timeout
+    while not all(future.done() for future in futures):
+        assert time.perf_counter() < end, "Timed out waiting for resources"
+        pyglet.clock.tick()
+        time.sleep(0.001)
+
+
+def test_load_media_async(loader):
+    futures = loader.load_async(['alert.wav', 'login.wav'], kind='media', streaming=False)
+    _wait(futures)
+
+    alert, login = [future.result() for future in futures]
+    assert isinstance(alert, pyglet.media.StaticSource)
+    assert isinstance(login, pyglet.media.StaticSource)
+    assert alert.duration > 0
+
+
+def test_load_async_not_found(loader):
+    futures = loader.load_async(['missing.wav'], kind='media')
+    _wait(futures)
+
+    with pytest.raises(resource.ResourceNotFoundException):
+        futures[0].result()
+
+
+def test_load_async_unknown_kind(loader):
+    with pytest.raises(ValueError):
+        loader.load_async(['alert.wav'], kind='sound')
+
+
+def test_load_async_budget(loader):
+    loader.async_budget = 0
+    futures = loader.load_async(['alert.wav', 'login.wav', 'logout.wav'], kind='media', streaming=False)
+
+    # Wait until everything is decoded, then check only one upload happens per tick.
+    while len(loader._async_ready) < 3:
+        time.sleep(0.001)
+
+    pyglet.clock.tick()
+    assert sum(future.done() for future in futures) == 1
+    _wait(futures)
@@ -84,6 +84,40 @@ def test_zipfile_subdirs(loader):
     assert loader.file('f9.txt').read().strip() == asbytes('F9')
 
 
+def test_parallel_reindex(loader):
+    loader.path = ['dir1/res.zip/dir1', 'dir1', 'dir2']
+    loader.reindex(workers=4)
+    assert loader.file('f8.txt').read().strip() == asbytes('F8')
+    assert loader.file('f2.txt').read().strip() == asbytes('F2')
+    assert loader.file('f6.txt').read().strip() == asbytes('F6')
+
+
+def test_lazy_index():
+    script_home = os.path.dirname(__file__)
+    loader = resource.Loader(['dir1/res.zip', 'dir1', 'dir2'], script_home=script_home, lazy=True)
+    loader.reindex()
+    assert loader.get_index_stats()['scanned_directories'] == 0
+
+    assert loader.file('f6.txt').read().strip() == asbytes('F6')
+    assert loader.file('dir1/f3.txt').read().strip() == asbytes('F3')
+    assert loader.file('dir1/f8.txt').read().strip() == asbytes('F8')
+    assert loader.get_index_stats()['file_count'] == 3
+    pytest.raises(resource.ResourceNotFoundException, loader.file, '../f1.txt')
+
+
+def test_manifest(loader, tmp_path):
+    loader.path = ['dir1', 'dir2']
+    manifest = str(tmp_path / 'manifest.json')
+    loader.save_manifest(manifest)
+
+    loader.load_manifest(manifest)
+    assert loader.file('dir1/f3.txt').read().strip() == asbytes('F3')
+    assert loader.file('f6.txt').read().strip() == asbytes('F6')
+    stats = loader.get_index_stats()
+    assert stats['manifest']
+    assert stats['scanned_directories'] == 0
+
+
 # Expected Failures:
 
 def test_no_path_exception(loader):
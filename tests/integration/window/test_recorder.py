@@ -0,0 +1,45 @@
+import os
+import unittest
+import tempfile
+
+import pyglet
+
+from pyglet.gl import glClearColor
+from pyglet.window import Window
+from pyglet.window.recorder import FrameRecorder
+
+
+class TestFrameRecorder(unittest.TestCase):
+    """Test capturing frames of a window to an image sequence."""
+
+    def setUp(self):
+        self.w = Window(width=32, height=16, visible=False)
+        self.directory = tempfile.TemporaryDirectory()
+
+        @self.w.event
+        def on_draw():
+            glClearColor(0, 1, 0, 1)
+            self.w.clear()
+
+    def tearDown(self) -> None:
+        self.w.close()
+        self.directory.cleanup()
+
+    def test_record_every_other_frame(self):
+        filename = os.path.join(self.directory.name, 'frame%03d.png')
+        recorder = FrameRecorder(self.w, filename, interval=2, drop_frames=False)
+        recorder.start()
+        for _ in range(6):
+            self.w.draw(1 / 60)
+        stats = recorder.stop()
+
+        self.assertEqual(stats['frames_seen'], 6)
+        self.assertEqual(stats['frames_captured'], 3)
+        self.assertEqual(stats['frames_encoded'], 3)
+        self.assertEqual(stats['frames_dropped'], 0)
+        self.assertGreater(stats['capture_overhead'], 0)
+
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ['frame000.png', 'frame001.png', 'frame002.png'])
+        image = pyglet.image.load(filename % 0)
+        self.assertEqual((image.width, image.height), self.w.get_framebuffer_size())
+        self.assertEqual(image.get_data('RGBA', image.width * 4)[:4], b'\x00\xff\x00\xff')
@@ -25,7 +25,7 @@ class AllocatorEnvironment:
     def __init__(self, test_case, width, height):
         self.test_case = test_case
         self.rectes = []
-        self.allocator = atlas.Allocator(width, height)
+        self.allocator = test_case.allocator_class(width, height)
 
     def check(self, test_case):
         for i, rect in enumerate(self.rectes):
@@ -47,6 +47,8 @@ class AllocatorEnvironment:
 
 
 class TestPack(unittest.TestCase):
+    allocator_class = atlas.Allocator
+
     def test_over_x(self):
         env = AllocatorEnvironment(self, 3, 3)
         env.add_fail(3, 4)
@@ -89,5 +91,42 @@ class TestPack(unittest.TestCase):
         env.add_fail(1, 1)
 
 
+class TestMaxRectsPack(TestPack):
+    allocator_class = atlas.MaxRectsAllocator
+
+    def test_mixed_sizes(self):
+        env = AllocatorEnvironment(self, 8, 8)
+        env.add(2, 6)
+        env.add(6, 2)
+        env.add(6, 6)
+        env.add(2, 2)
+        env.add_fail(1, 1)
+
+    def test_usage(self):
+        env = AllocatorEnvironment(self, 4, 4)
+        env.add(2, 2)
+        self.assertEqual(env.allocator.get_usage(), 0.25)
+        self.assertEqual(env.allocator.get_fragmentation(), 0.5)
+
+
+class TestPackImages(unittest.TestCase):
+    def test_pack_images(self):
+        from pyglet.image import ImageData
+
+        images = [ImageData(3, 2, 'RGBA', bytes([i]) * 24) for i in range(1, 6)]
+        pages, placements = atlas.pack_images(images, 8, 8, border=1)
+
+        self.assertEqual(len(pages), 3)
+        for i, (page, x, y) in enumerate(placements):
+            region = pages[page].get_region(x, y, 3, 2)
+            self.assertEqual(region.get_data('RGBA', 12), bytes([i + 1]) * 24)
+
+    def test_pack_images_too_large(self):
+        from pyglet.image import ImageData
+
+        images = [ImageData(8, 8, 'RGBA', bytes(256))]
+        self.assertRaises(atlas.AllocatorException, atlas.pack_images, images, 8, 8, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,47 @@
+"""
+Test the persistent font index.
+"""
+
+import os
+
+from pyglet.font.fontindex import FontIndex
+
+
+def test_index_entry(test_data, tmp_path):
+    file = test_data.get_file('fonts', 'action_man_bold_italic.ttf')
+    index = FontIndex(str(tmp_path / 'fonts.idx'))
+
+    entry = index.get_entry(file)
+    assert entry.family == 'Action Man'
+    assert entry.bold
+    assert entry.italic
+    assert entry.has_character('A')
+    assert not entry.has_character('一')
+    assert index.find('action man', bold=True, italic=True) is entry
+
+
+def test_index_persists(test_data, tmp_path):
+    file = test_data.get_file('fonts', 'action_man.ttf')
+    filename = str(tmp_path / 'fonts.idx')
+
+    index = FontIndex(filename)
+    index.get_entry(file)
+    index.add_match('Action Man', 12, False, False, 'Action Man', file)
+    index.save()
+    assert os.path.exists(filename)
+
+    index = FontIndex(filename)
+    assert file in index
+    assert index.get_match('Action Man', 12, False, False) == ('Action Man', os.path.abspath(file))
+    assert index.get_match('Action Man', 12, True, False) is None
+
+
+def test_index_invalid_file(tmp_path):
+    filename = tmp_path / 'fonts.idx'
+    filename.write_text('not an index')
+    font = tmp_path / 'broken.ttf'
+    font.write_bytes(b'\0' * 16)
+
+    index = FontIndex(str(filename))
+    assert len(index) == 0
+    assert index.get_entry(str(font)) is None
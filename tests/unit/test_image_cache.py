@@ -0,0 +1,46 @@
+"""
+Test the on-disk decoded image cache.
+"""
+
+import os
+
+from pyglet.image import ImageData
+from pyglet.image.cache import ImageCache
+
+
+def test_load_cached(test_data, tmp_path):
+    filename = test_data.get_file('images', 'rgba.png')
+    cache = ImageCache(str(tmp_path))
+
+    image = cache.load(filename)
+    assert cache.misses == 1
+
+    cached = cache.load(filename)
+    assert cache.hits == 1
+    assert (cached.width, cached.height, cached.format) == (image.width, image.height, image.format)
+    assert bytes(cached.get_data('RGBA', image.width * 4)) == bytes(image.get_data('RGBA', image.width * 4))
+
+
+def test_key_depends_on_decoder():
+    assert ImageCache.get_key(b'data', 'PNGImageDecoder') != ImageCache.get_key(b'data', 'PILImageDecoder')
+
+
+def test_eviction(tmp_path):
+    cache = ImageCache(str(tmp_path), max_size=1000)
+    for i in range(4):
+        image = ImageData(10, 10, 'RGB', bytes([i]) * 300)
+        cache.put(f'key{i}', image)
+        os.utime(cache._get_path(f'key{i}'), (i, i))
+
+    assert cache.get_size() <= 1000
+    assert cache.get('key0') is None
+    image = cache.get('key3')
+    assert bytes(image.get_data('RGB', 30)) == bytes([3]) * 300
+
+
+def test_clear(tmp_path):
+    cache = ImageCache(str(tmp_path))
+    cache.put('key', ImageData(1, 1, 'RGBA', bytes(4)))
+    cache.clear()
+    assert cache.get('key') is None
+    assert cache.get_size() == 0
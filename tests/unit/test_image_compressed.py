@@ -0,0 +1,203 @@
+"""
+Test the block-compressed texture decoders and loaders.
+"""
+
+import io
+import zlib
+import struct
+import random
+
+import pytest
+
+from pyglet.gl import *
+from pyglet.image import CompressedImageData, ImageData
+from pyglet.image import compressed
+from pyglet.image.codecs import s3tc, ImageDecodeException
+from pyglet.image.codecs.dds import DDSImageDecoder
+from pyglet.image.codecs.ktx2 import KTX2ImageDecoder, IDENTIFIER
+
+
+def _rgb565(c):
+    r, g, b = (c >> 11) & 31, (c >> 5) & 63, c & 31
+    return (r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)
+
+
+def _ref_color(block, four_color):
+    c0, c1, bits = struct.unpack('<HHI', block)
+    e0, e1 = _rgb565(c0), _rgb565(c1)
+    if four_color or c0 > c1:
+        palette = [e0 + (255,), e1 + (255,),
+                   tuple((2 * a + b) // 3 for a, b in zip(e0, e1)) + (255,),
+                   tuple((a + 2 * b) // 3 for a, b in zip(e0, e1)) + (255,)]
+    else:
+        palette = [e0 + (255,), e1 + (255,), tuple((a + b) // 2 for a, b in zip(e0, e1)) + (255,), (0, 0, 0, 0)]
+    return [palette[(bits >> (2 * i)) & 3] for i in range(16)]
+
+
+def _ref_alpha(block):
+    a0, a1 = block[0], block[1]
+    bits = int.from_bytes(block[2:8], 'little')
+    if a0 > a1:
+        palette = [a0, a1] + [((7 - i) * a0 + i * a1) // 7 for i in range(1, 7)]
+    else:
+        palette = [a0, a1] + [((5 - i) * a0 + i * a1) // 5 for i in range(1, 5)] + [0, 255]
+    return [palette[(bits >> (3 * i)) & 7] for i in range(16)]
+
+
+def _reference(data, width, height, block_size, kind):
+    """Decode one pixel at a time, for comparison."""
+    blocks_x = (width + 3) // 4
+    blocks_y = (height + 3) // 4
+    pixels = {}
+    for i in range(blocks_x * blocks_y):
+        block = data[i * block_size:(i + 1) * block_size]
+        if kind == 'bc4':
+            values = [(a,) for a in _ref_alpha(block)]
+        elif kind == 'bc5':
+            values = list(zip(_ref_alpha(block[:8]), _ref_alpha(block[8:])))
+        elif kind in ('dxt1_rgb', 'dxt1_rgba'):
+            values = _ref_color(block, False)
+            if kind == 'dxt1_rgb':
+                values = [v[:3] for v in values]
+        elif kind == 'dxt3':
+            alpha = [((block[j // 2] >> (4 * (j % 2))) & 15) * 17 for j in range(16)]
+            values = [v[:3] + (a,) for v, a in zip(_ref_color(block[8:], True), alpha)]
+        else:
+            values = [v[:3] + (a,) for v, a in zip(_ref_color(block[8:], True), _ref_alpha(block[:8]))]
+
+        by, bx = divmod(i, blocks_x)
+        for j, value in enumerate(values):
+            pixels[bx * 4 + j % 4, by * 4 + j // 4] = value
+
+    return b''.join(bytes(pixels[x, y]) for y in range(height) for x in range(width))
+
+
+@pytest.mark.parametrize('kind,block_size,fmt', [
+    ('dxt1_rgb', 8, 'RGB'),
+    ('dxt1_rgba', 8, 'RGBA'),
+    ('dxt3', 16, 'RGBA'),
+    ('dxt5', 16, 'RGBA'),
+    ('bc4', 8, 'R'),
+    ('bc5', 16, 'RG'),
+])
+@pytest.mark.parametrize('width,height', [(8, 8), (12, 4), (5, 7), (1, 1)])
+def test_decode_matches_reference(kind, block_size, fmt, width, height):
+    rnd = random.Random(width * 31 + height)
+    blocks = ((width + 3) // 4) * ((height + 3) // 4)
+    data = bytes(rnd.randrange(256) for _ in range(blocks * block_size))
+
+    decoder = {'dxt1_rgb': s3tc.decode_dxt1_rgb, 'dxt1_rgba': s3tc.decode_dxt1_rgba,
+               'dxt3': s3tc.decode_dxt3, 'dxt5': s3tc.decode_dxt5,
+               'bc4': s3tc.decode_bc4, 'bc5': s3tc.decode_bc5}[kind]
+    image = decoder(data, width, height)
+
+    assert isinstance(image, ImageData)
+    assert image.format == fmt
+    assert image.get_data(fmt, width * len(fmt)) == _reference(data, width, height, block_size, kind)
+
+
+def test_decode_short_data():
+    with pytest.raises(ImageDecodeException):
+        s3tc.decode_dxt5(bytes(15), 4, 4)
+
+
+def test_get_decoder():
+    assert s3tc.get_decoder(GL_COMPRESSED_RGBA_S3TC_DXT5_EXT) is s3tc.decode_dxt5
+    assert s3tc.get_decoder(compressed.GL_COMPRESSED_SRGB_ALPHA_S3TC_DXT1_EXT) is s3tc.decode_dxt1_rgba
+    assert s3tc.get_decoder(GL_COMPRESSED_RGBA_BPTC_UNORM) is None
+
+
+@pytest.mark.parametrize('gl_format,width,height,size', [
+    (GL_COMPRESSED_RGB_S3TC_DXT1_EXT, 256, 256, 32768),
+    (GL_COMPRESSED_RGBA_S3TC_DXT5_EXT, 256, 256, 65536),
+    (GL_COMPRESSED_RGBA_S3TC_DXT5_EXT, 5, 3, 32),
+    (GL_COMPRESSED_RG_RGTC2, 1, 1, 16),
+    (GL_COMPRESSED_RGB8_ETC2, 16, 16, 128),
+    (compressed.GL_COMPRESSED_RGBA_ASTC_12x12_KHR, 100, 50, 9 * 5 * 16),
+    (compressed.GL_COMPRESSED_SRGB8_ALPHA8_ASTC_6x5_KHR, 12, 10, 2 * 2 * 16),
+])
+def test_compressed_size(gl_format, width, height, size):
+    assert compressed.get_format(gl_format).get_size(width, height) == size
+
+
+def test_unknown_format():
+    assert compressed.get_format(GL_RGBA8) is None
+
+
+def _make_ktx2(vk_format, width, height, levels, supercompression=0):
+    level_count = len(levels)
+    header_size = struct.calcsize('<12s9I4I2Q')
+    data_offset = header_size + level_count * 24
+    stored = [zlib.compress(level) if supercompression == 3 else level for level in levels]
+
+    index = b''
+    body = b''
+    for level, uncompressed in zip(stored, levels):
+        index += struct.pack('<3Q', data_offset + len(body), len(level), len(uncompressed))
+        body += level
+
+    header = struct.pack('<12s9I4I2Q', IDENTIFIER, vk_format, 1, width, height, 0, 0, 1, level_count,
+                         supercompression, 0, 0, 0, 0, 0, 0)
+    return header + index + body
+
+
+@pytest.mark.parametrize('supercompression', [0, 3])
+def test_ktx2_compressed(supercompression):
+    levels = [bytes(range(64)), bytes(range(16)), bytes(range(16, 32))]
+    ktx2 = _make_ktx2(137, 8, 8, levels, supercompression)
+    image = KTX2ImageDecoder().decode('test.ktx2', io.BytesIO(ktx2))
+
+    assert isinstance(image, CompressedImageData)
+    assert image.gl_format == GL_COMPRESSED_RGBA_S3TC_DXT5_EXT
+    assert (image.width, image.height) == (8, 8)
+    assert image.data == levels[0]
+    assert image.mipmap_data == levels[1:]
+    assert image.decoder is s3tc.decode_dxt5
+
+
+def test_ktx2_astc():
+    ktx2 = _make_ktx2(158 + 2 * 7, 16, 16, [bytes(64)])
+    image = KTX2ImageDecoder().decode('test.ktx2', io.BytesIO(ktx2))
+    assert image.gl_format == compressed.GL_COMPRESSED_SRGB8_ALPHA8_ASTC_8x8_KHR
+    assert image.decoder is None
+
+
+def test_ktx2_uncompressed():
+    ktx2 = _make_ktx2(37, 2, 2, [bytes(range(16)), bytes(4)])
+    image = KTX2ImageDecoder().decode('test.ktx2', io.BytesIO(ktx2))
+    assert isinstance(image, ImageData)
+    assert image.get_data('RGBA', 8) == bytes(range(16))
+    assert image.mipmap_images[0].width == 1
+
+
+@pytest.mark.parametrize('data', [
+    b'not a ktx2 file' * 10,
+    _make_ktx2(137, 4, 4, [bytes(16)], supercompression=2),
+    _make_ktx2(1000, 4, 4, [bytes(16)]),
+])
+def test_ktx2_invalid(data):
+    with pytest.raises(ImageDecodeException):
+        KTX2ImageDecoder().decode('test.ktx2', io.BytesIO(data))
+
+
+def _make_dds(fourcc, width, height, levels, dxgi_format=None):
+    pixel_format = struct.pack('<2I4s5I', 32, 0x4, fourcc, 0, 0, 0, 0, 0)
+    header = struct.pack('<4s7I44s32s2I8sI', b'DDS ', 124, 0x1007 | 0x20000, height, width, 0, 0, len(levels),
+                         bytes(44), pixel_format, 0x1000, 0, bytes(8), 0)
+    if dxgi_format is not None:
+        header += struct.pack('<5I', dxgi_format, 3, 0, 1, 0)
+    return header + b''.join(levels)
+
+
+def test_dds_dx10():
+    levels = [bytes(range(64)), bytes(range(16))]
+    image = DDSImageDecoder().decode('test.dds', io.BytesIO(_make_dds(b'DX10', 8, 8, levels, 98)))
+    assert image.gl_format == GL_COMPRESSED_RGBA_BPTC_UNORM
+    assert image.data == levels[0]
+    assert image.mipmap_data == levels[1:]
+
+
+def test_dds_ati2():
+    image = DDSImageDecoder().decode('test.dds', io.BytesIO(_make_dds(b'ATI2', 4, 4, [bytes(16)])))
+    assert image.gl_format == GL_COMPRESSED_RG_RGTC2
+    assert image.decoder is s3tc.decode_bc5
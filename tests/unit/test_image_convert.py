@@ -0,0 +1,88 @@
+"""
+Test conversion of image data between formats and pitches.
+"""
+
+import ctypes
+
+import pytest
+
+from pyglet.image import ImageData, ImageException
+from pyglet.image import convert
+
+
+def _reference(data, width, height, src_fmt, src_pitch, dst_fmt, dst_pitch):
+    """Straightforward per-pixel conversion to compare against."""
+    src_components = len(src_fmt)
+    rows = []
+    for y in range(height):
+        start = y * abs(src_pitch)
+        row = bytearray()
+        for x in range(width):
+            pixel = data[start + x * src_components:start + (x + 1) * src_components]
+            for c in dst_fmt:
+                row.append(pixel[src_fmt.index(c) if c in src_fmt else 0])
+        row = row[:abs(dst_pitch)]
+        row += bytes(abs(dst_pitch) - len(row))
+        rows.append(bytes(row))
+    if src_pitch * dst_pitch < 0:
+        rows.reverse()
+    return b''.join(rows)
+
+
+def _make_data(width, height, fmt, pitch):
+    return bytes((i * 7 + 3) % 256 for i in range(abs(pitch) * height))
+
+
+@pytest.mark.parametrize('src_fmt,dst_fmt', [
+    ('RGBA', 'BGRA'),
+    ('BGRA', 'RGBA'),
+    ('RGB', 'RGBA'),
+    ('RGBA', 'RGB'),
+    ('BGR', 'RGB'),
+    ('L', 'RGBA'),
+    ('LA', 'RGBA'),
+    ('RGBA', 'ARGB'),
+])
+@pytest.mark.parametrize('src_pad,dst_pad', [(0, 0), (3, 0), (0, 5)])
+@pytest.mark.parametrize('flip', [False, True])
+def test_convert_matches_reference(src_fmt, dst_fmt, src_pad, dst_pad, flip):
+    width, height = 5, 4
+    src_pitch = width * len(src_fmt) + src_pad
+    dst_pitch = width * len(dst_fmt) + dst_pad
+    if flip:
+        dst_pitch = -dst_pitch
+    data = _make_data(width, height, src_fmt, src_pitch)
+
+    expected = _reference(data, width, height, src_fmt, src_pitch, dst_fmt, dst_pitch)
+    assert convert.convert(data, width, height, src_fmt, src_pitch, dst_fmt, dst_pitch) == expected
+
+
+def test_convert_pitch_only():
+    width, height = 3, 3
+    data = _make_data(width, height, 'RGB', 12)
+    expected = b''.join(data[i * 12:i * 12 + 9] for i in range(height))
+    assert convert.convert(data, width, height, 'RGB', 12, 'RGB', 9) == expected
+    assert convert.convert(expected, width, height, 'RGB', 9, 'RGB', 12) == \
+        b''.join(expected[i * 9:(i + 1) * 9] + bytes(3) for i in range(height))
+
+
+def test_convert_ctypes_data():
+    data = (ctypes.c_ubyte * 8)(1, 2, 3, 4, 5, 6, 7, 8)
+    assert convert.convert(data, 2, 1, 'RGBA', 8, 'BGRA', 8) == bytes((3, 2, 1, 4, 7, 6, 5, 8))
+
+
+def test_plan_is_cached():
+    plan = convert.get_plan(16, 'BGRA', 64, 'RGBA', -64)
+    assert convert.get_plan(16, 'BGRA', 64, 'RGBA', -64) is plan
+    assert plan.channels == (2, 1, 0, 3)
+    assert plan.flip
+
+
+def test_image_data_convert():
+    data = bytes(range(24))
+    image = ImageData(2, 3, 'RGBA', data)
+    assert image.get_data('RGBA', 8) is data
+    assert image.get_data('BGRA', -8) == _reference(data, 2, 3, 'RGBA', 8, 'BGRA', -8)
+
+    with pytest.raises(ImageException):
+        ImageData(1, 1, 'RGBAX', bytes(5)).get_data('RGBA', 4)
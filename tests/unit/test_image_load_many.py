@@ -0,0 +1,29 @@
+"""
+Test loading several images in parallel.
+"""
+
+import pytest
+
+import pyglet
+
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_load_many(test_data, processes):
+    names = ['rgb.png', 'rgba.png', 'la.png', 'rgb_24bpp.bmp']
+    filenames = [test_data.get_file('images', name) for name in names]
+
+    images = pyglet.image.load_many(filenames, workers=2, processes=processes)
+
+    assert len(images) == len(filenames)
+    for filename, image in zip(filenames, images):
+        expected = pyglet.image.load(filename)
+        assert (image.width, image.height, image.format) == (expected.width, expected.height, expected.format)
+        fmt, pitch = expected.format, expected.pitch
+        assert bytes(image.get_data(fmt, pitch)) == bytes(expected.get_data(fmt, pitch))
+
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_load_many_error(test_data, tmp_path, processes):
+    filenames = [test_data.get_file('images', 'rgb.png'), str(tmp_path / 'missing.png')]
+    with pytest.raises(Exception):
+        pyglet.image.load_many(filenames, processes=processes)
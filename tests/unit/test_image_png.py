@@ -0,0 +1,82 @@
+"""
+Test the pure-Python PNG decoder.
+"""
+
+import io
+import zlib
+import array
+import struct
+import random
+import itertools
+
+import pytest
+
+import pyglet.extlibs.png as pypng
+from pyglet.image.codecs.png import PNGImageDecoder
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    if pb <= pc:
+        return b
+    return c
+
+
+def _filter_row(filter_type, row, prev, bpp):
+    out = bytearray([filter_type])
+    for i, x in enumerate(row):
+        a = row[i - bpp] if i >= bpp else 0
+        b = prev[i]
+        c = prev[i - bpp] if i >= bpp else 0
+        predictor = (0, a, b, (a + b) >> 1, _paeth(a, b, c))[filter_type]
+        out.append((x - predictor) & 255)
+    return out
+
+
+def _chunk(chunk_type, data):
+    return struct.pack('!I', len(data)) + chunk_type + data + struct.pack('!I', zlib.crc32(chunk_type + data))
+
+
+def _make_png(width, height, color_type, bpp, filter_types, idat_chunks=3):
+    rnd = random.Random(width * height + color_type)
+    stride = width * bpp
+    rows = [bytes(rnd.randrange(256) if rnd.random() < 0.3 else (x + y) & 255 for x in range(stride))
+            for y in range(height)]
+
+    raw = bytearray()
+    prev = bytes(stride)
+    for y, row in enumerate(rows):
+        raw += _filter_row(filter_types[y % len(filter_types)], row, prev, bpp)
+        prev = row
+
+    compressed = zlib.compress(bytes(raw))
+    size = len(compressed) // idat_chunks + 1
+    png = b'\x89PNG\r\n\x1a\n'
+    png += _chunk(b'IHDR', struct.pack('!2I5B', width, height, 8, color_type, 0, 0, 0))
+    for i in range(0, len(compressed), size):
+        png += _chunk(b'IDAT', compressed[i:i + size])
+    png += _chunk(b'IEND', b'')
+    return png, b''.join(reversed(rows))
+
+
+@pytest.mark.parametrize('color_type,fmt', [(0, 'L'), (2, 'RGB'), (4, 'LA'), (6, 'RGBA')])
+@pytest.mark.parametrize('filter_types', [(0,), (1,), (2,), (3,), (4,), (4, 3, 2, 1, 0)])
+def test_decode_filters(color_type, fmt, filter_types):
+    png, expected = _make_png(13, 7, color_type, len(fmt), filter_types)
+    image = PNGImageDecoder().decode('test.png', io.BytesIO(png))
+
+    assert image.format == fmt
+    assert image.get_data(fmt, len(fmt) * 13) == expected
+
+
+@pytest.mark.parametrize('name', ['rgb.png', 'rgba.png', 'l.png', 'la.png', 'rgb_8bpp.png'])
+def test_decode_matches_pypng(test_data, name):
+    filename = test_data.get_file('images', name)
+    width, height, pixels, metadata = pypng.Reader(filename=filename).asDirect()
+    expected = array.array('B', itertools.chain(*pixels)).tobytes()
+
+    image = PNGImageDecoder().decode(filename, None)
+    assert image.get_data(image.format, -image.width * len(image.format)) == expected
@@ -0,0 +1,46 @@
+"""
+Test mipmap generation for texture streaming.
+"""
+
+import random
+
+import pytest
+
+from pyglet.image import ImageData
+from pyglet.image import streaming
+
+
+def _reference_halve(data, width, height, components):
+    half_width, half_height = max(1, width // 2), max(1, height // 2)
+    out = bytearray()
+    for y in range(half_height):
+        for x in range(half_width):
+            for c in range(components):
+                total = 0
+                for dy in (0, 1):
+                    for dx in (0, 1):
+                        sx = min(x * 2 + dx, width - 1)
+                        sy = min(y * 2 + dy, height - 1)
+                        total += data[(sy * width + sx) * components + c]
+                out.append((total + 2) >> 2)
+    return bytes(out)
+
+
+@pytest.mark.parametrize('width,height', [(8, 8), (6, 4), (7, 5), (1, 6), (5, 1), (2, 1), (1, 1)])
+def test_halve_matches_reference(width, height):
+    rnd = random.Random(width * 100 + height)
+    data = bytes(rnd.randrange(256) for _ in range(width * height * 4))
+    expected = _reference_halve(data, width, height, 4)
+    assert streaming._halve(data, width, height, 4) == expected
+
+
+def test_generate_mipmaps():
+    data = (bytes(range(256)) * 9)[:48 * 16 * 3]
+    levels = streaming.generate_mipmaps(ImageData(48, 16, 'RGB', data))
+
+    assert [(level.width, level.height) for level in levels] == [(48, 16), (24, 8), (12, 4), (6, 2), (3, 1), (1, 1)]
+    assert all(level.format == 'RGBA' for level in levels)
+    assert levels[0].get_data('RGBA', 48 * 4)[3::4] == b'\xff' * 48 * 16
+    for previous, level in zip(levels, levels[1:]):
+        assert level.get_data('RGBA', level.width * 4) == _reference_halve(
+            previous.get_data('RGBA', previous.width * 4), previous.width, previous.height, 4)
@@ -0,0 +1,20 @@
+"""
+Test the frame recorder's encoders.
+"""
+
+import os
+
+import pyglet
+from pyglet.window.recorder import ImageSequenceEncoder
+
+
+def test_image_sequence_encoder(tmp_path):
+    encoder = ImageSequenceEncoder(str(tmp_path / 'out' / 'frame.png'))
+    image = pyglet.image.ImageData(2, 2, 'RGBA', bytes(range(16)))
+    encoder.write(image, 0)
+    encoder.write(image, 1)
+    encoder.close()
+
+    assert sorted(os.listdir(tmp_path / 'out')) == ['frame00000.png', 'frame00001.png']
+    loaded = pyglet.image.load(str(tmp_path / 'out' / 'frame00001.png'))
+    assert loaded.get_data('RGBA', 8) == image.get_data('RGBA', 8)
@@ -0,0 +1,119 @@
+"""
+Test the frame decoding of streaming animations.
+"""
+
+import io
+
+import pytest
+
+from pyglet.image import AnimationFrame, ImageData, StreamingAnimation
+from pyglet.image.animation import _FrameStream
+from pyglet.image.codecs import ImageDecoder, ImageDecodeException
+
+
+class FrameSource:
+    """Creates frames whose pixels hold their index, and counts decodes."""
+
+    def __init__(self, count, fail_at=None):
+        self.count = count
+        self.fail_at = fail_at
+        self.opened = 0
+        self.decoded = 0
+
+    def __call__(self):
+        self.opened += 1
+        return self._frames()
+
+    def _frames(self):
+        for i in range(self.count):
+            if i == self.fail_at:
+                raise ImageDecodeException('Bad frame')
+            self.decoded += 1
+            yield AnimationFrame(ImageData(1, 1, 'L', bytes((i,))), 0.1)
+
+
+def _index(image):
+    return image.get_data('RGBA', 4)[0]
+
+
+def test_sequential_and_loop():
+    source = FrameSource(5)
+    stream = _FrameStream(source, 5, look_ahead=2)
+    try:
+        for index in list(range(5)) * 2:
+            assert _index(stream.get(index)) == index
+    finally:
+        stream.close()
+    # Looping reopens the source rather than seeking.
+    assert source.opened == 2
+
+
+def test_skip_forward():
+    source = FrameSource(10)
+    stream = _FrameStream(source, 10, look_ahead=2)
+    try:
+        assert _index(stream.get(0)) == 0
+        assert _index(stream.get(6)) == 6
+        assert _index(stream.get(7)) == 7
+    finally:
+        stream.close()
+    assert source.opened == 1
+
+
+def test_seek_backward():
+    source = FrameSource(10)
+    stream = _FrameStream(source, 10, look_ahead=3)
+    try:
+        for index in range(6):
+            stream.get(index)
+        assert _index(stream.get(2)) == 2
+        assert _index(stream.get(3)) == 3
+    finally:
+        stream.close()
+    assert source.opened == 2
+
+
+def test_error_is_raised():
+    stream = _FrameStream(FrameSource(5, fail_at=2), 5, look_ahead=1)
+    try:
+        stream.get(0)
+        stream.get(1)
+        with pytest.raises(ImageDecodeException):
+            stream.get(2)
+    finally:
+        stream.close()
+
+
+def test_frames_sequence():
+    source = FrameSource(3)
+    animation = StreamingAnimation(source, [0.1, 0.2, None], 1, 1)
+    try:
+        assert len(animation.frames) == 3
+        assert [frame.duration for frame in animation.frames] == [0.1, 0.2, None]
+        assert animation.frames[-1].index == 2
+        assert animation.get_duration() == pytest.approx(0.3)
+        assert (animation.get_max_width(), animation.get_max_height()) == (1, 1)
+        # Nothing is decoded until a frame image is needed.
+        assert source.opened == 0
+    finally:
+        animation.delete()
+
+
+class FakeAnimationDecoder(ImageDecoder):
+    def get_animation_file_extensions(self):
+        return ['.fake']
+
+    def decode_animation(self, filename, file):
+        data = file.read()
+        from pyglet.image import Animation
+        return Animation([AnimationFrame(ImageData(2, 1, 'L', bytes((b, b))), 0.05) for b in data])
+
+
+def test_load_with_decoder():
+    animation = StreamingAnimation.load('test.fake', io.BytesIO(bytes(range(4))), FakeAnimationDecoder())
+    try:
+        assert len(animation.frames) == 4
+        assert (animation.width, animation.height) == (2, 1)
+        assert animation._stream.get(3).get_data('L', 2) == bytes((3, 3))
+    finally:
+        animation.delete()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+"""Benchmark conversion of image data between formats and pitches.
+
+Usage::
+
+    image_convert.py [--repeat N] [--sizes 64,256,1024,2048]
+
+Each format pair is converted at each image size, with tightly packed rows
+and with rows flipped to a negative pitch.  The best time of `repeat` runs is
+reported in milliseconds, along with the throughput in megapixels per second.
+The conversion engine in use (NumPy or pure Python) is printed first.
+"""
+
+import os
+import sys
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from pyglet.image import convert
+
+FORMAT_PAIRS = [
+    ('RGBA', 'RGBA'),
+    ('BGRA', 'RGBA'),
+    ('RGB', 'RGBA'),
+    ('RGBA', 'RGB'),
+    ('BGR', 'RGB'),
+    ('L', 'RGBA'),
+    ('LA', 'RGBA'),
+]
+
+
+def run(sizes, repeat):
+    print(f"Engine: {'numpy' if convert.numpy is not None else 'python'}")
+    print(f"{'size':>6} {'src':>5} {'dst':>5} {'flip':>5} {'ms':>10} {'Mpx/s':>10}")
+    for size in sizes:
+        for src_fmt, dst_fmt in FORMAT_PAIRS:
+            src_pitch = size * len(src_fmt)
+            data = os.urandom(src_pitch * size)
+            for flip in (False, True):
+                dst_pitch = size * len(dst_fmt) * (-1 if flip else 1)
+                if src_fmt == dst_fmt and not flip:
+                    continue
+
+                def func():
+                    convert.convert(data, size, size, src_fmt, src_pitch, dst_fmt, dst_pitch)
+
+                best = min(timeit.repeat(func, number=1, repeat=repeat))
+                mpx = size * size / best / 1e6
+                print(f"{size:>6} {src_fmt:>5} {dst_fmt:>5} {str(flip):>5} {best * 1000:>10.3f} {mpx:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--sizes', default='64,256,1024,2048')
+    args = parser.parse_args()
+    run([int(s) for s in args.sizes.split(',')], args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+
+"""Generate a resource manifest for pyglet.resource.
+
+Usage::
+
+    genresourcemanifest.py <script_home> <manifest> <path> [<path> ...]
+
+The paths are given in the same format as ``pyglet.resource.path``, and are
+relative to `script_home`.  Ship the manifest with the application and call
+``pyglet.resource.load_manifest`` before the first resource is loaded.
+"""
+
+import sys
+
+from pyglet import resource
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 4:
+        print(__doc__)
+        sys.exit(1)
+
+    script_home, manifest = sys.argv[1:3]
+    loader = resource.Loader(sys.argv[3:], script_home=script_home)
+    loader.save_manifest(manifest)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+"""Pack a directory of images into prepacked texture atlases.
+
+Usage::
+
+    packatlas.py [--size N] [--border N] <directory> <manifest>
+
+Every image in `directory` (including subdirectories) is packed into one or
+more square atlas pages of the given size (default 2048).  The pages are
+written as PNG files next to `manifest`, a JSON file that can be added to a
+resource loader with ``pyglet.resource.add_atlas``.  Image names in the
+manifest are relative to `directory`, using forward slashes, so the packed
+images can be loaded with ``pyglet.resource.image`` by their usual names.
+"""
+
+import os
+import sys
+import json
+import argparse
+
+import pyglet
+from pyglet.image.atlas import pack_images, MaxRectsAllocator
+from pyglet.image.codecs.png import PNGImageEncoder
+
+
+def find_images(directory):
+    extensions = set()
+    for decoder in pyglet.image.codecs.registry.get_decoders():
+        extensions.update(decoder.get_file_extensions())
+
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in extensions:
+                path = os.path.join(dirpath, filename)
+                yield os.path.relpath(path, directory).replace(os.sep, '/'), path
+
+
+def pack_directory(directory, manifest, size=2048, border=1):
+    names = []
+    images = []
+    for name, path in find_images(directory):
+        try:
+            images.append(pyglet.image.load(path))
+            names.append(name)
+        except pyglet.image.ImageDecodeException:
+            print(f'Skipping {name}: not a supported image')
+
+    pages, placements = pack_images(images, size, size, border, MaxRectsAllocator)
+
+    output_dir = os.path.dirname(os.path.abspath(manifest))
+    prefix = os.path.splitext(os.path.basename(manifest))[0]
+    page_names = []
+    encoder = PNGImageEncoder()
+    for i, page in enumerate(pages):
+        page_name = f'{prefix}{i}.png'
+        page.save(os.path.join(output_dir, page_name), encoder=encoder)
+        page_names.append(page_name)
+
+    entries = {}
+    for name, img, (page, x, y) in zip(names, images, placements):
+        entries[name] = [page, x, y, img.width, img.height]
+
+    with open(manifest, 'w', encoding='utf-8') as f:
+        json.dump({'pages': page_names, 'images': entries}, f)
+
+    print(f'Packed {len(images)} images into {len(pages)} page(s)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=2048, help='width and height of each atlas page')
+    parser.add_argument('--border', type=int, default=1, help='blank pixels around each image')
+    parser.add_argument('directory')
+    parser.add_argument('manifest')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(__doc__)
+        sys.exit(1)
+
+    pack_directory(args.directory, args.manifest, args.size, args.border)